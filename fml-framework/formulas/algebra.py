@@ -117,6 +117,7 @@ FORMULAS = {
         "description": "Calculate Y for linear equation y = mx + c",
         "category": "algebra",
         "parameters": ["m", "x", "c"],
+        "aliases": ["calculateLinearY"],
         "function": solve_linear
     },
     "solve_quadratic_roots": {
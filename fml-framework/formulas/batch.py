@@ -0,0 +1,757 @@
+"""
+Batch Formulas - FML Framework
+Vectorized variants of every registered formula. Each batch function takes
+NumPy arrays (or sequences/scalars) for the parameters listed in the
+formula's "parameters" metadata, broadcasts them, and returns a dict of
+column arrays keyed like the scalar result.
+
+Rows that the scalar formula would reject (singular matrices, zero totals,
+ZeroDivisionError, OverflowError from a power, math domain errors, ...) are
+flagged in a boolean "error" column and their numeric columns are NaN,
+instead of aborting the whole batch. Rows whose scalar result no float
+column can hold (a complex power, an exact int beyond the float range) are
+flagged too. Where the scalar formula returns inf without raising (float
+multiplication or division overflow), so does the kernel.
+"""
+
+import math
+
+import numpy as np
+
+from . import catalog
+from .earth_geometry import EARTH_RADIUS_KM, EARTH_RADIUS_NM
+
+
+def _columns(*args):
+    """Convert arguments to float arrays broadcast to a common 1-D shape"""
+    arrays = [np.asarray(a, dtype=np.float64) for a in args]
+    return [np.atleast_1d(a) for a in np.broadcast_arrays(*arrays)]
+
+
+def _is_integer(value):
+    """True for integer-typed input, which the scalar formula keeps exact"""
+    return np.asarray(value).dtype.kind in "iub"
+
+
+def _power(base, exponent, exact=False):
+    """
+    base ** exponent and the rows where the scalar power fails
+
+    Failures are 0 to a negative power (ZeroDivisionError) and, for float
+    operands, overflow (OverflowError) and a negative base with a fractional
+    exponent (a complex result). exact=True means both operands are Python
+    ints, whose powers never overflow.
+
+    Returns:
+        tuple: (powers, failure mask)
+    """
+    with np.errstate(all="ignore"):
+        value = base ** exponent
+    failed = (base == 0) & (exponent < 0)
+    if not exact:
+        finite = np.isfinite(base) & np.isfinite(exponent)
+        fractional = (base < 0) & (exponent != np.floor(exponent))
+        failed |= finite & (np.isinf(value) | fractional)
+    return value, failed
+
+
+def _infinite(*angles):
+    """Rows where math.sin/math.cos would raise ValueError (infinite angle)"""
+    return np.logical_or.reduce([np.isinf(angle) for angle in angles])
+
+
+def _finish(result, error):
+    """Blank out rows flagged in the error mask and attach the mask"""
+    if error.any():
+        for key, column in result.items():
+            if column.dtype.kind == "f":
+                column = column.copy()
+                column[error] = np.nan
+                result[key] = column
+    result["error"] = error
+    return result
+
+
+# --- Algebra ---
+
+def solve_linear(m, x, c):
+    """Vectorized algebra.solve_linear"""
+    m, x, c = _columns(m, x, c)
+    return {"y": m * x + c}
+
+
+def solve_quadratic_roots(a, b, c):
+    """Vectorized algebra.solve_quadratic_roots"""
+    a, b, c = _columns(a, b, c)
+    b_squared, error = _power(b, 2)
+    error |= a == 0
+    discriminant = b_squared - 4*a*c
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sqrt_d = np.sqrt(np.where(discriminant > 0, discriminant, 0))
+        root1 = (-b + sqrt_d) / (2*a)
+        root2 = (-b - sqrt_d) / (2*a)
+
+    roots = np.column_stack([
+        np.where(discriminant >= 0, root1, np.nan),
+        np.where(discriminant > 0, root2, np.nan),
+    ])
+    kind = np.where(
+        discriminant < 0, "no_real_roots",
+        np.where(discriminant == 0, "one_root", "two_roots")
+    )
+    return _finish({"roots": roots, "discriminant": discriminant, "type": kind}, error)
+
+
+def find_quadratic_vertex(a, b, c):
+    """Vectorized algebra.find_quadratic_vertex"""
+    a, b, c = _columns(a, b, c)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = -b / (2*a)
+    x_squared, error = _power(x, 2)
+    error |= a == 0
+    with np.errstate(over="ignore", invalid="ignore"):
+        y = a * x_squared + b * x + c
+    return _finish({"x": x, "y": y}, error)
+
+
+def calculate_direct_variation(x1, y1, x2):
+    """Vectorized algebra.calculate_direct_variation"""
+    x1, y1, x2 = _columns(x1, y1, x2)
+    error = x1 == 0
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        k = y1 / x1
+        y2 = k * x2
+    return _finish({"k": k, "y2": y2}, error)
+
+
+def calculate_inverse_variation(x1, y1, x2):
+    """Vectorized algebra.calculate_inverse_variation"""
+    x1, y1, x2 = _columns(x1, y1, x2)
+    error = x2 == 0
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        k = x1 * y1
+        y2 = k / x2
+    return _finish({"k": k, "y2": y2}, error)
+
+
+# --- Geometry ---
+
+def calculate_circle_properties(radius):
+    """Vectorized geometry.calculate_circle_properties"""
+    (radius,) = _columns(radius)
+    radius_squared, error = _power(radius, 2)
+    return _finish({
+        "area": math.pi * radius_squared,
+        "circumference": 2 * math.pi * radius,
+        "radius": radius
+    }, error)
+
+
+def calculate_arc_sector(radius, angle_degrees):
+    """Vectorized geometry.calculate_arc_sector"""
+    radius, angle_degrees = _columns(radius, angle_degrees)
+    angle_radians = np.radians(angle_degrees)
+    radius_squared, error = _power(radius, 2)
+    with np.errstate(over="ignore", invalid="ignore"):
+        sector_area = 0.5 * radius_squared * angle_radians
+    return _finish({
+        "arc_length": radius * angle_radians,
+        "sector_area": sector_area,
+        "angle_degrees": angle_degrees,
+        "angle_radians": angle_radians
+    }, error)
+
+
+def calculate_chord_length(radius, distance_from_center):
+    """Vectorized geometry.calculate_chord_length"""
+    radius, distance = _columns(radius, distance_from_center)
+    radius_squared, radius_failed = _power(radius, 2)
+    distance_squared, distance_failed = _power(distance, 2)
+    squared = radius_squared - distance_squared
+    error = ~((distance < radius) & (squared >= 0)) | radius_failed | distance_failed
+    with np.errstate(invalid="ignore"):
+        half_chord = np.sqrt(squared)
+    return _finish({
+        "chord": 2 * half_chord,
+        "half_chord": half_chord,
+        "distance": distance
+    }, error)
+
+
+def calculate_triangle_area(base, height):
+    """Vectorized geometry.calculate_triangle_area"""
+    base, height = _columns(base, height)
+    return {"area": 0.5 * base * height}
+
+
+def calculate_rectangle_properties(length, width):
+    """Vectorized geometry.calculate_rectangle_properties"""
+    length, width = _columns(length, width)
+    return {
+        "area": length * width,
+        "perimeter": 2 * (length + width)
+    }
+
+
+def calculate_sphere_properties(radius):
+    """Vectorized geometry.calculate_sphere_properties"""
+    (radius,) = _columns(radius)
+    radius_squared, squared_failed = _power(radius, 2)
+    radius_cubed, cubed_failed = _power(radius, 3)
+    return _finish({
+        "surface_area": 4 * math.pi * radius_squared,
+        "volume": (4/3) * math.pi * radius_cubed,
+        "radius": radius
+    }, squared_failed | cubed_failed)
+
+
+def calculate_cylinder_properties(radius, height):
+    """Vectorized geometry.calculate_cylinder_properties"""
+    radius, height = _columns(radius, height)
+    radius_squared, error = _power(radius, 2)
+    base_area = math.pi * radius_squared
+    with np.errstate(over="ignore", invalid="ignore"):
+        lateral_area = 2 * math.pi * radius * height
+        volume = base_area * height
+    return _finish({
+        "surface_area": 2 * base_area + lateral_area,
+        "volume": volume,
+        "base_area": base_area,
+        "lateral_area": lateral_area
+    }, error)
+
+
+def calculate_cone_properties(radius, height, slant_height=None):
+    """Vectorized geometry.calculate_cone_properties"""
+    # Missing (None/NaN) slant heights are derived from radius and height
+    radius, height, slant_height = _columns(
+        radius, height, np.nan if slant_height is None else slant_height
+    )
+    radius_squared, error = _power(radius, 2)
+    height_squared, height_failed = _power(height, 2)
+    derived = np.isnan(slant_height)
+    error |= derived & height_failed
+    slant_height = np.where(derived, np.sqrt(radius_squared + height_squared), slant_height)
+    base_area = math.pi * radius_squared
+    with np.errstate(over="ignore", invalid="ignore"):
+        lateral_area = math.pi * radius * slant_height
+        volume = (1/3) * base_area * height
+    return _finish({
+        "surface_area": base_area + lateral_area,
+        "volume": volume,
+        "slant_height": slant_height
+    }, error)
+
+
+def calculate_pyramid_properties(base_area, perimeter, height, slant_height):
+    """Vectorized geometry.calculate_pyramid_properties"""
+    base_area, perimeter, height, slant_height = _columns(
+        base_area, perimeter, height, slant_height
+    )
+    lateral_area = 0.5 * perimeter * slant_height
+    return {
+        "surface_area": base_area + lateral_area,
+        "volume": (1/3) * base_area * height
+    }
+
+
+# --- Sequences ---
+
+def solve_arithmetic_progression(a, d, n):
+    """Vectorized sequences.solve_arithmetic_progression"""
+    a, d, n = _columns(a, d, n)
+    return {
+        "nth_term": a + (n - 1) * d,
+        "sum": (n / 2) * (2 * a + (n - 1) * d),
+        "first_term": a,
+        "common_difference": d,
+        "n": n
+    }
+
+
+def solve_geometric_progression(a, r, n):
+    """Vectorized sequences.solve_geometric_progression"""
+    # Integer r and n give exact int powers in the scalar version
+    exact = _is_integer(r) and _is_integer(n)
+    exact_a = exact and _is_integer(a)
+    a, r, n = _columns(a, r, n)
+    power_n1, failed_n1 = _power(r, n - 1, exact)
+    power_n, failed_n = _power(r, n, exact)
+    error = failed_n1 | (failed_n & (r != 1))
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        nth_term = a * power_n1
+        sum_n = np.where(r == 1, a * n, a * (1 - power_n) / (1 - r))
+    if exact:
+        # An int power past the float range times an int a == 0 is exactly
+        # 0; any other a turns it into a value no float can hold
+        huge = np.isinf(power_n1) | (np.isinf(power_n) & (r != 1))
+        zero = huge & (a == 0) if exact_a else np.zeros_like(huge)
+        nth_term = np.where(zero, 0.0, nth_term)
+        sum_n = np.where(zero, 0.0, sum_n)
+        error |= huge & ~zero
+    return _finish({
+        "nth_term": nth_term,
+        "sum": sum_n,
+        "first_term": a,
+        "common_ratio": r,
+        "n": n
+    }, error)
+
+
+def calculate_compound_interest(p, r, t, n=1):
+    """Vectorized sequences.calculate_compound_interest"""
+    p, r, t, n = _columns(p, r, t, n)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        base = 1 + r/n
+        exponent = n * t
+    growth, error = _power(base, exponent)
+    error |= n == 0
+    with np.errstate(over="ignore", invalid="ignore"):
+        amount = p * growth
+    return _finish({
+        "amount": amount,
+        "interest": amount - p,
+        "principal": p,
+        "rate": r,
+        "time": t,
+        "compounds_per_year": n
+    }, error)
+
+
+def calculate_simple_interest(p, r, t):
+    """Vectorized sequences.calculate_simple_interest"""
+    p, r, t = _columns(p, r, t)
+    interest = p * r * t
+    return {
+        "interest": interest,
+        "amount": p + interest,
+        "principal": p,
+        "rate": r,
+        "time": t
+    }
+
+
+# --- Earth Geometry ---
+
+def calculate_haversine(lat1, lon1, lat2, lon2, unit='km'):
+    """Vectorized earth_geometry.calculate_haversine"""
+    lat1, lon1, lat2, lon2 = _columns(lat1, lon1, lat2, lon2)
+    unit = np.broadcast_to(np.asarray(unit), lat1.shape)
+
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = np.radians(lon2) - np.radians(lon1)
+
+    with np.errstate(invalid="ignore"):
+        a = np.sin(dlat/2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon/2)**2
+        c = 2 * np.arcsin(np.sqrt(a))
+    radius = np.where(unit == 'nm', EARTH_RADIUS_NM, EARTH_RADIUS_KM)
+    # math.sin/cos raise on infinite angles, math.sqrt/asin outside [0, 1]
+    error = _infinite(lat1_rad, lat2_rad, dlat, dlon) | (a < 0) | (a > 1)
+
+    return _finish({
+        "distance": radius * c,
+        "unit": unit,
+        "lat1": lat1,
+        "lon1": lon1,
+        "lat2": lat2,
+        "lon2": lon2
+    }, error)
+
+
+def calculate_great_circle(lat1, lon1, lat2, lon2):
+    """Vectorized earth_geometry.calculate_great_circle"""
+    result = calculate_haversine(lat1, lon1, lat2, lon2, 'km')
+    # Both distances share one central angle, so scale instead of recomputing
+    distance_km = result["distance"]
+    return {
+        "distance_km": distance_km,
+        "distance_nm": distance_km * (EARTH_RADIUS_NM / EARTH_RADIUS_KM),
+        "lat1": result["lat1"],
+        "lon1": result["lon1"],
+        "lat2": result["lat2"],
+        "lon2": result["lon2"],
+        "error": result["error"]
+    }
+
+
+def calculate_small_circle(lat1, lon1, lat2, lon2, latitude):
+    """Vectorized earth_geometry.calculate_small_circle"""
+    _, lon1, _, lon2, latitude = _columns(lat1, lon1, lat2, lon2, latitude)
+    with np.errstate(invalid="ignore"):
+        cos_lat = np.cos(np.radians(latitude))
+        dlon = np.abs(np.radians(lon2) - np.radians(lon1))
+    return _finish({
+        "distance_km": EARTH_RADIUS_KM * cos_lat * dlon,
+        "distance_nm": EARTH_RADIUS_NM * cos_lat * dlon,
+        "latitude": latitude,
+        "lon1": lon1,
+        "lon2": lon2
+    }, _infinite(np.radians(latitude)))
+
+
+def degrees_to_nautical_miles(degrees):
+    """Vectorized earth_geometry.degrees_to_nautical_miles"""
+    (degrees,) = _columns(degrees)
+    return {"nautical_miles": degrees * 60, "degrees": degrees}
+
+
+def nautical_miles_to_kilometers(nautical_miles):
+    """Vectorized earth_geometry.nautical_miles_to_kilometers"""
+    (nautical_miles,) = _columns(nautical_miles)
+    return {"kilometers": nautical_miles * 1.852, "nautical_miles": nautical_miles}
+
+
+# --- Accounting ---
+
+def solve_accounting_equation(assets=None, liabilities=None, capital=None):
+    """Vectorized accounting.solve_accounting_equation"""
+    # None (or NaN) marks the value to calculate in each row
+    assets, liabilities, capital = _columns(
+        np.nan if assets is None else assets,
+        np.nan if liabilities is None else liabilities,
+        np.nan if capital is None else capital
+    )
+    missing_assets = np.isnan(assets)
+    missing_liabilities = np.isnan(liabilities)
+    missing_capital = np.isnan(capital)
+    error = (missing_assets.astype(np.int8) + missing_liabilities + missing_capital) != 1
+
+    assets = np.where(missing_assets, liabilities + capital, assets)
+    liabilities = np.where(missing_liabilities, assets - capital, liabilities)
+    capital = np.where(missing_capital, assets - liabilities, capital)
+    calculated = np.where(
+        missing_assets, "Assets", np.where(missing_liabilities, "Liabilities", "Capital")
+    )
+    return _finish({
+        "assets": assets,
+        "liabilities": liabilities,
+        "capital": capital,
+        "calculated": calculated
+    }, error)
+
+
+def generate_balance_sheet(assets, liabilities):
+    """Vectorized accounting.generate_balance_sheet"""
+    assets, liabilities = _columns(assets, liabilities)
+    capital = assets - liabilities
+    return {
+        "assets": assets,
+        "liabilities": liabilities,
+        "capital": capital,
+        "balanced": np.abs(assets - (liabilities + capital)) < 0.01
+    }
+
+
+def calculate_profit_loss(revenue, expenses):
+    """Vectorized accounting.calculate_profit_loss"""
+    revenue, expenses = _columns(revenue, expenses)
+    result = revenue - expenses
+    return {
+        "result": np.abs(result),
+        "type": np.where(result >= 0, "profit", "loss"),
+        "revenue": revenue,
+        "expenses": expenses
+    }
+
+
+def calculate_depreciation_straight_line(cost, salvage_value, useful_life):
+    """Vectorized accounting.calculate_depreciation_straight_line"""
+    cost, salvage_value, useful_life = _columns(cost, salvage_value, useful_life)
+    error = useful_life == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annual_depreciation = (cost - salvage_value) / useful_life
+    return _finish({
+        "annual_depreciation": annual_depreciation,
+        "cost": cost,
+        "salvage_value": salvage_value,
+        "useful_life": useful_life
+    }, error)
+
+
+# --- Trigonometry ---
+
+def calculate_sine_rule_side(a, A_degrees, B_degrees):
+    """Vectorized trigonometry.calculate_sine_rule_side"""
+    a, A_degrees, B_degrees = _columns(a, A_degrees, B_degrees)
+    error = ~((A_degrees > 0) & (A_degrees < 180) & (B_degrees > 0) & (B_degrees < 180))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        b = (a * np.sin(np.radians(B_degrees))) / np.sin(np.radians(A_degrees))
+    return _finish({"side_b": b}, error)
+
+
+def calculate_cosine_rule_side(b, c, A_degrees):
+    """Vectorized trigonometry.calculate_cosine_rule_side"""
+    b, c, A_degrees = _columns(b, c, A_degrees)
+    b_squared, b_failed = _power(b, 2)
+    c_squared, c_failed = _power(c, 2)
+    error = b_failed | c_failed | _infinite(A_degrees)
+    with np.errstate(over="ignore", invalid="ignore"):
+        a_squared = b_squared + c_squared - 2*b*c*np.cos(np.radians(A_degrees))
+    return _finish({"side_a": np.sqrt(np.maximum(0, a_squared))}, error)
+
+
+def calculate_cosine_rule_angle(a, b, c):
+    """Vectorized trigonometry.calculate_cosine_rule_angle"""
+    a, b, c = _columns(a, b, c)
+    a_squared, a_failed = _power(a, 2)
+    b_squared, b_failed = _power(b, 2)
+    c_squared, c_failed = _power(c, 2)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        cos_A = (b_squared + c_squared - a_squared) / (2*b*c)
+        angle = np.degrees(np.arccos(cos_A))
+    error = (b <= 0) | (c <= 0) | a_failed | b_failed | c_failed | ~((cos_A >= -1) & (cos_A <= 1))
+    return _finish({"angle_A": angle}, error)
+
+
+def calculate_triangle_area_sine(a, b, C_degrees):
+    """Vectorized trigonometry.calculate_triangle_area_sine"""
+    a, b, C_degrees = _columns(a, b, C_degrees)
+    with np.errstate(over="ignore", invalid="ignore"):
+        area = 0.5 * a * b * np.sin(np.radians(C_degrees))
+    return _finish({"area": area}, _infinite(C_degrees))
+
+
+# --- Vectors ---
+
+def calculate_vector_magnitude(x, y):
+    """Vectorized vectors.calculate_vector_magnitude"""
+    x, y = _columns(x, y)
+    x_squared, x_failed = _power(x, 2)
+    y_squared, y_failed = _power(y, 2)
+    return _finish({"magnitude": np.sqrt(x_squared + y_squared)}, x_failed | y_failed)
+
+
+def add_vectors(x1, y1, x2, y2):
+    """Vectorized vectors.add_vectors"""
+    x1, y1, x2, y2 = _columns(x1, y1, x2, y2)
+    return {"x": x1 + x2, "y": y1 + y2}
+
+
+def scalar_multiply_vector(k, x, y):
+    """Vectorized vectors.scalar_multiply_vector"""
+    k, x, y = _columns(k, x, y)
+    return {"x": k * x, "y": k * y}
+
+
+def calculate_dot_product(x1, y1, x2, y2):
+    """Vectorized vectors.calculate_dot_product"""
+    x1, y1, x2, y2 = _columns(x1, y1, x2, y2)
+    return {"dot_product": x1*x2 + y1*y2}
+
+
+# --- Matrices ---
+
+def calculate_determinant_2x2(a, b, c, d):
+    """Vectorized matrices.calculate_determinant_2x2"""
+    a, b, c, d = _columns(a, b, c, d)
+    return {"determinant": a*d - b*c}
+
+
+def calculate_inverse_2x2(a, b, c, d):
+    """Vectorized matrices.calculate_inverse_2x2"""
+    a, b, c, d = _columns(a, b, c, d)
+    with np.errstate(over="ignore", invalid="ignore"):
+        det = a*d - b*c
+    error = det == 0
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        inv_factor = 1 / det
+        inverse = {
+            "a": d * inv_factor,
+            "b": -b * inv_factor,
+            "c": -c * inv_factor,
+            "d": a * inv_factor,
+        }
+    inverse["determinant"] = det
+    return _finish(inverse, error)
+
+
+def multiply_matrices_2x2(a1, b1, c1, d1, a2, b2, c2, d2):
+    """Vectorized matrices.multiply_matrices_2x2"""
+    a1, b1, c1, d1, a2, b2, c2, d2 = _columns(a1, b1, c1, d1, a2, b2, c2, d2)
+    return {
+        "a": a1*a2 + b1*c2, "b": a1*b2 + b1*d2,
+        "c": c1*a2 + d1*c2, "d": c1*b2 + d1*d2
+    }
+
+
+def solve_simultaneous_cramer(a1, b1, c1, a2, b2, c2):
+    """Vectorized matrices.solve_simultaneous_cramer"""
+    a1, b1, c1, a2, b2, c2 = _columns(a1, b1, c1, a2, b2, c2)
+    D = a1*b2 - a2*b1
+    Dx = c1*b2 - c2*b1
+    Dy = a1*c2 - a2*c1
+    error = D == 0
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        x = Dx / D
+        y = Dy / D
+    return _finish({"x": x, "y": y, "D": D, "Dx": Dx, "Dy": Dy}, error)
+
+
+# --- Probability ---
+
+def calculate_probability(successful_outcomes, total_outcomes):
+    """Vectorized probability.calculate_probability"""
+    successful, total = _columns(successful_outcomes, total_outcomes)
+    error = total == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prob = successful / total
+    return _finish({"probability": prob}, error)
+
+
+def calculate_combined_probability_or(p_a, p_b, p_a_and_b=0):
+    """Vectorized probability.calculate_combined_probability_or"""
+    p_a, p_b, p_a_and_b = _columns(p_a, p_b, p_a_and_b)
+    return {"probability_or": p_a + p_b - p_a_and_b}
+
+
+def calculate_independent_probability_and(p_a, p_b):
+    """Vectorized probability.calculate_independent_probability_and"""
+    p_a, p_b = _columns(p_a, p_b)
+    return {"probability_and": p_a * p_b}
+
+
+# --- Row-wise fallback ---
+
+def column_from_values(values):
+    """Pack per-row result values into the tightest array type (None -> NaN)"""
+    present = [v for v in values if v is not None]
+    if present and len(present) == len(values) and all(isinstance(v, bool) for v in values):
+        return np.array(values, dtype=bool)
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def run_rows(function, columns):
+    """
+    Evaluate a scalar formula row by row and collect columns
+
+    Used for formulas whose parameters are themselves lists (the statistics
+    functions), where each row is a whole dataset.
+
+    Args:
+        function (callable): Scalar formula
+        columns (dict): Parameter name -> sequence with one entry per row
+            (a length-1 sequence is repeated for every row)
+
+    Returns:
+        dict: Column per result key plus the boolean "error" mask
+    """
+    lengths = {len(column) for column in columns.values()} - {1}
+    if len(lengths) > 1:
+        raise ValueError("Batch columns must have the same length (or length 1)")
+    n = lengths.pop() if lengths else 1
+
+    rows = []
+    keys = {}
+    error = np.zeros(n, dtype=bool)
+    for i in range(n):
+        args = {name: column[i if len(column) > 1 else 0] for name, column in columns.items()}
+        try:
+            row = function(**args)
+        except (ArithmeticError, ValueError, IndexError, TypeError):
+            row = {}
+            error[i] = True
+        if "error" in row:
+            error[i] = True
+        keys.update(dict.fromkeys(row))
+        rows.append(row)
+
+    result = {}
+    for key in keys:
+        if key == "error":
+            continue
+        values = [None if error[i] else row.get(key) for i, row in enumerate(rows)]
+        result[key] = column_from_values(values)
+    result["error"] = error
+    return result
+
+
+BATCH_FORMULAS = {
+    "solve_linear": solve_linear,
+    "solve_quadratic_roots": solve_quadratic_roots,
+    "find_quadratic_vertex": find_quadratic_vertex,
+    "calculate_direct_variation": calculate_direct_variation,
+    "calculate_inverse_variation": calculate_inverse_variation,
+    "calculate_circle_properties": calculate_circle_properties,
+    "calculate_arc_sector": calculate_arc_sector,
+    "calculate_chord_length": calculate_chord_length,
+    "calculate_triangle_area": calculate_triangle_area,
+    "calculate_rectangle_properties": calculate_rectangle_properties,
+    "calculate_sphere_properties": calculate_sphere_properties,
+    "calculate_cylinder_properties": calculate_cylinder_properties,
+    "calculate_cone_properties": calculate_cone_properties,
+    "calculate_pyramid_properties": calculate_pyramid_properties,
+    "solve_arithmetic_progression": solve_arithmetic_progression,
+    "solve_geometric_progression": solve_geometric_progression,
+    "calculate_compound_interest": calculate_compound_interest,
+    "calculate_simple_interest": calculate_simple_interest,
+    "calculate_haversine": calculate_haversine,
+    "calculate_great_circle": calculate_great_circle,
+    "calculate_small_circle": calculate_small_circle,
+    "degrees_to_nautical_miles": degrees_to_nautical_miles,
+    "nautical_miles_to_kilometers": nautical_miles_to_kilometers,
+    "solve_accounting_equation": solve_accounting_equation,
+    "generate_balance_sheet": generate_balance_sheet,
+    "calculate_profit_loss": calculate_profit_loss,
+    "calculate_depreciation_straight_line": calculate_depreciation_straight_line,
+    "calculate_sine_rule_side": calculate_sine_rule_side,
+    "calculate_cosine_rule_side": calculate_cosine_rule_side,
+    "calculate_cosine_rule_angle": calculate_cosine_rule_angle,
+    "calculate_triangle_area_sine": calculate_triangle_area_sine,
+    "calculate_vector_magnitude": calculate_vector_magnitude,
+    "add_vectors": add_vectors,
+    "scalar_multiply_vector": scalar_multiply_vector,
+    "calculate_dot_product": calculate_dot_product,
+    "calculate_determinant_2x2": calculate_determinant_2x2,
+    "calculate_inverse_2x2": calculate_inverse_2x2,
+    "multiply_matrices_2x2": multiply_matrices_2x2,
+    "solve_simultaneous_cramer": solve_simultaneous_cramer,
+    "calculate_probability": calculate_probability,
+    "calculate_combined_probability_or": calculate_combined_probability_or,
+    "calculate_independent_probability_and": calculate_independent_probability_and,
+}
+
+
+def get_batch_function(name):
+    """
+    Get the batch entry point of a registered formula
+
+    Formulas without a vectorized kernel (the list-valued statistics
+    functions) get a row-wise wrapper around the scalar function.
+
+    Args:
+        name (str): Formula name
+
+    Returns:
+        callable: Accepts one column per parameter, returns a column dict
+    """
+    if name in BATCH_FORMULAS:
+        return BATCH_FORMULAS[name]
+
+    function = catalog.get_function(name)
+
+    def run(**columns):
+        return run_rows(function, columns)
+
+    run.__name__ = name
+    return run
+
+
+def dispatch_batch(name, columns):
+    """
+    Evaluate a formula over whole columns
+
+    Args:
+        name (str): Formula name
+        columns (dict): Parameter name -> array/sequence/scalar
+
+    Returns:
+        dict: Column arrays keyed like the scalar result
+    """
+    return get_batch_function(name)(**columns)
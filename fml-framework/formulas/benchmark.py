@@ -0,0 +1,254 @@
+"""
+Formula Benchmarks - FML Framework
+Times every registered formula and writes machine-readable JSON that can be
+compared against a stored baseline.
+
+Three kinds of cases are generated from the catalog:
+- scalar/<name>         one call with representative arguments
+- batch/<name>/n=<N>    the batch.py entry point over N rows
+- large/<name>/n=<N>    statistics functions over 1e3..1e7 values and the
+                        earth geometry formulas over 1e6 point pairs
+- large/<name>/<values>/n=<N>
+                        the list statistics again over floats and over
+                        wide-range integers (the default is small-range ints)
+
+Usage:
+    python -m formulas.benchmark -o bench.json
+    python -m formulas.benchmark --baseline bench.json --threshold 0.15
+    python -m formulas.benchmark --only statistics --max-size 1000000
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+
+from . import catalog
+
+
+# Representative values keyed by parameter name; anything missing gets 3.0
+PARAMETER_SAMPLES = {
+    "lat1": -1.2921, "lon1": 36.8219, "lat2": -4.0435, "lon2": 39.6682,
+    "latitude": -1.5, "unit": "km", "degrees": 12.5, "nautical_miles": 750.0,
+    "A_degrees": 40.0, "B_degrees": 65.0, "C_degrees": 30.0,
+    "angle_degrees": 60.0, "distance_from_center": 2.0, "radius": 5.0,
+    "p": 1000.0, "r": 0.05, "t": 10.0, "n": 12,
+    "p_a": 0.3, "p_b": 0.4, "p_a_and_b": 0.1,
+    "successful_outcomes": 3, "total_outcomes": 10,
+    "assets": 1000.0, "liabilities": 400.0, "capital": None,
+    "cost": 5000.0, "salvage_value": 500.0, "useful_life": 5,
+    "values": [12, 15, 15, 18, 20, 22, 22, 22, 25, 30],
+    "midpoints": [5, 15, 25, 35, 45],
+    "frequencies": [3, 7, 12, 6, 2],
+    "class_boundaries": [(0, 10), (10, 20), (20, 30), (30, 40), (40, 50)],
+}
+
+STATISTICS_SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+# Value distributions for analyze_data_list / calculate_standard_deviation:
+# small-range ints hit the counting path, floats and wide-range ints the
+# partition median (or the sort below SELECTION_MIN_SIZE)
+STATISTICS_VALUES = ("ints", "floats", "wide")
+EARTH_PAIRS = 10**6
+BATCH_ROWS = 10**5
+
+
+def sample_args(name):
+    """
+    Representative scalar arguments for a formula
+
+    Args:
+        name (str): Formula name
+
+    Returns:
+        dict: Keyword arguments
+    """
+    args = {}
+    for parameter in catalog.describe(name)["parameters"]:
+        value = PARAMETER_SAMPLES.get(parameter, 3.0)
+        if value is not None:
+            args[parameter] = value
+    return args
+
+
+def _time(function, repeat):
+    """Best-of-repeat seconds for one call of function"""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _case(seconds, items):
+    return {"seconds": seconds, "items": items, "ns_per_item": seconds / items * 1e9}
+
+
+def bench_scalar(name, repeat):
+    function = catalog.get_function(name)
+    args = sample_args(name)
+    return _case(_time(lambda: function(**args), repeat), 1)
+
+
+def bench_batch(name, rows, repeat):
+    import numpy as np
+    from .batch import dispatch_batch
+
+    rng = np.random.default_rng(0)
+    columns = {}
+    for parameter, value in sample_args(name).items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            columns[parameter] = value * rng.uniform(0.5, 1.5, rows)
+        else:
+            columns[parameter] = [value] * rows
+    return _case(_time(lambda: dispatch_batch(name, columns), repeat), rows)
+
+
+def _large_statistics_args(name, size, rng, values="ints"):
+    """Arguments for a statistics formula over `size` values or classes"""
+    if name in ("analyze_data_list", "calculate_standard_deviation"):
+        if values == "floats":
+            return {"values": [rng.uniform(0, 100) for _ in range(size)]}
+        if values == "wide":
+            return {"values": [rng.randint(-10**9, 10**9) for _ in range(size)]}
+        return {"values": [rng.randint(0, 100) for _ in range(size)]}
+    frequencies = [rng.randint(1, 50) for _ in range(size)]
+    if name == "calculate_grouped_mean":
+        return {"midpoints": [10 * i + 5 for i in range(size)], "frequencies": frequencies}
+    return {
+        "class_boundaries": [(10 * i, 10 * (i + 1)) for i in range(size)],
+        "frequencies": frequencies,
+    }
+
+
+def bench_large(names, max_size, repeat):
+    """Large-input cases for the statistics and earth geometry formulas"""
+    results = {}
+    rng = random.Random(0)
+
+    for name in names:
+        category = catalog.describe(name)["category"]
+        if category == "statistics":
+            function = catalog.get_function(name)
+            kinds = STATISTICS_VALUES if "values" in catalog.describe(name)["parameters"] else ("ints",)
+            for values in kinds:
+                label = "" if values == "ints" else f"{values}/"
+                for size in STATISTICS_SIZES:
+                    if size > max_size:
+                        break
+                    args = _large_statistics_args(name, size, rng, values)
+                    seconds = min(timeit.repeat(lambda: function(**args), repeat=repeat, number=1))
+                    results[f"large/{name}/{label}n={size}"] = _case(seconds, size)
+        elif category == "earth_geometry" and EARTH_PAIRS <= max_size:
+            results[f"large/{name}/n={EARTH_PAIRS}"] = bench_batch(name, EARTH_PAIRS, repeat)
+    return results
+
+
+def run(only=None, max_size=10**7, batch_rows=BATCH_ROWS, repeat=3, kinds=("scalar", "batch", "large")):
+    """
+    Run the benchmark suite
+
+    Args:
+        only (str, optional): Only formulas whose name or category contains this
+        max_size (int): Largest input size for the large-input cases
+        batch_rows (int): Rows per batch case
+        repeat (int): Repetitions per case (the best one is kept)
+        kinds (tuple): Which case kinds to run
+
+    Returns:
+        dict: {"meta": {...}, "results": {case: {seconds, items, ns_per_item}}}
+    """
+    names = [
+        name for name in catalog.list_formulas()
+        if only is None or only in name or only == catalog.describe(name)["category"]
+    ]
+    results = {}
+    if "scalar" in kinds:
+        for name in names:
+            results[f"scalar/{name}"] = bench_scalar(name, repeat)
+    if "batch" in kinds:
+        for name in names:
+            results[f"batch/{name}/n={batch_rows}"] = bench_batch(name, batch_rows, repeat)
+    if "large" in kinds:
+        results.update(bench_large(names, max_size, repeat))
+
+    meta = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    try:
+        import numpy
+        meta["numpy"] = numpy.__version__
+    except ImportError:
+        pass
+    return {"meta": meta, "results": results}
+
+
+def compare(current, baseline, threshold=0.10):
+    """
+    Compare a run against a baseline
+
+    Args:
+        current (dict): Output of run()
+        baseline (dict): Stored output of an earlier run()
+        threshold (float): Allowed slowdown ratio (0.10 = 10% slower)
+
+    Returns:
+        list: Regression dicts (case, baseline, current, ratio), worst first
+    """
+    regressions = []
+    for case, result in current["results"].items():
+        before = baseline["results"].get(case)
+        if before is None or before["seconds"] <= 0:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        if ratio > 1 + threshold:
+            regressions.append({
+                "case": case,
+                "baseline": before["seconds"],
+                "current": result["seconds"],
+                "ratio": ratio,
+            })
+    return sorted(regressions, key=lambda item: item["ratio"], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m formulas.benchmark",
+        description="Benchmark every registered formula"
+    )
+    parser.add_argument("-o", "--output", help="Write results JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a stored results JSON")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Slowdown ratio reported as a regression (default 0.10)")
+    parser.add_argument("--only", help="Only formulas whose name contains this, or this category")
+    parser.add_argument("--max-size", type=float, default=1e7, help="Largest large-input size")
+    parser.add_argument("--batch-rows", type=int, default=BATCH_ROWS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--kinds", default="scalar,batch,large",
+                        help="Comma-separated subset of scalar,batch,large")
+    args = parser.parse_args(argv)
+
+    report = run(args.only, int(args.max_size), args.batch_rows, args.repeat,
+                 tuple(args.kinds.split(",")))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare(report, json.load(handle), args.threshold)
+        for item in regressions:
+            print(f"REGRESSION {item['case']}: {item['baseline']:.3g}s -> "
+                  f"{item['current']:.3g}s (x{item['ratio']:.2f})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Formula Cache - FML Framework
+Opt-in memoization for the pure formula functions, with LRU eviction,
+optional TTL, a byte budget and hit/miss counters.
+
+Arguments are normalized before lookup: 1 and 1.0 share an entry (True
+does not), lists and tuples are interchangeable, and keyword/positional/
+default spellings of the same call share an entry. A shared entry returns
+whichever spelling ran first, so a formula that echoes or computes from
+its inputs may give 5.0 for a call spelled 5 - the same value, not always
+the same type. Formulas in EXACT_INT_FORMULAS compute with exact integer
+arithmetic, where ints and floats give different values; they keep ints
+in separate entries.
+
+Usage:
+    from formulas.cache import cache_registry
+    from formulas.earth_geometry import FORMULAS
+
+    CACHED = cache_registry(FORMULAS, maxsize=10000, ttl=3600)
+    CACHED["calculate_haversine"]["function"](-1.28, 36.8, -4.04, 39.67)
+"""
+
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+# Formulas whose results differ in value (not just type) for int and float
+# arguments, e.g. r**n as an exact integer vs a float power
+EXACT_INT_FORMULAS = frozenset({"solve_geometric_progression"})
+
+_UNCACHEABLE = object()
+_MISS = object()
+
+
+def _normalize(value, exact_ints=False):
+    """Build a hashable, type-normalized key component (or _UNCACHEABLE)"""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return ("bool", value)
+    if isinstance(value, float):
+        return ("nan",) if value != value else value  # NaN never equals itself
+    if isinstance(value, int):
+        # 1 == 1.0 with equal hashes, so ints share their float twin's
+        # entry; ints a float cannot hold exactly still compare unequal
+        return ("int", value) if exact_ints else value
+    if isinstance(value, (list, tuple)):
+        items = tuple(_normalize(item, exact_ints) for item in value)
+        return _UNCACHEABLE if _UNCACHEABLE in items else ("seq", items)
+    if isinstance(value, dict):
+        items = tuple(sorted((str(k), _normalize(v, exact_ints)) for k, v in value.items()))
+        return _UNCACHEABLE if any(v is _UNCACHEABLE for _, v in items) else ("map", items)
+    if hasattr(value, "item") and getattr(value, "ndim", None) == 0:
+        return _normalize(value.item(), exact_ints)  # NumPy scalar
+    return _UNCACHEABLE
+
+
+def _copy(value):
+    """Copy the mutable parts of a result so callers cannot poison the cache"""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def _sizeof(value):
+    """Approximate deep size of a key or result in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_sizeof(item) for item in value)
+    return size
+
+
+class FormulaCache:
+    """
+    Bounded result cache shared by one or more memoized formulas
+
+    Args:
+        maxsize (int, optional): Maximum number of entries (None = unbounded)
+        ttl (float, optional): Seconds an entry stays valid (None = forever)
+        max_bytes (int, optional): Approximate memory budget for keys+results
+        clock (callable): Time source, for tests
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, max_bytes=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.uncacheable = 0
+
+    def get(self, key):
+        """Return the cached result for key, or _MISS"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISS
+            result, size, expires = entry
+            if expires is not None and self._clock() >= expires:
+                del self._entries[key]
+                self.bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return _MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        """Store a result, evicting least recently used entries as needed"""
+        size = _sizeof(key) + _sizeof(result) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires = self._clock() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (result, size, expires)
+            self.bytes += size
+
+            while self._entries and (
+                (self.maxsize is not None and len(self._entries) > self.maxsize)
+                or (self.max_bytes is not None and self.bytes > self.max_bytes)
+            ):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def record_uncacheable(self):
+        """Count a call whose arguments could not form a key"""
+        with self._lock:
+            self.uncacheable += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Snapshot of the cache counters
+
+        Returns:
+            dict: hits, misses, hit_rate, evictions, expirations,
+                uncacheable, entries and bytes
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "uncacheable": self.uncacheable,
+            "entries": len(self._entries),
+            "bytes": self.bytes if self.max_bytes is not None else None,
+        }
+
+
+def memoize(function, cache=None, exact_ints=None, **options):
+    """
+    Wrap a pure formula function with a result cache
+
+    Args:
+        function (callable): Formula function
+        cache (FormulaCache, optional): Shared cache; a new one is created
+            from **options (maxsize, ttl, max_bytes) when omitted
+        exact_ints (bool, optional): Key ints apart from equal floats;
+            defaults to whether the function is in EXACT_INT_FORMULAS
+
+    Returns:
+        callable: Wrapper with the same signature; exposes .cache and
+            .__wrapped__
+    """
+    cache = cache if cache is not None else FormulaCache(**options)
+    if exact_ints is None:
+        exact_ints = function.__name__ in EXACT_INT_FORMULAS
+    parameters = list(inspect.signature(function).parameters.values())
+    names = [p.name for p in parameters]
+    defaults = {p.name: p.default for p in parameters if p.default is not inspect.Parameter.empty}
+    tag = f"{function.__module__}.{function.__qualname__}"
+
+    def make_key(args, kwargs):
+        if len(args) > len(names):
+            return _UNCACHEABLE
+        values = list(args)
+        used = 0
+        for name in names[len(args):]:
+            if name in kwargs:
+                values.append(kwargs[name])
+                used += 1
+            elif name in defaults:
+                values.append(defaults[name])
+            else:
+                return _UNCACHEABLE
+        if used != len(kwargs):
+            return _UNCACHEABLE
+        key = tuple(_normalize(value, exact_ints) for value in values)
+        return _UNCACHEABLE if _UNCACHEABLE in key else (tag, key)
+
+    def wrapper(*args, **kwargs):
+        key = make_key(args, kwargs)
+        if key is _UNCACHEABLE:
+            cache.record_uncacheable()
+            return function(*args, **kwargs)
+
+        result = cache.get(key)
+        if result is _MISS:
+            result = function(*args, **kwargs)
+            cache.put(key, _copy(result))
+            return result
+        return _copy(result)
+
+    wrapper.__name__ = function.__name__
+    wrapper.__qualname__ = function.__qualname__
+    wrapper.__doc__ = function.__doc__
+    wrapper.__module__ = function.__module__
+    wrapper.__wrapped__ = function
+    wrapper.cache = cache
+    return wrapper
+
+
+def cache_registry(formulas, cache=None, **options):
+    """
+    Copy a FORMULAS dict with every function memoized
+
+    All formulas share one cache, so maxsize and max_bytes bound the
+    registry as a whole. The original registry is left untouched.
+
+    Args:
+        formulas (dict): A module's FORMULAS dict
+        cache (FormulaCache, optional): Cache to share
+
+    Returns:
+        dict: FORMULAS-shaped dict with memoized "function" entries
+    """
+    cache = cache if cache is not None else FormulaCache(**options)
+    cached = {}
+    for name, meta in formulas.items():
+        entry = dict(meta)
+        entry["function"] = memoize(meta["function"], cache=cache)
+        cached[name] = entry
+    return cached
@@ -0,0 +1,325 @@
+"""
+Formula Catalog - FML Framework
+Indexes every FORMULAS entry by name and category without importing the
+formula modules until a formula is actually resolved
+"""
+
+import importlib
+import marshal
+import os
+import sys
+
+
+_PACKAGE = __name__.rpartition(".")[0] or "formulas"
+_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+_CACHE_PATH = os.path.join(_DIRECTORY, "__pycache__", "formula_catalog.bin")
+_CACHE_VERSION = (1,) + tuple(sys.version_info[:2])
+
+_index = None
+_aliases = None
+_loaded = {}
+_dispatch_hook = None
+
+
+def _source_files():
+    """
+    Stat every formula module in the package directory
+
+    Returns:
+        dict: Maps module name to [mtime_ns, size] of its source file
+    """
+    files = {}
+    with os.scandir(_DIRECTORY) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".py") or entry.name.startswith("_"):
+                continue
+            stat = entry.stat()
+            files[entry.name[:-3]] = [stat.st_mtime_ns, stat.st_size]
+    return files
+
+
+def _scan_module(module):
+    """
+    Read the FORMULAS literal of a module without executing it
+
+    Args:
+        module (str): Module name inside the formulas package
+
+    Returns:
+        dict: Maps formula name to its metadata (minus the function)
+    """
+    with open(os.path.join(_DIRECTORY, module + ".py"), encoding="utf-8") as handle:
+        source = handle.read()
+
+    if "FORMULAS" not in source:
+        return {}
+
+    import ast  # only needed when the cache is stale
+
+    entries = {}
+    for node in ast.parse(source).body:
+        if not isinstance(node, ast.Assign) or not isinstance(node.value, ast.Dict):
+            continue
+        if not any(isinstance(t, ast.Name) and t.id == "FORMULAS" for t in node.targets):
+            continue
+
+        for key, value in zip(node.value.keys, node.value.values):
+            meta = {}
+            for field, field_value in zip(value.keys, value.values):
+                field_name = ast.literal_eval(field)
+                if field_name == "function":
+                    continue
+                meta[field_name] = ast.literal_eval(field_value)
+            meta["module"] = module
+            entries[ast.literal_eval(key)] = meta
+    return entries
+
+
+def _load_cache(files):
+    """Return the cached index if it was built from the same sources"""
+    try:
+        with open(_CACHE_PATH, "rb") as handle:
+            cached = marshal.load(handle)
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+
+    if not isinstance(cached, dict) or cached.get("version") != _CACHE_VERSION:
+        return None
+    if cached.get("files") != files:
+        return None
+    return cached["formulas"]
+
+
+def _save_cache(files, formulas):
+    """Persist the index next to the bytecode cache, ignoring read-only installs"""
+    try:
+        os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+        with open(_CACHE_PATH, "wb") as handle:
+            marshal.dump({"version": _CACHE_VERSION, "files": files, "formulas": formulas}, handle)
+    except OSError:
+        pass
+
+
+def _get_index():
+    """
+    Build (or reuse) the name -> metadata index
+
+    The index is read from a small marshal cache keyed on each module's
+    mtime and size, so a warm start costs a directory scan and one file
+    read. Modules are only parsed when their source has changed.
+    """
+    global _index
+    if _index is not None:
+        return _index
+
+    files = _source_files()
+    formulas = _load_cache(files)
+
+    if formulas is None:
+        formulas = {}
+        for module in sorted(files):
+            for name, meta in _scan_module(module).items():
+                if name in formulas:
+                    raise ValueError(
+                        f"Formula '{name}' is defined in both "
+                        f"{formulas[name]['module']} and {module}"
+                    )
+                formulas[name] = meta
+        _save_cache(files, formulas)
+
+    _index = formulas
+    return _index
+
+
+def list_formulas(category=None):
+    """
+    List registered formula names
+
+    Args:
+        category (str, optional): Only list formulas in this category
+
+    Returns:
+        list: Formula names in module order
+    """
+    index = _get_index()
+    if category is None:
+        return list(index)
+    return [name for name, meta in index.items() if meta.get("category") == category]
+
+
+def list_categories():
+    """
+    List every formula category
+
+    Returns:
+        list: Sorted category names
+    """
+    return sorted({meta.get("category") for meta in _get_index().values()})
+
+
+def _lookup(name):
+    """Return the indexed metadata of a formula or raise KeyError"""
+    meta = _get_index().get(name)
+    if meta is None:
+        raise KeyError(f"Unknown formula: {name}")
+    return meta
+
+
+def _camel_case(name):
+    """calculate_linear_y -> calculateLinearY, as the apps name their tools"""
+    head, *rest = name.split("_")
+    return head + "".join(part[:1].upper() + part[1:] for part in rest)
+
+
+def resolve_name(tool):
+    """
+    Map a tool name to its registry name
+
+    Registry names, their camelCase forms and the "aliases" listed in a
+    FORMULAS entry (for app tools whose name differs from the formula's)
+    are all resolved through the index.
+
+    Args:
+        tool (str): Registry name, camelCase name or alias
+
+    Returns:
+        str: Registry (snake_case) name
+    """
+    global _aliases
+    index = _get_index()
+    if tool in index:
+        return tool
+    if _aliases is None:
+        aliases = {}
+        for name, meta in index.items():
+            aliases[_camel_case(name)] = name
+            for alias in meta.get("aliases", ()):
+                aliases[alias] = name
+        _aliases = aliases
+    name = _aliases.get(tool)
+    if name is None:
+        raise KeyError(f"Unknown formula: {tool}")
+    return name
+
+
+def describe(name):
+    """
+    Get the metadata of a formula without importing its module
+
+    Args:
+        name (str): Formula name (key of a FORMULAS dict)
+
+    Returns:
+        dict: name, description, category, parameters and owning module
+    """
+    return dict(_lookup(name))
+
+
+def _load_module(module):
+    """Import a formula module once and return its FORMULAS dict"""
+    formulas = _loaded.get(module)
+    if formulas is None:
+        formulas = importlib.import_module(f"{_PACKAGE}.{module}").FORMULAS
+        _loaded[module] = formulas
+    return formulas
+
+
+def get_formula(name):
+    """
+    Resolve a formula, importing its module on first use
+
+    Args:
+        name (str): Formula name
+
+    Returns:
+        dict: The module's FORMULAS entry, including the function
+    """
+    return _load_module(_lookup(name)["module"])[name]
+
+
+def parameter_docs(name):
+    """
+    Parse the Args section of a formula's docstring
+
+    Lines like "radius (float): Radius of the circle" and
+    "a, b, c, d (float): Matrix elements" are recognized.
+
+    Args:
+        name (str): Formula name
+
+    Returns:
+        dict: parameter -> {"type", "optional", "description"}; parameters
+            the docstring does not document are missing
+    """
+    import re
+
+    doc = get_formula(name)["function"].__doc__ or ""
+    parsed = {}
+    in_args = False
+    for line in doc.splitlines():
+        stripped = line.strip()
+        if stripped in ("Args:", "Returns:"):
+            in_args = stripped == "Args:"
+            continue
+        if not in_args or not stripped:
+            continue
+        match = re.match(r"^([\w\s,]+?)\s*(?:\(([^)]*)\))?\s*:\s*(.*)$", stripped)
+        if match:
+            hints = [hint.strip() for hint in (match.group(2) or "").split(",")]
+            for parameter in match.group(1).split(","):
+                parsed[parameter.strip()] = {
+                    "type": hints[0],
+                    "optional": "optional" in hints,
+                    "description": match.group(3),
+                }
+    return parsed
+
+
+def get_function(name):
+    """
+    Resolve the callable behind a formula
+
+    Args:
+        name (str): Formula name
+
+    Returns:
+        callable: The formula implementation (wrapped by the dispatch
+            hook when one is installed)
+    """
+    function = get_formula(name)["function"]
+    if _dispatch_hook is not None:
+        return _dispatch_hook(name, function)
+    return function
+
+
+def set_dispatch_hook(hook):
+    """
+    Install (or with None, remove) a wrapper applied by get_function
+
+    Args:
+        hook (callable, optional): hook(name, function) -> callable
+    """
+    global _dispatch_hook
+    _dispatch_hook = hook
+
+
+def dispatch(name, args):
+    """
+    Call a formula with named arguments, like toolDispatcher.js does
+
+    Args:
+        name (str): Formula name
+        args (dict): Keyword arguments for the formula
+
+    Returns:
+        dict: The formula result
+    """
+    return get_function(name)(**args)
+
+
+def refresh():
+    """Forget the in-memory index so the next lookup rescans the modules"""
+    global _index, _aliases
+    _index = None
+    _aliases = None
+    _loaded.clear()
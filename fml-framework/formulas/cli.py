@@ -0,0 +1,276 @@
+"""
+Batch Evaluation CLI - FML Framework
+Streams formula invocations from a JSONL or CSV file, dispatches them
+through the FORMULAS registries and writes JSONL results in input order.
+
+Each input row names a tool and its arguments, in the same shape the apps'
+toolDispatcher.js receives:
+
+    {"tool": "calculate_haversine", "args": {"lat1": 0, "lon1": 0, ...}}
+
+CSV files use a "tool" column plus either an "args" column holding a JSON
+object or one column per parameter. camelCase tool names and the app tool
+aliases listed in FORMULAS are resolved to the registry's snake_case names.
+
+Usage:
+    python -m formulas.cli jobs.jsonl -o results.jsonl --workers 8
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from . import catalog
+
+
+@lru_cache(maxsize=None)
+def resolve_tool_name(tool):
+    """
+    Map a tool name to its registry name
+
+    Args:
+        tool (str): Registry name, camelCase tool name or app alias
+
+    Returns:
+        str: Registry (snake_case) name
+    """
+    return catalog.resolve_name(tool)
+
+
+def _parse_cell(value):
+    """Turn a CSV cell into a number, JSON value, None or the raw string"""
+    if value == "":
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _parse_record(kind, record):
+    """
+    Split one input record into (tool, args, id)
+
+    Args:
+        kind (str): "jsonl" (record is a line) or "csv" (record is a dict)
+        record: Raw input record
+    """
+    if kind == "jsonl":
+        row = json.loads(record)
+        tool = row.get("tool") or row.get("name") or row.get("toolName")
+        return tool, row.get("args") or row.get("arguments") or {}, row.get("id")
+
+    row = dict(record)
+    tool = row.pop("tool", None)
+    row_id = row.pop("id", None)
+    if "args" in row:
+        return tool, json.loads(row["args"] or "{}"), row_id
+    args = {key: _parse_cell(value) for key, value in row.items()}
+    return tool, {key: value for key, value in args.items() if value is not None}, row_id
+
+
+def evaluate_record(kind, record, validate=False):
+    """
+    Evaluate one input record
+
+    With validate=True the arguments are checked by formulas.validation
+    first and rejected rows never reach the formula.
+
+    Returns:
+        dict: {"tool", "result"} or {"tool", "error"}, plus "id" if given
+    """
+    output = {}
+    tool = None
+    try:
+        tool, args, row_id = _parse_record(kind, record)
+        if row_id is not None:
+            output["id"] = row_id
+        output["tool"] = tool
+        name = resolve_tool_name(tool)
+        if validate:
+            from .validation import validate_args
+
+            problem = validate_args(name, args)
+            if problem is not None:
+                output["error"] = f"ValidationError: {problem}"
+                return output
+        output["result"] = catalog.dispatch(name, args)
+    except Exception as exc:  # one bad row must not abort the job
+        output["tool"] = tool
+        output["error"] = f"{type(exc).__name__}: {exc}"
+    return output
+
+
+def evaluate_chunk(kind, records, validate=False):
+    """
+    Evaluate a chunk of records and serialize the output lines
+
+    Runs inside worker processes, so parsing and JSON encoding are
+    parallelized along with the formulas themselves.
+
+    Returns:
+        str: Newline-terminated JSONL output for the chunk
+    """
+    return "".join(serialize_record(evaluate_record(kind, record, validate)) + "\n" for record in records)
+
+
+def _finite(value):
+    """Replace inf and nan floats with None, recursing into containers"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def serialize_record(output):
+    """
+    Encode one output record as a JSON line
+
+    inf and nan results are written as null, like the JSON-RPC server does,
+    so every line stays valid JSON. A result JSON cannot represent at all
+    (e.g. a complex root) becomes an error record instead of aborting the
+    chunk.
+
+    Returns:
+        str: JSON text without the newline
+    """
+    try:
+        try:
+            return json.dumps(output, allow_nan=False)
+        except ValueError:
+            return json.dumps(_finite(output), allow_nan=False)
+    except (TypeError, ValueError) as exc:
+        failed = {key: output[key] for key in ("id", "tool") if key in output}
+        failed["error"] = f"{type(exc).__name__}: {exc}"
+        return json.dumps(failed)
+
+
+def read_chunks(handle, kind, chunk_size):
+    """
+    Stream input records in chunks
+
+    Args:
+        handle: Open text file
+        kind (str): "jsonl" or "csv"
+        chunk_size (int): Records per chunk
+
+    Yields:
+        list: Up to chunk_size records
+    """
+    if kind == "csv":
+        records = csv.DictReader(handle)
+    else:
+        records = (line for line in handle if line.strip())
+
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run(input_handle, output_handle, kind="jsonl", workers=None, chunk_size=5000, validate=False):
+    """
+    Evaluate every record of an input stream and write results in order
+
+    At most two chunks per worker are in flight at any time, so memory
+    stays bounded regardless of the input size.
+
+    Args:
+        input_handle: Readable text stream
+        output_handle: Writable text stream
+        kind (str): "jsonl" or "csv"
+        workers (int, optional): Worker processes (1 evaluates in-process)
+        chunk_size (int): Records per chunk sent to a worker
+        validate (bool): Check arguments before evaluating each record
+
+    Returns:
+        int: Number of chunks processed
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = read_chunks(input_handle, kind, chunk_size)
+    count = 0
+
+    if workers == 1:
+        for chunk in chunks:
+            output_handle.write(evaluate_chunk(kind, chunk, validate))
+            count += 1
+        return count
+
+    from . import metrics
+
+    recording = metrics.is_enabled()
+
+    def submit(executor, chunk):
+        if recording:
+            return executor.submit(metrics.record_call, evaluate_chunk, kind, chunk, validate)
+        return executor.submit(evaluate_chunk, kind, chunk, validate)
+
+    def collect(future):
+        if not recording:
+            return future.result()
+        text, recorded = future.result()
+        metrics.merge(recorded)
+        return text
+
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in chunks:
+            pending.append(submit(executor, chunk))
+            if len(pending) >= workers * 2:
+                output_handle.write(collect(pending.popleft()))
+                count += 1
+        while pending:
+            output_handle.write(collect(pending.popleft()))
+            count += 1
+    return count
+
+
+def _detect_kind(path, requested):
+    """Pick the input format from --format or the file extension"""
+    if requested:
+        return requested
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m formulas.cli",
+        description="Evaluate formula invocations from a JSONL or CSV file"
+    )
+    parser.add_argument("input", help="Input file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Output JSONL file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from extension)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per worker task")
+    parser.add_argument("--validate", action="store_true",
+                        help="Reject rows whose arguments fail the formula's validator")
+    args = parser.parse_args(argv)
+
+    kind = _detect_kind(args.input, args.format)
+    input_handle = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    output_handle = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        run(input_handle, output_handle, kind, args.workers, args.chunk_size, args.validate)
+    finally:
+        if input_handle is not sys.stdin:
+            input_handle.close()
+        if output_handle is not sys.stdout:
+            output_handle.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
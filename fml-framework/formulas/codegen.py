@@ -0,0 +1,766 @@
+"""
+JavaScript Code Generator - FML Framework
+Generates an app's src/lib math.js, aiTools.js and toolDispatcher.js from
+the FORMULAS metadata and the Python function sources (AGENT_GUIDE.md,
+Phase 3 "Library Gen").
+
+- math.js: each formula transpiled to an exported camelCase function
+- aiTools.js: tool schemas built from "parameters" and the docstring Args
+- toolDispatcher.js: switch from tool name to math.js call
+
+Every formula is content-hashed (source, metadata, generator version) and
+its generated snippets are cached per app, so a rebuild only transpiles the
+formulas that changed. Several apps are generated in parallel.
+
+Constructs the transpiler does not understand produce a stub that throws,
+so a partial port is visible instead of silently wrong.
+
+Usage:
+    python -m formulas.codegen ../mathf3-o ../mathf4-o
+    python -m formulas.codegen ../mathf4-o --categories trigonometry,vectors,matrices
+
+Files are written to <app>/src/lib/generated/ by default so hand-written
+libraries are never overwritten. An optional <app>/fml-codegen.json can set
+"categories", "formulas" and "out_dir" per app.
+"""
+
+import argparse
+import ast
+import hashlib
+import inspect
+import json
+import os
+import sys
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+
+from . import catalog
+
+
+GENERATOR_VERSION = 2
+DEFAULT_OUT_DIR = os.path.join("src", "lib", "generated")
+CACHE_FILE = ".fml-codegen-cache.json"
+APP_CONFIG_FILE = "fml-codegen.json"
+
+HELPERS = {
+    "_sum": (
+        "function _sum(values) {\n"
+        "  let total = 0;\n"
+        "  for (const value of values) total += value;\n"
+        "  return total;\n"
+        "}"
+    ),
+    "_zip": (
+        "function _zip(...arrays) {\n"
+        "  const length = Math.min(...arrays.map((array) => array.length));\n"
+        "  return Array.from({ length }, (_, i) => arrays.map((array) => array[i]));\n"
+        "}"
+    ),
+    "_range": (
+        "function _range(start, stop, step = 1) {\n"
+        "  if (stop === undefined) [start, stop] = [0, start];\n"
+        "  const values = [];\n"
+        "  for (let i = start; step > 0 ? i < stop : i > stop; i += step) values.push(i);\n"
+        "  return values;\n"
+        "}"
+    ),
+    "_counter": (
+        "function _counter(values) {\n"
+        "  const counts = new Map();\n"
+        "  for (const value of values) counts.set(value, (counts.get(value) || 0) + 1);\n"
+        "  return counts;\n"
+        "}"
+    ),
+}
+
+_MATH_FUNCTIONS = {
+    "sqrt": "Math.sqrt", "sin": "Math.sin", "cos": "Math.cos", "tan": "Math.tan",
+    "asin": "Math.asin", "acos": "Math.acos", "atan": "Math.atan", "atan2": "Math.atan2",
+    "exp": "Math.exp", "log10": "Math.log10", "floor": "Math.floor", "ceil": "Math.ceil",
+    "fabs": "Math.abs", "hypot": "Math.hypot",
+}
+# A formula module lists its Python-only fast paths in __python_only__.
+# They return None to mean "use the plain code below", so in JavaScript
+# they always take the plain path: `x = helper(...)` is dropped and
+# `if x is None` / `if x is not None` reduce to one branch
+
+_METHODS = {"items": "entries", "values": "values", "keys": "keys",
+            "index": "indexOf", "append": "push"}
+
+# JavaScript operator precedence (MDN numbering)
+_TERNARY, _OR, _AND, _EQUALITY, _RELATIONAL = 2, 3, 4, 8, 9
+_ADDITIVE, _MULTIPLICATIVE, _EXPONENT, _UNARY, _MEMBER, _ATOM = 11, 12, 13, 14, 17, 20
+
+_BINARY = {
+    ast.Add: ("+", _ADDITIVE), ast.Sub: ("-", _ADDITIVE),
+    ast.Mult: ("*", _MULTIPLICATIVE), ast.Div: ("/", _MULTIPLICATIVE),
+    ast.Mod: ("%", _MULTIPLICATIVE), ast.Pow: ("**", _EXPONENT),
+}
+_COMPARE = {
+    ast.Eq: ("===", _EQUALITY), ast.NotEq: ("!==", _EQUALITY),
+    ast.Lt: ("<", _RELATIONAL), ast.LtE: ("<=", _RELATIONAL),
+    ast.Gt: (">", _RELATIONAL), ast.GtE: (">=", _RELATIONAL),
+}
+
+
+class UnsupportedSyntax(Exception):
+    """Raised for Python constructs the transpiler cannot translate"""
+
+
+def camel_case(name):
+    """solve_quadratic_roots -> solveQuadraticRoots"""
+    head, *rest = name.split("_")
+    return head + "".join(part[:1].upper() + part[1:] for part in rest)
+
+
+def _js_string(value):
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'").replace("\n", "\\n") + "'"
+
+
+def _wrap(code, prec, minimum):
+    return f"({code})" if prec < minimum else code
+
+
+class _Transpiler:
+    """Translate one Python formula function into a JavaScript function"""
+
+    def __init__(self, formula_names, constants, python_only_helpers=frozenset()):
+        self.formula_names = formula_names
+        self.constants = constants
+        self.python_only_helpers = python_only_helpers
+        self.helpers = set()
+        self.used_constants = set()
+        self.python_only = set()  # names holding a Python-only helper result
+
+    # --- expressions: each returns (code, precedence) ---
+
+    def expr(self, node):
+        method = getattr(self, "expr_" + type(node).__name__, None)
+        if method is None:
+            raise UnsupportedSyntax(type(node).__name__)
+        return method(node)
+
+    def code(self, node, minimum=0):
+        code, prec = self.expr(node)
+        return _wrap(code, prec, minimum)
+
+    def expr_Constant(self, node):
+        value = node.value
+        if value is None:
+            return "null", _ATOM
+        if isinstance(value, bool):
+            return ("true" if value else "false"), _ATOM
+        if isinstance(value, (int, float)):
+            return repr(value), _ATOM
+        if isinstance(value, str):
+            return _js_string(value), _ATOM
+        raise UnsupportedSyntax(repr(value))
+
+    def expr_Name(self, node):
+        if node.id in self.python_only:
+            raise UnsupportedSyntax(f"use of Python-only result {node.id}")
+        if node.id in self.constants:
+            self.used_constants.add(node.id)
+        return node.id, _ATOM
+
+    def expr_List(self, node):
+        return "[" + ", ".join(self.code(item) for item in node.elts) + "]", _ATOM
+
+    expr_Tuple = expr_List
+
+    def expr_Dict(self, node):
+        items = []
+        for key, value in zip(node.keys, node.values):
+            if not isinstance(key, ast.Constant) or not isinstance(key.value, str):
+                raise UnsupportedSyntax("non-string dict key")
+            name = key.value if key.value.isidentifier() else _js_string(key.value)
+            items.append(f"{name}: {self.code(value, _TERNARY)}")
+        return "{ " + ", ".join(items) + " }" if items else "{}", _ATOM
+
+    def expr_BinOp(self, node):
+        if isinstance(node.op, ast.FloorDiv):
+            return f"Math.floor({self.code(node.left)} / {self.code(node.right)})", _MEMBER
+        if type(node.op) not in _BINARY:
+            raise UnsupportedSyntax(type(node.op).__name__)
+        op, prec = _BINARY[type(node.op)]
+        if op == "**":
+            # right-associative; a unary base (-x ** 2) is a JS syntax error
+            return f"{self.code(node.left, _UNARY + 1)} ** {self.code(node.right, prec)}", prec
+        return f"{self.code(node.left, prec)} {op} {self.code(node.right, prec + 1)}", prec
+
+    def expr_UnaryOp(self, node):
+        if isinstance(node.op, ast.Not):
+            return f"!{self.code(node.operand, _UNARY)}", _UNARY
+        op = {ast.USub: "-", ast.UAdd: "+"}.get(type(node.op))
+        if op is None:
+            raise UnsupportedSyntax(type(node.op).__name__)
+        return f"{op}{self.code(node.operand, _UNARY)}", _UNARY
+
+    def expr_BoolOp(self, node):
+        op, prec = ("&&", _AND) if isinstance(node.op, ast.And) else ("||", _OR)
+        return f" {op} ".join(self.code(value, prec + 1) for value in node.values), prec
+
+    def expr_Compare(self, node):
+        parts = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(self._compare(left, op, right))
+            left = right
+        if len(parts) == 1:
+            return parts[0]
+        return " && ".join(_wrap(code, prec, _AND + 1) for code, prec in parts), _AND
+
+    def _compare(self, left, op, right):
+        if isinstance(op, (ast.Is, ast.IsNot)):
+            if not (isinstance(right, ast.Constant) and right.value is None):
+                raise UnsupportedSyntax("is with non-None")
+            # loose equality also treats a missing (undefined) argument as None
+            js_op = "==" if isinstance(op, ast.Is) else "!="
+            return f"{self.code(left, _EQUALITY)} {js_op} null", _EQUALITY
+        if isinstance(op, (ast.In, ast.NotIn)):
+            code = f"{self.code(right, _MEMBER)}.includes({self.code(left)})"
+            return (f"!{code}", _UNARY) if isinstance(op, ast.NotIn) else (code, _MEMBER)
+        if type(op) not in _COMPARE:
+            raise UnsupportedSyntax(type(op).__name__)
+        js_op, prec = _COMPARE[type(op)]
+        return f"{self.code(left, prec)} {js_op} {self.code(right, prec + 1)}", prec
+
+    def expr_IfExp(self, node):
+        return (f"{self.code(node.test, _OR)} ? {self.code(node.body, _TERNARY)} : "
+                f"{self.code(node.orelse, _TERNARY)}"), _TERNARY
+
+    def expr_Subscript(self, node):
+        target = self.code(node.value, _MEMBER)
+        index = node.slice
+        if isinstance(index, ast.Slice):
+            if index.step is not None:
+                raise UnsupportedSyntax("slice step")
+            start = self.code(index.lower) if index.lower else "0"
+            stop = f", {self.code(index.upper)}" if index.upper else ""
+            return f"{target}.slice({start}{stop})", _MEMBER
+        if isinstance(index, ast.UnaryOp) and isinstance(index.op, ast.USub):
+            return f"{target}.at({self.code(index)})", _MEMBER
+        return f"{target}[{self.code(index)}]", _MEMBER
+
+    def expr_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id == "math":
+            if node.attr == "pi":
+                return "Math.PI", _MEMBER
+            if node.attr == "e":
+                return "Math.E", _MEMBER
+        raise UnsupportedSyntax(f"attribute {node.attr}")
+
+    def expr_JoinedStr(self, node):
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(value.value.replace("`", "\\`").replace("${", "\\${"))
+            else:
+                parts.append("${" + self.code(value.value) + "}")
+        return "`" + "".join(parts) + "`", _ATOM
+
+    def _iterable(self, node):
+        """JavaScript iterable for a Python for/comprehension source"""
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+            args = [self.code(arg) for arg in node.args]
+            if node.func.id == "enumerate" and len(args) == 1:
+                return f"{self.code(node.args[0], _MEMBER)}.entries()"
+            if node.func.id == "zip":
+                self.helpers.add("_zip")
+                return f"_zip({', '.join(args)})"
+            if node.func.id == "range":
+                self.helpers.add("_range")
+                return f"_range({', '.join(args)})"
+        return self.code(node)
+
+    def _target(self, node):
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Tuple) and all(isinstance(e, ast.Name) for e in node.elts):
+            return "[" + ", ".join(e.id for e in node.elts) + "]"
+        raise UnsupportedSyntax("loop target")
+
+    def _comprehension(self, node):
+        if len(node.generators) != 1 or node.generators[0].is_async:
+            raise UnsupportedSyntax("nested comprehension")
+        generator = node.generators[0]
+        target = self._target(generator.target)
+        code = f"[...{self._iterable(generator.iter)}]"
+        for condition in generator.ifs:
+            code += f".filter(({target}) => {self.code(condition, _TERNARY)})"
+        element = self.code(node.elt, _TERNARY)
+        if element != target:
+            if element.startswith("{"):
+                element = f"({element})"
+            code += f".map(({target}) => {element})"
+        return code, _MEMBER
+
+    expr_ListComp = _comprehension
+    expr_GeneratorExp = _comprehension
+
+    def expr_Call(self, node):
+        if node.keywords:
+            raise UnsupportedSyntax("keyword arguments")
+        func = node.func
+        args = node.args
+
+        if isinstance(func, ast.Attribute):
+            if isinstance(func.value, ast.Name) and func.value.id == "math":
+                arguments = ", ".join(self.code(arg) for arg in args)
+                if func.attr == "radians":
+                    return f"{self.code(args[0], _MULTIPLICATIVE)} * Math.PI / 180", _MULTIPLICATIVE
+                if func.attr == "degrees":
+                    return f"{self.code(args[0], _MULTIPLICATIVE)} * 180 / Math.PI", _MULTIPLICATIVE
+                if func.attr == "log":
+                    if len(args) == 2:
+                        return (f"Math.log({self.code(args[0])}) / "
+                                f"Math.log({self.code(args[1])})"), _MULTIPLICATIVE
+                    return f"Math.log({arguments})", _MEMBER
+                if func.attr in _MATH_FUNCTIONS:
+                    return f"{_MATH_FUNCTIONS[func.attr]}({arguments})", _MEMBER
+                raise UnsupportedSyntax(f"math.{func.attr}")
+            if func.attr in _METHODS:
+                target = self.code(func.value, _MEMBER)
+                arguments = ", ".join(self.code(arg) for arg in args)
+                return f"{target}.{_METHODS[func.attr]}({arguments})", _MEMBER
+            raise UnsupportedSyntax(f"method {func.attr}")
+
+        if not isinstance(func, ast.Name):
+            raise UnsupportedSyntax("call target")
+        name = func.id
+
+        if name in self.python_only_helpers:
+            raise UnsupportedSyntax(f"{name} outside an assignment")
+        if name in self.formula_names:
+            arguments = ", ".join(self.code(arg) for arg in args)
+            return f"{camel_case(name)}({arguments})", _MEMBER
+        if name == "abs" and len(args) == 1:
+            return f"Math.abs({self.code(args[0])})", _MEMBER
+        if name in ("max", "min"):
+            js = "Math.max" if name == "max" else "Math.min"
+            if len(args) == 1:
+                return f"{js}(...{self._iterable(args[0])})", _MEMBER
+            return f"{js}({', '.join(self.code(arg) for arg in args)})", _MEMBER
+        if name == "sum" and len(args) == 1:
+            self.helpers.add("_sum")
+            return f"_sum({self.code(args[0])})", _MEMBER
+        if name == "len" and len(args) == 1:
+            return f"{self.code(args[0], _MEMBER)}.length", _MEMBER
+        if name == "sorted" and len(args) == 1:
+            return f"[...{self.code(args[0], _MEMBER)}].sort((a, b) => a - b)", _MEMBER
+        if name in ("list", "tuple") and len(args) == 1:
+            return f"[...{self._iterable(args[0])}]", _ATOM
+        if name == "Counter" and len(args) == 1:
+            self.helpers.add("_counter")
+            return f"_counter({self.code(args[0])})", _MEMBER
+        if name == "float" and len(args) == 1:
+            return f"Number({self.code(args[0])})", _MEMBER
+        if name == "int" and len(args) == 1:
+            return f"Math.trunc({self.code(args[0])})", _MEMBER
+        raise UnsupportedSyntax(f"call to {name}")
+
+    # --- statements ---
+
+    def _python_only_assignment(self, node):
+        """Target name of `name = <Python-only helper>(...)`, else None"""
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and isinstance(node.value, ast.Call)
+                and isinstance(node.value.func, ast.Name)
+                and node.value.func.id in self.python_only_helpers):
+            return node.targets[0].id
+        return None
+
+    def _python_only_test(self, test):
+        """True/False for `x is None`/`x is not None` on a Python-only result"""
+        if (isinstance(test, ast.Compare) and len(test.ops) == 1
+                and isinstance(test.left, ast.Name) and test.left.id in self.python_only
+                and isinstance(test.ops[0], (ast.Is, ast.IsNot))
+                and isinstance(test.comparators[0], ast.Constant)
+                and test.comparators[0].value is None):
+            return isinstance(test.ops[0], ast.Is)
+        return None
+
+    def block(self, statements, indent):
+        lines = []
+        for statement in statements:
+            lines.extend(self.statement(statement, indent))
+        return lines
+
+    def statement(self, node, indent):
+        pad = "  " * indent
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+            return []  # docstring
+        if isinstance(node, ast.Pass):
+            return []
+        if isinstance(node, ast.Return):
+            value = self.code(node.value) if node.value is not None else ""
+            return [f"{pad}return {value};".replace(" ;", ";")]
+        skipped = self._python_only_assignment(node)
+        if skipped is not None:
+            self.python_only.add(skipped)
+            return []
+        if isinstance(node, ast.Assign):
+            self.python_only.difference_update(
+                item.id for item in ast.walk(node.targets[0]) if isinstance(item, ast.Name))
+            if len(node.targets) != 1:
+                raise UnsupportedSyntax("chained assignment")
+            return [f"{pad}{self._target(node.targets[0])} = {self.code(node.value)};"]
+        if isinstance(node, ast.AugAssign):
+            if type(node.op) not in _BINARY:
+                raise UnsupportedSyntax(type(node.op).__name__)
+            op = _BINARY[type(node.op)][0]
+            return [f"{pad}{self._target(node.target)} {op}= {self.code(node.value)};"]
+        if isinstance(node, ast.If):
+            taken = self._python_only_test(node.test)
+            if taken is not None:
+                return self.block(node.body if taken else node.orelse, indent)
+            lines = [f"{pad}if ({self.code(node.test)}) {{"]
+            lines += self.block(node.body, indent + 1)
+            orelse = node.orelse
+            while len(orelse) == 1 and isinstance(orelse[0], ast.If):
+                lines.append(f"{pad}}} else if ({self.code(orelse[0].test)}) {{")
+                lines += self.block(orelse[0].body, indent + 1)
+                orelse = orelse[0].orelse
+            if orelse:
+                lines.append(f"{pad}}} else {{")
+                lines += self.block(orelse, indent + 1)
+            lines.append(f"{pad}}}")
+            return lines
+        if isinstance(node, ast.For):
+            if node.orelse:
+                raise UnsupportedSyntax("for-else")
+            lines = [f"{pad}for ({self._target(node.target)} of {self._iterable(node.iter)}) {{"]
+            lines += self.block(node.body, indent + 1)
+            lines.append(f"{pad}}}")
+            return lines
+        raise UnsupportedSyntax(type(node).__name__)
+
+    def function(self, name, node):
+        """Translate a FunctionDef into JavaScript source"""
+        args = node.args
+        if args.vararg or args.kwarg or args.kwonlyargs or args.posonlyargs:
+            raise UnsupportedSyntax("special parameters")
+
+        params = [arg.arg for arg in args.args]
+        defaults = [None] * (len(params) - len(args.defaults)) + list(args.defaults)
+        signature = ", ".join(
+            param if default is None else f"{param} = {self.code(default)}"
+            for param, default in zip(params, defaults)
+        )
+
+        self.python_only = set()
+        assigned = []
+        for child in ast.walk(node):
+            targets = []
+            if self._python_only_assignment(child) is not None:
+                continue
+            if isinstance(child, ast.Assign):
+                targets = child.targets
+            elif isinstance(child, (ast.AugAssign, ast.For)):
+                targets = [child.target]
+            for target in targets:
+                names = target.elts if isinstance(target, ast.Tuple) else [target]
+                for item in names:
+                    if isinstance(item, ast.Name) and item.id not in params and item.id not in assigned:
+                        assigned.append(item.id)
+
+        body = self.block(node.body, 1)
+        lines = [f"export function {camel_case(name)}({signature}) {{"]
+        if assigned:
+            lines.append(f"  let {', '.join(assigned)};")
+        lines += body
+        lines.append("}")
+        return "\n".join(lines)
+
+
+def _module_constants(module):
+    """Top-level NAME = <number|string> assignments of a formula module"""
+    constants = {}
+    for node in ast.parse(inspect.getsource(module)).body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and isinstance(node.value, ast.Constant)
+                and node.targets[0].id != "FORMULAS"):
+            value = node.value.value
+            constants[node.targets[0].id] = (
+                _js_string(value) if isinstance(value, str) else repr(value)
+            )
+    return constants
+
+
+def _json_schema(doc):
+    hint = doc["type"]
+    if hint == "list":
+        if "tuple" in doc["description"]:
+            return {"type": "array", "items": {"type": "array", "items": {"type": "number"}}}
+        return {"type": "array", "items": {"type": "number"}}
+    if hint == "str":
+        return {"type": "string"}
+    if hint == "int":
+        return {"type": "integer"}
+    return {"type": "number"}
+
+
+def _js_literal(value, indent=0):
+    """Render a JSON-like value as a JavaScript literal in the apps' style"""
+    pad = "    " * indent
+    inner = "    " * (indent + 1)
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        items = []
+        for key, item in value.items():
+            name = key if key.isidentifier() else _js_string(key)
+            items.append((name, _js_literal(item, indent + 1)))
+        if "properties" not in value and all("\n" not in code for _, code in items):
+            inline = "{ " + ", ".join(f"{name}: {code}" for name, code in items) + " }"
+            if len(inline) <= 100:
+                return inline
+        lines = [f"{inner}{name}: {code}," for name, code in items]
+        return "{\n" + "\n".join(lines) + f"\n{pad}}}"
+    if isinstance(value, list):
+        return "[" + ", ".join(_js_literal(item, indent) for item in value) + "]"
+    if isinstance(value, str):
+        return _js_string(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return repr(value)
+
+
+def formula_hash(name):
+    """Content hash of a formula: source, metadata and generator version"""
+    meta = catalog.describe(name)
+    function = catalog.get_formula(name)["function"]
+    module = sys.modules[function.__module__]
+    digest = hashlib.sha256()
+    digest.update(str(GENERATOR_VERSION).encode())
+    digest.update(json.dumps(meta, sort_keys=True).encode())
+    digest.update(inspect.getsource(function).encode())
+    digest.update(json.dumps(_module_constants(module), sort_keys=True).encode())
+    digest.update(json.dumps(sorted(getattr(module, "__python_only__", ()))).encode())
+    return digest.hexdigest()
+
+
+def generate_formula(name):
+    """
+    Generate the JavaScript snippets of one formula
+
+    Returns:
+        dict: math, tool, case snippets plus helpers/constants they need
+            and whether the function had to be stubbed
+    """
+    meta = catalog.describe(name)
+    function = catalog.get_formula(name)["function"]
+    module = sys.modules[function.__module__]
+    constants = _module_constants(module)
+    js_name = camel_case(name)
+
+    transpiler = _Transpiler(set(catalog.list_formulas()), constants,
+                             frozenset(getattr(module, "__python_only__", ())))
+    node = ast.parse(textwrap.dedent(inspect.getsource(function))).body[0]
+    signature = inspect.signature(function)
+    try:
+        math_js = transpiler.function(name, node)
+        stubbed = None
+    except UnsupportedSyntax as exc:
+        params = ", ".join(signature.parameters)
+        math_js = (
+            f"export function {js_name}({params}) {{\n"
+            f"  throw new Error({_js_string(f'{name} needs a manual port ({exc})')});\n"
+            f"}}"
+        )
+        stubbed = str(exc)
+
+    docs = catalog.parameter_docs(name)
+    properties = {}
+    required = []
+    for parameter in meta["parameters"]:
+        doc = docs.get(parameter, {"type": "", "description": ""})
+        schema = _json_schema(doc)
+        schema["description"] = doc["description"] or parameter
+        properties[parameter] = schema
+        default = signature.parameters[parameter].default if parameter in signature.parameters else None
+        if default is inspect.Parameter.empty:
+            required.append(parameter)
+
+    tool = {
+        "name": js_name,
+        "description": meta["description"],
+        "parameters": {"type": "object", "properties": properties, "required": required},
+    }
+
+    call_args = ", ".join(f"args.{p}" for p in signature.parameters if p in meta["parameters"])
+    check = ""
+    if required:
+        condition = " || ".join(f"args.{p} === undefined" for p in required)
+        check = (f"      if ({condition}) {{\n"
+                 f"        throw new Error('Missing arguments for {js_name}');\n"
+                 f"      }}\n")
+    case = f"    case '{js_name}':\n{check}      return MathLib.{js_name}({call_args});"
+
+    return {
+        "math": math_js,
+        "tool": "    " + _js_literal(tool, 1) + ",",
+        "case": case,
+        "helpers": sorted(transpiler.helpers),
+        "constants": {key: constants[key] for key in sorted(transpiler.used_constants)},
+        "category": meta["category"],
+        "stubbed": stubbed,
+    }
+
+
+def _assemble(names, entries):
+    """Build the three file contents from per-formula snippets"""
+    header = "/**\n * {title}\n * Generated by `python -m formulas.codegen` from fml-framework/formulas.\n * Do not edit by hand; edit the Python formula and regenerate.\n */\n"
+
+    helpers = sorted({helper for name in names for helper in entries[name]["helpers"]})
+    constants = {}
+    for name in names:
+        constants.update(entries[name]["constants"])
+
+    math_parts = [header.format(title="Formula Library")]
+    math_parts += [f"const {key} = {value};" for key, value in constants.items()]
+    if constants:
+        math_parts.append("")
+    math_parts += [HELPERS[helper] + "\n" for helper in helpers]
+    category = None
+    for name in names:
+        if entries[name]["category"] != category:
+            category = entries[name]["category"]
+            math_parts.append(f"// --- {category} ---\n")
+        math_parts.append(entries[name]["math"] + "\n")
+    math_js = "\n".join(math_parts)
+
+    tools = [entries[name]["tool"] for name in names]
+    ai_tools_js = (header.format(title="AI Tool Registry")
+                   + "\nexport const mathTools = [\n" + "\n".join(tools) + "\n];\n")
+
+    cases = "\n\n".join(entries[name]["case"] for name in names)
+    dispatcher_js = (
+        header.format(title="Tool Dispatcher")
+        + "\nimport * as MathLib from './math.js';\n\n"
+        + "export function dispatchTool(toolName, args) {\n"
+        + "  switch (toolName) {\n"
+        + cases + "\n\n"
+        + "    default:\n"
+        + "      throw new Error(`Unknown tool: ${toolName}`);\n"
+        + "  }\n}\n"
+    )
+    return {"math.js": math_js, "aiTools.js": ai_tools_js, "toolDispatcher.js": dispatcher_js}
+
+
+def _select(config):
+    """Formula names selected by an app config (default: all)"""
+    names = catalog.list_formulas()
+    if config.get("categories"):
+        names = [n for n in names if catalog.describe(n)["category"] in config["categories"]]
+    if config.get("formulas"):
+        names = [n for n in names if n in config["formulas"]]
+    return names
+
+
+def generate_app(app_dir, out_dir=None, categories=None, force=False):
+    """
+    Generate (incrementally) the JavaScript libraries of one app
+
+    Args:
+        app_dir (str): App root (e.g. ../mathf3-o)
+        out_dir (str, optional): Output directory relative to the app
+        categories (list, optional): Restrict to these categories
+        force (bool): Ignore the build cache
+
+    Returns:
+        dict: app, regenerated/reused formula names, written files, stubs
+    """
+    config = {}
+    config_path = os.path.join(app_dir, APP_CONFIG_FILE)
+    if os.path.exists(config_path):
+        with open(config_path, encoding="utf-8") as handle:
+            config = json.load(handle)
+    if categories:
+        config["categories"] = categories
+    target = os.path.join(app_dir, out_dir or config.get("out_dir") or DEFAULT_OUT_DIR)
+    cache_path = os.path.join(target, CACHE_FILE)
+
+    cache = {}
+    if not force and os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as handle:
+            stored = json.load(handle)
+        if stored.get("version") == GENERATOR_VERSION:
+            cache = stored.get("formulas", {})
+
+    names = _select(config)
+    entries = {}
+    regenerated = []
+    for name in names:
+        digest = formula_hash(name)
+        cached = cache.get(name)
+        if cached is not None and cached.get("hash") == digest:
+            entries[name] = cached
+        else:
+            entries[name] = dict(generate_formula(name), hash=digest)
+            regenerated.append(name)
+
+    os.makedirs(target, exist_ok=True)
+    written = []
+    for filename, content in _assemble(names, entries).items():
+        path = os.path.join(target, filename)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                if handle.read() == content:
+                    continue
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(content)
+        written.append(filename)
+
+    if regenerated or set(cache) != set(entries):
+        with open(cache_path, "w", encoding="utf-8") as handle:
+            json.dump({"version": GENERATOR_VERSION, "formulas": entries}, handle, indent=1)
+
+    return {
+        "app": app_dir,
+        "regenerated": regenerated,
+        "reused": len(names) - len(regenerated),
+        "written": written,
+        "stubbed": {name: entries[name]["stubbed"] for name in names if entries[name]["stubbed"]},
+    }
+
+
+def generate_apps(app_dirs, out_dir=None, categories=None, force=False, workers=None):
+    """
+    Generate several apps in parallel worker processes
+
+    Returns:
+        list: generate_app() reports, in app_dirs order
+    """
+    if len(app_dirs) <= 1 or workers == 1:
+        return [generate_app(app, out_dir, categories, force) for app in app_dirs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(generate_app, app, out_dir, categories, force) for app in app_dirs]
+        return [future.result() for future in futures]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m formulas.codegen",
+        description="Generate math.js, aiTools.js and toolDispatcher.js for FML apps"
+    )
+    parser.add_argument("apps", nargs="+", help="App directories (e.g. ../mathf3-o)")
+    parser.add_argument("--out-dir", help=f"Output directory inside each app (default: {DEFAULT_OUT_DIR})")
+    parser.add_argument("--categories", help="Comma-separated categories to include")
+    parser.add_argument("--force", action="store_true", help="Ignore the build cache")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    categories = args.categories.split(",") if args.categories else None
+    for report in generate_apps(args.apps, args.out_dir, categories, args.force, args.workers):
+        print(f"{report['app']}: {len(report['regenerated'])} regenerated, "
+              f"{report['reused']} cached, wrote {', '.join(report['written']) or 'nothing'}")
+        for name, reason in report["stubbed"].items():
+            print(f"  stub: {name} ({reason})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,435 @@
+"""
+Frequency Tables - FML Framework
+Turns raw values into the class_boundaries / frequencies tables used by the
+grouped statistics formulas, and evaluates those formulas on a table.
+
+Binning is vectorized (NumPy) and works on whole arrays or streamed chunks:
+- width=...            fixed-width classes starting at `start`
+- edges=[...]          explicit class edges
+- bins=N               N equal classes over the data range (or value_range)
+
+Classes are half-open [lower, upper); with edges or bins the last class
+also contains its upper edge (as numpy.histogram).
+
+FrequencyTable indexes a table for repeated interpolated quantile and
+percentile-rank queries and cheap single-class frequency updates.
+
+Usage:
+    from formulas.frequency import build_frequency_table, grouped_statistics
+
+    table = build_frequency_table(scores, width=10, start=0)
+    grouped_statistics(table["class_boundaries"], table["frequencies"])
+"""
+
+import bisect
+
+import numpy as np
+
+
+def _as_array(values):
+    array = np.asarray(values, dtype=np.float64).ravel()
+    if array.size and not np.isfinite(array).all():
+        raise ValueError("Values must be finite numbers")
+    return array
+
+
+def _check_options(width, edges, bins):
+    if sum(option is not None for option in (width, edges, bins)) != 1:
+        raise ValueError("Give exactly one of width, edges or bins")
+    if width is not None and width <= 0:
+        raise ValueError("width must be positive")
+    if bins is not None and (int(bins) != bins or bins < 1):
+        raise ValueError("bins must be a positive integer")
+    if edges is not None:
+        edges = np.asarray(edges, dtype=np.float64)
+        if edges.ndim != 1 or edges.size < 2 or (np.diff(edges) <= 0).any():
+            raise ValueError("edges must be increasing with at least two entries")
+    return edges
+
+
+def _table(edges, counts):
+    """Formula-ready table from edges and per-class counts"""
+    edges = edges.tolist()
+    return {
+        "class_boundaries": list(zip(edges[:-1], edges[1:])),
+        "midpoints": [(lower + upper) / 2 for lower, upper in zip(edges[:-1], edges[1:])],
+        "frequencies": counts.tolist(),
+    }
+
+
+class FrequencyBinner:
+    """
+    Incremental binning of streamed chunks into a frequency table
+
+    Args:
+        width (float, optional): Fixed class width; the classes grow to
+            cover whatever values arrive, aligned to `start`
+        start (float): Alignment of fixed-width classes
+        edges (list, optional): Explicit class edges
+        bins (int, optional): Number of equal classes over value_range
+        value_range (tuple, optional): (low, high) for bins=N; required
+            when streaming, since the range cannot be known in advance
+
+    Values outside explicit edges / value_range are counted in .outside.
+    """
+
+    def __init__(self, width=None, start=0.0, edges=None, bins=None, value_range=None):
+        edges = _check_options(width, edges, bins)
+        if bins is not None:
+            if value_range is None:
+                raise ValueError("bins=N needs value_range when streaming")
+            low, high = value_range
+            if not high > low:
+                raise ValueError("value_range must be (low, high) with high > low")
+            edges = np.linspace(low, high, int(bins) + 1)
+        self.width = width
+        self.start = start
+        self.edges = edges
+        self.counts = np.zeros(0 if edges is None else edges.size - 1, dtype=np.int64)
+        self.first_bin = 0
+        self.count = 0
+        self.outside = 0
+
+    def update(self, values):
+        """Add a chunk of values"""
+        data = _as_array(values)
+        if not data.size:
+            return
+        if self.edges is not None:
+            counts, _ = np.histogram(data, bins=self.edges)
+            self.counts += counts
+            self.outside += int(data.size - counts.sum())
+            self.count += int(counts.sum())
+            return
+
+        index = np.floor((data - self.start) / self.width).astype(np.int64)
+        low, high = int(index.min()), int(index.max())
+        if not self.counts.size:
+            self.first_bin = low
+        new_first = min(self.first_bin, low)
+        new_last = max(self.first_bin + self.counts.size - 1, high)
+        if new_first != self.first_bin or new_last != self.first_bin + self.counts.size - 1:
+            grown = np.zeros(new_last - new_first + 1, dtype=np.int64)
+            grown[self.first_bin - new_first:self.first_bin - new_first + self.counts.size] = self.counts
+            self.counts = grown
+            self.first_bin = new_first
+        self.counts += np.bincount(index - self.first_bin, minlength=self.counts.size)
+        self.count += int(data.size)
+
+    def table(self):
+        """
+        Current table
+
+        Returns:
+            dict: class_boundaries, midpoints, frequencies
+        """
+        if self.edges is not None:
+            return _table(self.edges, self.counts)
+        bins = np.arange(self.first_bin, self.first_bin + self.counts.size + 1)
+        return _table(self.start + bins * self.width, self.counts)
+
+
+def build_frequency_table(values, width=None, start=None, edges=None, bins=None, value_range=None):
+    """
+    Bin raw values into a frequency table
+
+    Args:
+        values (array-like or iterable of chunks): Raw values; an iterator
+            of chunks is consumed incrementally
+        width (float, optional): Fixed class width
+        start (float, optional): Lower edge of the first fixed-width class
+            (default: the minimum rounded down to a multiple of width)
+        edges (list, optional): Explicit class edges
+        bins (int, optional): Number of equal classes
+        value_range (tuple, optional): Range split by bins (default: data
+            min and max)
+
+    Returns:
+        dict: class_boundaries, midpoints, frequencies (and "outside" when
+            explicit edges or value_range leave values out)
+    """
+    _check_options(width, edges, bins)
+
+    if not isinstance(values, (list, tuple, np.ndarray)):
+        binner = FrequencyBinner(width=width, start=start or 0.0, edges=edges,
+                                 bins=bins, value_range=value_range)
+        for chunk in values:
+            binner.update(chunk)
+        table = binner.table()
+        if binner.outside:
+            table["outside"] = binner.outside
+        return table
+
+    data = _as_array(values)
+    if not data.size:
+        raise ValueError("No values to bin")
+    if width is not None:
+        if start is None:
+            start = np.floor(data.min() / width) * width
+        binner = FrequencyBinner(width=width, start=start)
+        binner.update(data)
+        return binner.table()
+
+    if bins is not None:
+        value_range = value_range or (data.min(), data.max())
+        if value_range[1] == value_range[0]:
+            value_range = (value_range[0] - 0.5, value_range[1] + 0.5)
+        edges = np.linspace(value_range[0], value_range[1], int(bins) + 1)
+
+    edges = np.asarray(edges, dtype=np.float64)
+    counts, _ = np.histogram(data, bins=edges)
+    table = _table(edges, counts)
+    outside = int(data.size - counts.sum())
+    if outside:
+        table["outside"] = outside
+    return table
+
+
+def grouped_statistics(class_boundaries, frequencies):
+    """
+    Grouped mean, median and mode from one pass over a frequency table
+
+    Gives the same values as calculate_grouped_mean (with class midpoints),
+    calculate_grouped_median and calculate_grouped_mode.
+
+    Args:
+        class_boundaries (list): List of (lower, upper) tuples
+        frequencies (list): Frequencies for each class
+
+    Returns:
+        dict: mean, median, median_class, mode, modal_class, total_frequency
+            (plus "error" if the mode is undefined)
+    """
+    total = 0
+    weighted = 0
+    cumulative = []
+    modal_class = 0
+    for i, ((lower, upper), freq) in enumerate(zip(class_boundaries, frequencies)):
+        weighted += ((lower + upper) / 2) * freq
+        total += freq
+        cumulative.append(total)
+        if freq > frequencies[modal_class]:
+            modal_class = i
+
+    if not total:
+        return {"error": "Total frequency must be positive"}
+
+    result = {"mean": weighted / total, "total_frequency": total}
+
+    median_position = total / 2
+    i = bisect.bisect_left(cumulative, median_position)
+    lower, upper = class_boundaries[i]
+    freq = frequencies[i]
+    result["median"] = lower + ((median_position - (cumulative[i] - freq)) / freq) * (upper - lower)
+    result["median_class"] = i
+
+    lower, upper = class_boundaries[modal_class]
+    f1 = frequencies[modal_class]
+    f0 = frequencies[modal_class - 1] if modal_class > 0 else 0
+    f2 = frequencies[modal_class + 1] if modal_class < len(frequencies) - 1 else 0
+    result["modal_class"] = modal_class
+    if (f1 - f0) + (f1 - f2) == 0:
+        result["mode"] = None
+        result["error"] = "Mode is undefined (modal class frequency equals both neighbours)"
+    else:
+        result["mode"] = lower + ((f1 - f0) / ((f1 - f0) + (f1 - f2))) * (upper - lower)
+    return result
+
+
+def grouped_statistics_from_values(values, **binning):
+    """
+    Bin raw values and evaluate the grouped measures on the table
+
+    Args:
+        values (array-like or iterable of chunks): Raw values
+        **binning: build_frequency_table options (width/start, edges, bins)
+
+    Returns:
+        dict: grouped_statistics() result plus the table itself
+    """
+    table = build_frequency_table(values, **binning)
+    result = grouped_statistics(table["class_boundaries"], table["frequencies"])
+    result.update(table)
+    return result
+
+
+class FrequencyTable:
+    """
+    Grouped frequency table indexed for repeated quantile queries
+
+    Cumulative frequencies live in a Fenwick (binary indexed) tree, so any
+    interpolated grouped quantile or percentile rank is answered in
+    O(log k) for k classes, and changing one class frequency costs
+    O(log k) instead of rebuilding the table.
+
+    Args:
+        class_boundaries (list): List of (lower, upper) tuples, ascending
+        frequencies (list): Frequencies for each class
+    """
+
+    def __init__(self, class_boundaries, frequencies):
+        if len(class_boundaries) != len(frequencies) or not frequencies:
+            raise ValueError("class_boundaries and frequencies must be non-empty and the same length")
+        if any(freq < 0 for freq in frequencies):
+            raise ValueError("Frequencies cannot be negative")
+        self.class_boundaries = [tuple(bounds) for bounds in class_boundaries]
+        self._lowers = [lower for lower, _ in self.class_boundaries]
+        self._frequencies = list(frequencies)
+        self._size = len(frequencies)
+
+        # O(k) Fenwick construction
+        tree = [0] + list(frequencies)
+        for i in range(1, self._size + 1):
+            parent = i + (i & -i)
+            if parent <= self._size:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._step = 1 << (self._size.bit_length() - 1)
+
+    @classmethod
+    def from_values(cls, values, **binning):
+        """Bin raw values (see build_frequency_table) into an indexed table"""
+        table = build_frequency_table(values, **binning)
+        return cls(table["class_boundaries"], table["frequencies"])
+
+    @property
+    def frequencies(self):
+        return list(self._frequencies)
+
+    @property
+    def total(self):
+        return self.cumulative(self._size - 1)
+
+    def __len__(self):
+        return self._size
+
+    # --- updates ---
+
+    def add(self, index, delta):
+        """Add delta to the frequency of class `index`"""
+        if self._frequencies[index] + delta < 0:
+            raise ValueError("Frequencies cannot be negative")
+        self._frequencies[index] += delta
+        i = index + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def update(self, index, frequency):
+        """Set the frequency of class `index`"""
+        self.add(index, frequency - self._frequencies[index])
+
+    # --- queries ---
+
+    def cumulative(self, index):
+        """Cumulative frequency up to and including class `index`"""
+        total = 0
+        i = index + 1
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _find(self, target, strict=False):
+        """First class whose cumulative frequency is >= target (> if strict)"""
+        position = 0
+        remaining = target
+        step = self._step
+        tree = self._tree
+        while step:
+            nxt = position + step
+            if nxt <= self._size and (tree[nxt] <= remaining if strict else tree[nxt] < remaining):
+                position = nxt
+                remaining -= tree[nxt]
+            step >>= 1
+        return min(position, self._size - 1)
+
+    def quantile(self, q):
+        """
+        Interpolated grouped quantile
+
+        Same interpolation as calculate_grouped_median, which is quantile(0.5):
+        lower + (q*n - cf_before) / f * class_width
+
+        Args:
+            q (float): Fraction between 0 and 1
+
+        Returns:
+            dict: value and class index (or error for an empty table)
+        """
+        if not 0 <= q <= 1:
+            return {"error": "q must be between 0 and 1"}
+        total = self.total
+        if not total:
+            return {"error": "Total frequency must be positive"}
+
+        position = q * total
+        i = self._find(position, strict=position == 0)
+        lower, upper = self.class_boundaries[i]
+        freq = self._frequencies[i]
+        cf_before = self.cumulative(i) - freq
+        value = lower + ((position - cf_before) / freq) * (upper - lower)
+        return {"value": value, "class": i}
+
+    def median(self):
+        """
+        Grouped median (as calculate_grouped_median)
+
+        Returns:
+            dict: Contains median and median_class
+        """
+        result = self.quantile(0.5)
+        if "error" in result:
+            return result
+        return {"median": result["value"], "median_class": result["class"]}
+
+    def quantiles(self, qs):
+        """Interpolated values for several fractions (None where undefined)"""
+        return [self.quantile(q).get("value") for q in qs]
+
+    def quartiles(self):
+        """
+        Returns:
+            dict: q1, q2, q3
+        """
+        q1, q2, q3 = self.quantiles([0.25, 0.5, 0.75])
+        return {"q1": q1, "q2": q2, "q3": q3}
+
+    def deciles(self):
+        """D1..D9 as a list"""
+        return self.quantiles([i / 10 for i in range(1, 10)])
+
+    def percentile(self, p):
+        """Value below which p percent of the frequency lies"""
+        return self.quantile(p / 100).get("value")
+
+    def percentile_rank(self, value):
+        """
+        Inverse ogive: percentage of the frequency below `value`
+
+        Values are assumed uniform within their class, as in the
+        interpolation of quantile().
+
+        Returns:
+            float: Percentile rank between 0 and 100
+        """
+        total = self.total
+        if not total:
+            return None
+        if value <= self._lowers[0]:
+            return 0.0
+        i = bisect.bisect_right(self._lowers, value) - 1
+        lower, upper = self.class_boundaries[i]
+        if value >= upper:
+            below = self.cumulative(i)
+        else:
+            below = self.cumulative(i) - self._frequencies[i]
+            below += self._frequencies[i] * (value - lower) / (upper - lower)
+        return 100 * below / total
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: class_boundaries and frequencies, ready for the grouped formulas
+        """
+        return {"class_boundaries": list(self.class_boundaries), "frequencies": self.frequencies}
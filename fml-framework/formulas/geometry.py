@@ -192,6 +192,7 @@ FORMULAS = {
         "description": "Calculate area and circumference of a circle",
         "category": "geometry",
         "parameters": ["radius"],
+        "aliases": ["circleArea"],
         "function": calculate_circle_properties
     },
     "calculate_arc_sector": {
@@ -227,6 +228,7 @@ FORMULAS = {
         "description": "Calculate surface area and volume of a sphere",
         "category": "geometry",
         "parameters": ["radius"],
+        "aliases": ["sphereStats"],
         "function": calculate_sphere_properties
     },
     "calculate_cylinder_properties": {
@@ -234,6 +236,7 @@ FORMULAS = {
         "description": "Calculate surface area and volume of a cylinder",
         "category": "geometry",
         "parameters": ["radius", "height"],
+        "aliases": ["cylinderStats"],
         "function": calculate_cylinder_properties
     },
     "calculate_cone_properties": {
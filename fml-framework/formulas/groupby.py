@@ -0,0 +1,193 @@
+"""
+Group-By Statistics - FML Framework
+analyze_data_list and calculate_standard_deviation per key (per school,
+class, subject, ...) without a dict of lists and one call per group.
+
+Grouping is sort-based and fully vectorized:
+- keys are factorized once into integer group codes (np.unique)
+- one stable sort by (code, value) puts every group's values in order
+  (a single packed int64 key for integer values, else a lexsort)
+- counts, sums and squared deviations come from np.bincount; medians are
+  read at each group's middle positions; modes are the longest runs of
+  equal values inside each group
+
+Measures match the formulas: population variance as in
+calculate_standard_deviation, and mode as in analyze_data_list (a single
+value, or the list of tied values in first-occurrence order).
+
+Usage:
+    from formulas.groupby import GroupBy, group_statistics
+
+    table = group_statistics(school_ids, scores)
+    table["key"], table["mean"], table["median"], table["standard_deviation"]
+
+    by_class = GroupBy(class_ids)          # factorize once, reuse for columns
+    by_class.aggregate(maths, ["mean", "median"])
+    by_class.aggregate(physics)
+"""
+
+import numpy as np
+
+
+STATISTICS = ("count", "mean", "median", "mode", "variance", "standard_deviation")
+
+
+class GroupBy:
+    """
+    Factorized grouping keys
+
+    Args:
+        keys (array-like): One key per row (numbers or strings)
+
+    Attributes:
+        keys (np.ndarray): Distinct keys, sorted; group i is keys[i]
+        codes (np.ndarray): Group index of every row
+        counts (np.ndarray): Rows per group
+    """
+
+    def __init__(self, keys):
+        keys = np.asarray(keys)
+        if keys.ndim != 1:
+            raise ValueError("keys must be one-dimensional")
+        self.keys, codes = np.unique(keys, return_inverse=True)
+        self.codes = codes.ravel().astype(np.intp, copy=False)
+        self.counts = np.bincount(self.codes, minlength=self.keys.size)
+
+    def __len__(self):
+        return self.keys.size
+
+    def _values(self, values):
+        values = np.asarray(values)
+        if values.shape != self.codes.shape:
+            raise ValueError("values must have one entry per key")
+        if values.dtype.kind not in "iuf":
+            raise ValueError("values must be numeric")
+        if values.dtype.kind == "f" and not np.isfinite(values).all():
+            raise ValueError("values must be finite numbers")
+        return values
+
+    def aggregate(self, values, stats=STATISTICS):
+        """
+        Statistics of one value column per group
+
+        Args:
+            values (array-like): One number per row
+            stats (list): Any of count, mean, median, mode, variance,
+                standard_deviation
+
+        Returns:
+            dict: "key" column plus one column per statistic (NumPy arrays;
+                "mode" is a list since tied groups hold a list of modes)
+        """
+        unknown = set(stats) - set(STATISTICS)
+        if unknown:
+            raise ValueError(f"Unknown statistics: {', '.join(sorted(unknown))}")
+        values = self._values(values)
+        result = {"key": self.keys}
+        if "count" in stats:
+            result["count"] = self.counts
+
+        mean = None
+        if {"mean", "variance", "standard_deviation"} & set(stats):
+            mean = np.bincount(self.codes, weights=values, minlength=len(self)) / self.counts
+            if "mean" in stats:
+                result["mean"] = mean
+        if {"variance", "standard_deviation"} & set(stats):
+            deviation = values - mean[self.codes]
+            variance = np.bincount(self.codes, weights=deviation * deviation,
+                                   minlength=len(self)) / self.counts
+            if "variance" in stats:
+                result["variance"] = variance
+            if "standard_deviation" in stats:
+                result["standard_deviation"] = np.sqrt(variance)
+
+        if {"median", "mode"} & set(stats):
+            order = self._group_order(values)
+            ordered = values[order]
+            starts = np.concatenate(([0], np.cumsum(self.counts)[:-1]))
+            if "median" in stats:
+                low = ordered[starts + (self.counts - 1) // 2]
+                high = ordered[starts + self.counts // 2]
+                result["median"] = (low + high.astype(np.float64)) / 2
+            if "mode" in stats:
+                result["mode"] = self._modes(order, ordered)
+        return result
+
+    def _group_order(self, values):
+        """Stable order of rows by (group, value)"""
+        if values.dtype.kind in "iu" and values.size:
+            low = int(values.min())
+            span = int(values.max()) - low + 1
+            if span * len(self) < 2 ** 62:
+                # one int64 sort key instead of a two-key lexsort
+                packed = self.codes.astype(np.int64) * span + (values.astype(np.int64) - low)
+                return np.argsort(packed, kind="stable")
+        return np.lexsort((values, self.codes))
+
+    def _modes(self, order, ordered):
+        """Longest runs of equal values per group, ties by first occurrence"""
+        if not ordered.size:
+            return []
+        codes = self.codes[order]
+        boundary = np.empty(ordered.size, dtype=bool)
+        boundary[0] = True
+        boundary[1:] = (ordered[1:] != ordered[:-1]) | (codes[1:] != codes[:-1])
+        run_starts = np.flatnonzero(boundary)
+        run_lengths = np.diff(np.append(run_starts, ordered.size))
+        run_groups = codes[run_starts]
+
+        longest = np.zeros(len(self), dtype=run_lengths.dtype)
+        np.maximum.at(longest, run_groups, run_lengths)
+        winners = run_starts[run_lengths == longest[run_groups]]
+        # lexsort is stable, so each run starts at the value's first row
+        winners = winners[np.lexsort((order[winners], codes[winners]))]
+
+        mode_values = ordered[winners].tolist()
+        ties = np.bincount(codes[winners], minlength=len(self))
+        if (ties == 1).all():
+            return mode_values
+        modes = []
+        position = 0
+        for tied in ties.tolist():
+            modes.append(mode_values[position] if tied == 1 else mode_values[position:position + tied])
+            position += tied
+        return modes
+
+    def to_rows(self, values, stats=STATISTICS):
+        """
+        Per-group result dicts keyed by group key
+
+        Returns:
+            dict: {key: {statistic: value}}, values as Python numbers
+        """
+        columns = self.aggregate(values, stats)
+        keys = columns.pop("key").tolist()
+        lists = {name: column if isinstance(column, list) else column.tolist()
+                 for name, column in columns.items()}
+        return {key: {name: lists[name][i] for name in lists} for i, key in enumerate(keys)}
+
+
+def group_statistics(keys, values, stats=STATISTICS):
+    """
+    Mean, median, mode, variance and standard deviation per key
+
+    Args:
+        keys (array-like): Group key of every row
+        values (array-like): Number of every row
+        stats (list): Statistics to compute (default: all)
+
+    Returns:
+        dict: Columns key, count, mean, median, mode, variance,
+            standard_deviation (one entry per distinct key, keys sorted)
+    """
+    return GroupBy(keys).aggregate(values, stats)
+
+
+def analyze_by_group(keys, values, stats=STATISTICS):
+    """
+    group_statistics as {key: {statistic: value}}
+
+    Each group's dict carries the analyze_data_list and
+    calculate_standard_deviation fields.
+    """
+    return GroupBy(keys).to_rows(values, stats)
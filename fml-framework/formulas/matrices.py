@@ -109,6 +109,7 @@ FORMULAS = {
         "description": "Calculate determinant of a 2x2 matrix",
         "category": "matrices",
         "parameters": ["a", "b", "c", "d"],
+        "aliases": ["matrixDeterminant"],
         "function": calculate_determinant_2x2
     },
     "calculate_inverse_2x2": {
@@ -116,6 +117,7 @@ FORMULAS = {
         "description": "Find inverse of a 2x2 matrix",
         "category": "matrices",
         "parameters": ["a", "b", "c", "d"],
+        "aliases": ["matrixInverse"],
         "function": calculate_inverse_2x2
     },
     "multiply_matrices_2x2": {
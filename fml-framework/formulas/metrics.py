@@ -0,0 +1,290 @@
+"""
+Formula Metrics - FML Framework
+Optional instrumentation of registry dispatch: call counts, latency
+histograms, error rates and argument-size distributions per formula, with a
+snapshot API and a Prometheus text exporter.
+
+Instrumentation hooks into catalog.get_function, so everything that
+dispatches through the catalog (cli.py, server.py, catalog.dispatch) is
+covered. While disabled no wrapper is installed and dispatch costs one
+None check. Calls evaluated in worker processes (server batches offloaded
+to the process pool, cli.run with several workers) are recorded there with
+record_call() and merged back into the parent.
+
+Usage:
+    from formulas import metrics
+    metrics.enable()
+    ...
+    metrics.snapshot()["calculate_haversine"]["calls"]
+    print(metrics.to_prometheus())
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+from . import catalog
+
+
+# Upper bounds of the histogram buckets (a final +Inf bucket is implicit)
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4,
+                   5e-4, 1e-3, 1e-2, 1e-1, 1.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 100, 1000, 10**4, 10**5, 10**6, 10**7)
+
+_lock = threading.Lock()
+_stats = {}
+_wrappers = {}
+_enabled = False
+
+
+class FormulaStats:
+    """Counters and histograms for one formula"""
+
+    __slots__ = ("calls", "exceptions", "error_results", "seconds",
+                 "latency_counts", "size_counts", "size_total")
+
+    def __init__(self):
+        self.calls = 0
+        self.exceptions = 0
+        self.error_results = 0
+        self.seconds = 0.0
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.size_counts = [0] * (len(SIZE_BUCKETS) + 1)
+        self.size_total = 0
+
+    def record(self, seconds, size, exception=False, error_result=False):
+        with _lock:
+            self.calls += 1
+            self.seconds += seconds
+            self.size_total += size
+            self.exceptions += exception
+            self.error_results += error_result
+            self.latency_counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self.size_counts[bisect_left(SIZE_BUCKETS, size)] += 1
+
+    def to_dict(self):
+        errors = self.exceptions + self.error_results
+        return {
+            "calls": self.calls,
+            "exceptions": self.exceptions,
+            "error_results": self.error_results,
+            "error_rate": errors / self.calls if self.calls else 0.0,
+            "seconds_total": self.seconds,
+            "mean_seconds": self.seconds / self.calls if self.calls else 0.0,
+            "latency_buckets": dict(zip(_bucket_labels(LATENCY_BUCKETS), _cumulative(self.latency_counts))),
+            "argument_size_total": self.size_total,
+            "argument_size_buckets": dict(zip(_bucket_labels(SIZE_BUCKETS), _cumulative(self.size_counts))),
+        }
+
+
+def _bucket_labels(bounds):
+    return [repr(bound) for bound in bounds] + ["+Inf"]
+
+
+def _cumulative(counts):
+    total = 0
+    cumulative = []
+    for count in counts:
+        total += count
+        cumulative.append(total)
+    return cumulative
+
+
+def argument_size(args, kwargs):
+    """
+    Size of a call's arguments: list-like arguments count their length,
+    scalars count 1
+
+    Returns:
+        int: Total argument size
+    """
+    size = 0
+    for value in (*args, *kwargs.values()):
+        try:
+            size += len(value) if not isinstance(value, str) else 1
+        except TypeError:
+            size += 1
+    return size
+
+
+def instrument(name, function):
+    """
+    Wrap a formula function so every call is recorded under `name`
+
+    Args:
+        name (str): Formula name
+        function (callable): Formula implementation
+
+    Returns:
+        callable: Instrumented wrapper
+    """
+    with _lock:
+        stats = _stats.setdefault(name, FormulaStats())
+    clock = time.perf_counter
+
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            result = function(*args, **kwargs)
+        except Exception:
+            stats.record(clock() - start, argument_size(args, kwargs), exception=True)
+            raise
+        elapsed = clock() - start
+        stats.record(elapsed, argument_size(args, kwargs),
+                     error_result=isinstance(result, dict) and "error" in result)
+        return result
+
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    wrapper.__wrapped__ = function
+    return wrapper
+
+
+def _hook(name, function):
+    """catalog dispatch hook: reuse one wrapper per formula"""
+    wrapper = _wrappers.get(name)
+    if wrapper is None or wrapper.__wrapped__ is not function:
+        wrapper = instrument(name, function)
+        _wrappers[name] = wrapper
+    return wrapper
+
+
+def enable():
+    """Start recording every formula resolved through the catalog"""
+    global _enabled
+    _enabled = True
+    catalog.set_dispatch_hook(_hook)
+
+
+def disable():
+    """Stop recording; collected metrics are kept until reset()"""
+    global _enabled
+    _enabled = False
+    catalog.set_dispatch_hook(None)
+    _wrappers.clear()
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Forget all collected metrics"""
+    with _lock:
+        _stats.clear()
+    _wrappers.clear()
+
+
+def export():
+    """
+    Raw counters of every formula, as plain picklable data
+
+    Returns:
+        dict: formula name -> FormulaStats fields, for merge()
+    """
+    with _lock:
+        return {name: {field: getattr(stats, field) for field in FormulaStats.__slots__}
+                for name, stats in _stats.items()}
+
+
+def merge(exported):
+    """Add counters exported by another process (see record_call)"""
+    with _lock:
+        for name, fields in exported.items():
+            stats = _stats.setdefault(name, FormulaStats())
+            stats.calls += fields["calls"]
+            stats.exceptions += fields["exceptions"]
+            stats.error_results += fields["error_results"]
+            stats.seconds += fields["seconds"]
+            stats.size_total += fields["size_total"]
+            for i, count in enumerate(fields["latency_counts"]):
+                stats.latency_counts[i] += count
+            for i, count in enumerate(fields["size_counts"]):
+                stats.size_counts[i] += count
+
+
+def record_call(function, *args):
+    """
+    Call function in a worker process with metrics recording
+
+    The worker's metrics are cleared first (a forked worker inherits the
+    parent's), so the export holds only this call's counts.
+
+    Returns:
+        tuple: (function's result, export() for merge() in the parent)
+    """
+    was_enabled = _enabled
+    reset()
+    enable()
+    try:
+        return function(*args), export()
+    finally:
+        reset()
+        if not was_enabled:
+            disable()
+
+
+def snapshot():
+    """
+    Current metrics for every formula that has been called
+
+    Returns:
+        dict: formula name -> calls, exceptions, error_results, error_rate,
+            seconds_total, mean_seconds, cumulative latency and
+            argument-size buckets
+    """
+    with _lock:
+        return {name: stats.to_dict() for name, stats in _stats.items()}
+
+
+def _histogram_lines(metric, name, bounds, counts, total):
+    lines = []
+    for label, count in zip(_bucket_labels(bounds), _cumulative(counts)):
+        lines.append(f'{metric}_bucket{{formula="{name}",le="{label}"}} {count}')
+    lines.append(f'{metric}_sum{{formula="{name}"}} {total}')
+    lines.append(f'{metric}_count{{formula="{name}"}} {sum(counts)}')
+    return lines
+
+
+def to_prometheus(prefix="fml_formula"):
+    """
+    Render the metrics in the Prometheus text exposition format
+
+    Args:
+        prefix (str): Metric name prefix
+
+    Returns:
+        str: Exposition text
+    """
+    with _lock:
+        items = sorted(_stats.items())
+        lines = [
+            f"# HELP {prefix}_calls_total Formula calls.",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        lines += [f'{prefix}_calls_total{{formula="{name}"}} {s.calls}' for name, s in items]
+
+        lines += [
+            f"# HELP {prefix}_errors_total Formula calls that raised or returned an error dict.",
+            f"# TYPE {prefix}_errors_total counter",
+        ]
+        for name, s in items:
+            lines.append(f'{prefix}_errors_total{{formula="{name}",kind="exception"}} {s.exceptions}')
+            lines.append(f'{prefix}_errors_total{{formula="{name}",kind="error_result"}} {s.error_results}')
+
+        lines += [
+            f"# HELP {prefix}_latency_seconds Formula call latency.",
+            f"# TYPE {prefix}_latency_seconds histogram",
+        ]
+        for name, s in items:
+            lines += _histogram_lines(f"{prefix}_latency_seconds", name,
+                                      LATENCY_BUCKETS, s.latency_counts, s.seconds)
+
+        lines += [
+            f"# HELP {prefix}_argument_size Size of formula arguments (list lengths, 1 per scalar).",
+            f"# TYPE {prefix}_argument_size histogram",
+        ]
+        for name, s in items:
+            lines += _histogram_lines(f"{prefix}_argument_size", name,
+                                      SIZE_BUCKETS, s.size_counts, s.size_total)
+    return "\n".join(lines) + "\n"
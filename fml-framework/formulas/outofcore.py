@@ -0,0 +1,217 @@
+"""
+Out-of-Core Statistics - FML Framework
+analyze_data_list and calculate_standard_deviation over binary number files
+that are larger than memory (raw float64/int32/... dumps or .npy files).
+
+- The file is memory-mapped read-only and read as zero-copy NumPy views,
+  one chunk at a time, into a StreamingStats accumulator (streaming.py)
+- Pages of chunks already processed are handed back to the OS
+  (madvise MADV_DONTNEED where available), so peak RSS stays around one
+  chunk no matter how large the file is
+- Results follow StreamingStats: mean and variance are exact; mode and
+  median are exact while the file has at most max_distinct different
+  values, after that the median is estimated, a mode is only reported
+  when it is provably the most frequent value, and "exact" is False
+
+Usage:
+    from formulas.outofcore import MappedArray, analyze_data_file
+
+    analyze_data_file("scores.f64", dtype="float64")
+    analyze_data_file("scores.npy")
+
+    with MappedArray("scores.i32", dtype="int32") as data:
+        for chunk in data.chunks():
+            ...
+
+    python -m formulas.outofcore scores.npy
+    python -m formulas.outofcore scores.bin --dtype int32
+"""
+
+import argparse
+import json
+import mmap
+import os
+import sys
+
+import numpy as np
+
+from .streaming import StreamingStats
+
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def _npy_header(handle):
+    """dtype, shape, order and data offset of an open .npy file"""
+    version = np.lib.format.read_magic(handle)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(handle)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(handle)
+    if dtype.hasobject:
+        raise ValueError("Object arrays cannot be memory-mapped")
+    return dtype, shape, fortran_order, handle.tell()
+
+
+class MappedArray:
+    """
+    Read-only, flat memory map of a binary array file
+
+    Args:
+        path (str): .npy file, or raw file of fixed-size numbers
+        dtype (str, optional): Element type of a raw file, e.g. "float64",
+            "int32" or "<f4" (required unless the file is .npy)
+        offset (int): Bytes to skip at the start of a raw file
+
+    Elements of multi-dimensional .npy arrays are visited in storage order.
+    """
+
+    def __init__(self, path, dtype=None, offset=0):
+        self.path = path
+        with open(path, "rb") as handle:
+            if str(path).endswith(".npy"):
+                self.dtype, self.shape, _, offset = _npy_header(handle)
+            elif dtype is None:
+                raise ValueError("dtype is required for raw binary files")
+            else:
+                self.dtype = np.dtype(dtype)
+                self.shape = None
+            if self.dtype.kind not in "iuf":
+                raise ValueError(f"Unsupported element type: {self.dtype}")
+
+            size = os.fstat(handle.fileno()).st_size - offset
+            if size < 0 or size % self.dtype.itemsize:
+                raise ValueError(f"File size does not match element type {self.dtype}")
+            self.offset = offset
+            self.size = size // self.dtype.itemsize
+            self._mmap = None
+            if self.size:
+                self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.shape is None:
+            self.shape = (self.size,)
+
+        if self._mmap is None:
+            self.array = np.empty(0, dtype=self.dtype)
+        else:
+            self.array = np.frombuffer(self._mmap, dtype=self.dtype, count=self.size, offset=offset)
+
+    def __len__(self):
+        return self.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def chunks(self, chunk_size=DEFAULT_CHUNK_SIZE, release=True):
+        """
+        Yield consecutive zero-copy views of up to chunk_size elements
+
+        Args:
+            chunk_size (int): Elements per chunk
+            release (bool): Drop the pages of each chunk from memory once the
+                next one is requested (they are re-read from the file if a
+                view is used again)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        release = release and self._mmap is not None and hasattr(mmap, "MADV_DONTNEED")
+        itemsize = self.dtype.itemsize
+        for start in range(0, self.size, chunk_size):
+            stop = min(start + chunk_size, self.size)
+            yield self.array[start:stop]
+            if release:
+                self._release(self.offset + start * itemsize, self.offset + stop * itemsize)
+
+    def _release(self, begin, end):
+        begin -= begin % mmap.PAGESIZE
+        end -= end % mmap.PAGESIZE
+        if end > begin:
+            self._mmap.madvise(mmap.MADV_DONTNEED, begin, end - begin)
+
+    def close(self):
+        """Unmap the file (deferred while views of it are still referenced)"""
+        self.array = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass
+            self._mmap = None
+
+
+def summarize_file(path, dtype=None, offset=0, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    Stream a binary array file into a StreamingStats accumulator
+
+    Args:
+        path (str): .npy or raw binary file
+        dtype (str, optional): Element type of a raw file
+        offset (int): Header bytes to skip in a raw file
+        chunk_size (int): Elements per chunk
+        **options: StreamingStats options (max_distinct, backend, ...)
+
+    Returns:
+        StreamingStats: Summary of the whole file
+    """
+    stats = StreamingStats(**options)
+    with MappedArray(path, dtype, offset) as data:
+        for chunk in data.chunks(chunk_size):
+            stats.update_many(chunk)
+    return stats
+
+
+def analyze_data_file(path, dtype=None, offset=0, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    analyze_data_list over a binary array file
+
+    Returns:
+        dict: Contains mean, median, mode, count and exact
+    """
+    return summarize_file(path, dtype, offset, chunk_size, **options).analyze()
+
+
+def standard_deviation_file(path, dtype=None, offset=0, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    calculate_standard_deviation over a binary array file
+
+    Returns:
+        dict: Contains standard deviation and variance
+    """
+    return summarize_file(path, dtype, offset, chunk_size, **options).standard_deviation()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m formulas.outofcore",
+        description="Mean, median, mode and standard deviation of a binary array file"
+    )
+    parser.add_argument("input", help=".npy file or raw binary file")
+    parser.add_argument("--dtype", help="Element type of a raw file (float64, int32, <f4, ...)")
+    parser.add_argument("--offset", type=int, default=0, help="Header bytes to skip in a raw file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--max-distinct", type=int, default=100_000,
+                        help="Distinct values counted exactly before the mode/median become estimates")
+    parser.add_argument("--backend", choices=["reservoir", "kll"], default="reservoir",
+                        help="Median estimator once the counts are no longer exact")
+    parser.add_argument("--error", type=float, default=0.01, help="Rank error of the kll backend")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = summarize_file(args.input, args.dtype, args.offset, args.chunk_size,
+                               max_distinct=args.max_distinct, backend=args.backend, error=args.error)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    result = stats.analyze()
+    if "error" not in result:
+        result.update(stats.standard_deviation())
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Compact Results - FML Framework
+Memory-light representations of formula results. Scalar calls become
+__slots__ records and batches become struct-of-arrays columns; both keep
+dict-style access (result["distance"], .get, .items(), ...) for callers that
+expect today's result dicts. Input echoes can be dropped to save memory.
+"""
+
+from collections.abc import Mapping
+
+from . import catalog
+
+
+# Result keys that only repeat an input argument back to the caller
+ECHOED_INPUTS = {
+    "calculate_circle_properties": ("radius",),
+    "calculate_arc_sector": ("angle_degrees",),
+    "calculate_chord_length": ("distance",),
+    "calculate_sphere_properties": ("radius",),
+    "solve_arithmetic_progression": ("first_term", "common_difference", "n"),
+    "solve_geometric_progression": ("first_term", "common_ratio", "n"),
+    "calculate_compound_interest": ("principal", "rate", "time", "compounds_per_year"),
+    "calculate_simple_interest": ("principal", "rate", "time"),
+    "calculate_haversine": ("lat1", "lon1", "lat2", "lon2"),
+    "calculate_great_circle": ("lat1", "lon1", "lat2", "lon2"),
+    "calculate_small_circle": ("latitude", "lon1", "lon2"),
+    "degrees_to_nautical_miles": ("degrees",),
+    "nautical_miles_to_kilometers": ("nautical_miles",),
+    "generate_balance_sheet": ("assets", "liabilities"),
+    "calculate_profit_loss": ("revenue", "expenses"),
+    "calculate_depreciation_straight_line": ("cost", "salvage_value", "useful_life"),
+}
+
+
+class FormulaRecord(Mapping):
+    """
+    Read-only, dict-compatible result of one formula call
+
+    Subclasses are generated per formula and result layout by
+    record_type(); each field lives in a slot instead of a per-instance
+    dict, so a record costs a fraction of the equivalent result dict.
+    """
+
+    __slots__ = ()
+    formula = None
+    fields = ()
+
+    def __init__(self, *values):
+        for field, value in zip(self.fields, values):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key):
+        if key in self.fields:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __repr__(self):
+        items = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.fields)
+        return f"{type(self).__name__}({items})"
+
+    def __reduce__(self):
+        return (_rebuild_record, (self.formula, self.fields, tuple(self.values())))
+
+    def to_dict(self):
+        """Return the result as a plain dict"""
+        return {field: getattr(self, field) for field in self.fields}
+
+
+_record_types = {}
+
+
+def record_type(name, fields):
+    """
+    Get (or create) the record class for a formula's result layout
+
+    Args:
+        name (str): Formula name
+        fields (tuple): Result keys, in result order
+
+    Returns:
+        type: FormulaRecord subclass with one slot per field
+    """
+    fields = tuple(fields)
+    key = (name, fields)
+    cls = _record_types.get(key)
+    if cls is None:
+        clashes = [field for field in fields if hasattr(FormulaRecord, field)]
+        if clashes:
+            raise ValueError(f"Result fields {clashes} clash with the record interface")
+        class_name = "".join(part.title() for part in name.split("_")) + "Result"
+        cls = type(class_name, (FormulaRecord,), {
+            "__slots__": fields,
+            "formula": name,
+            "fields": fields,
+        })
+        _record_types[key] = cls
+    return cls
+
+
+def _rebuild_record(name, fields, values):
+    """Unpickle helper: records are rebuilt from their generated type"""
+    return record_type(name, fields)(*values)
+
+
+def _kept_fields(name, keys, echo_inputs):
+    """Result keys to keep, dropping input echoes when asked to"""
+    if echo_inputs:
+        return tuple(keys)
+    echoes = ECHOED_INPUTS.get(name, ())
+    return tuple(key for key in keys if key not in echoes)
+
+
+def to_record(name, result, echo_inputs=True):
+    """
+    Convert a formula result dict into a compact record
+
+    Args:
+        name (str): Formula name
+        result (dict): Result returned by the formula
+        echo_inputs (bool): Keep keys that only repeat the inputs
+
+    Returns:
+        FormulaRecord: Dict-compatible record
+    """
+    fields = _kept_fields(name, result, echo_inputs)
+    return record_type(name, fields)(*(result[field] for field in fields))
+
+
+def evaluate(name, args, echo_inputs=True):
+    """
+    Call a formula and return its result as a compact record
+
+    Args:
+        name (str): Formula name
+        args (dict): Keyword arguments for the formula
+        echo_inputs (bool): Keep keys that only repeat the inputs
+
+    Returns:
+        FormulaRecord: Dict-compatible record
+    """
+    return to_record(name, catalog.dispatch(name, args), echo_inputs)
+
+
+class ColumnarResult(Mapping):
+    """
+    Struct-of-arrays result of a batch of formula calls
+
+    Mapping access returns whole columns (result["distance"] is an array);
+    row(i) returns the FormulaRecord of one call.
+    """
+
+    __slots__ = ("formula", "_columns", "num_rows")
+
+    def __init__(self, formula, columns):
+        import numpy as np
+
+        self.formula = formula
+        self._columns = {key: np.asarray(column) for key, column in columns.items()}
+        lengths = {len(column) for column in self._columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All result columns must have the same length")
+        self.num_rows = lengths.pop() if lengths else 0
+
+    def __getitem__(self, key):
+        return self._columns[key]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    def __repr__(self):
+        return (f"ColumnarResult({self.formula!r}, rows={self.num_rows}, "
+                f"columns={list(self._columns)})")
+
+    def row(self, index):
+        """
+        Get the result of one call
+
+        Args:
+            index (int): Row number
+
+        Returns:
+            FormulaRecord: Record whose values are Python scalars
+        """
+        fields = tuple(self._columns)
+        values = []
+        for column in self._columns.values():
+            value = column[index]
+            values.append(value.item() if hasattr(value, "item") and value.ndim == 0 else value)
+        return record_type(self.formula, fields)(*values)
+
+    def rows(self):
+        """Iterate over the per-call records"""
+        for index in range(self.num_rows):
+            yield self.row(index)
+
+    @property
+    def nbytes(self):
+        """Total bytes held by the column arrays"""
+        return sum(column.nbytes for column in self._columns.values())
+
+
+def to_columns(name, results, echo_inputs=True):
+    """
+    Pack many scalar results of one formula into columns
+
+    Keys missing from some results (e.g. "error") are filled with None,
+    or NaN in numeric columns.
+
+    Args:
+        name (str): Formula name
+        results (iterable): Result dicts or records
+        echo_inputs (bool): Keep keys that only repeat the inputs
+
+    Returns:
+        ColumnarResult: Struct-of-arrays result
+    """
+    from .batch import column_from_values
+
+    results = list(results)
+    keys = {}
+    for result in results:
+        keys.update(dict.fromkeys(result))
+
+    columns = {}
+    for key in _kept_fields(name, keys, echo_inputs):
+        columns[key] = column_from_values([result.get(key) for result in results])
+    return ColumnarResult(name, columns)
+
+
+def evaluate_batch(name, columns, echo_inputs=True, validate=False):
+    """
+    Evaluate a formula over whole columns and keep the result columnar
+
+    Args:
+        name (str): Formula name
+        columns (dict): Parameter name -> array/sequence/scalar
+        echo_inputs (bool): Keep keys that only repeat the inputs
+        validate (bool): Reject invalid rows before evaluating (adds a
+            "validation_error" column)
+
+    Returns:
+        ColumnarResult: Struct-of-arrays result
+    """
+    if validate:
+        from .validation import dispatch_validated as dispatch_batch
+    else:
+        from .batch import dispatch_batch
+
+    result = dispatch_batch(name, columns)
+    kept = _kept_fields(name, result, echo_inputs)
+    return ColumnarResult(name, {key: result[key] for key in kept})
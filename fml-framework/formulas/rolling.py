@@ -0,0 +1,462 @@
+"""
+Rolling Statistics - FML Framework
+Moving mean, variance, standard deviation, median and mode over sliding
+windows of time-ordered data, updated incrementally instead of re-running
+analyze_data_list on every window.
+
+- Count windows hold the last `window` values; time windows hold the
+  values with time in (t - duration, t] for the latest time t
+- Mean and variance: streams keep the window as two blocks, old values
+  with suffix moments and new values with running moments (Welford adds
+  only), merged with Chan's update, amortized O(1) per value; whole arrays
+  merge the moments of aligned power-of-two blocks, O(log w) per value
+  and vectorized. No moments are ever subtracted, so a level shift does
+  not cancel catastrophically
+- Median: two heaps with lazy deletion, O(log w) per value
+- Mode: values bucketed by count, O(1) per value; k tied modes are put in
+  first-occurrence order in O(k log k)
+
+Per window the measures match the formulas: population variance as in
+calculate_standard_deviation; median and mode as in analyze_data_list.
+
+Usage:
+    from formulas.rolling import RollingStats, rolling_statistics
+
+    rolling_statistics(readings, window=60)["median"]
+    rolling_statistics(readings, times=timestamps, duration=300.0)
+
+    live = RollingStats(duration=300.0)
+    for t, value in feed:
+        live.push(value, t)
+        live.snapshot()
+"""
+
+import heapq
+from collections import deque
+
+import numpy as np
+
+
+STATISTICS = ("count", "mean", "variance", "standard_deviation", "median", "mode")
+
+
+def _check_window(window, duration):
+    if (window is None) == (duration is None):
+        raise ValueError("Give exactly one of window or duration")
+    if window is not None and (int(window) != window or window < 1):
+        raise ValueError("window must be a positive integer")
+    if duration is not None and duration <= 0:
+        raise ValueError("duration must be positive")
+
+
+class RollingMedian:
+    """
+    Median of a multiset with insertions and arbitrary removals
+
+    Two heaps split the values at the median; removed values are only
+    marked and dropped once they reach a heap top.
+    """
+
+    def __init__(self):
+        self._low = []       # max-heap (negated values)
+        self._high = []      # min-heap
+        self._low_size = 0
+        self._high_size = 0
+        self._delayed = {}
+
+    def __len__(self):
+        return self._low_size + self._high_size
+
+    def _prune(self, heap, sign):
+        while heap:
+            value = sign * heap[0]
+            pending = self._delayed.get(value)
+            if not pending:
+                break
+            if pending == 1:
+                del self._delayed[value]
+            else:
+                self._delayed[value] = pending - 1
+            heapq.heappop(heap)
+
+    def _rebalance(self):
+        if self._low_size > self._high_size + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low, -1)
+        elif self._low_size < self._high_size:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune(self._high, 1)
+
+    def add(self, value):
+        if not self._low or value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+        self._rebalance()
+
+    def remove(self, value):
+        """Remove one occurrence of a value previously added"""
+        self._delayed[value] = self._delayed.get(value, 0) + 1
+        if value <= -self._low[0]:
+            self._low_size -= 1
+            if value == -self._low[0]:
+                self._prune(self._low, -1)
+        else:
+            self._high_size -= 1
+            if value == self._high[0]:
+                self._prune(self._high, 1)
+        self._rebalance()
+
+    def median(self):
+        if not len(self):
+            return None
+        if self._low_size > self._high_size:
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2
+
+
+class RollingStats:
+    """
+    Sliding-window accumulator for streamed values
+
+    Args:
+        window (int, optional): Window length in values
+        duration (float, optional): Window length in time units; push()
+            then needs a non-decreasing time with every value
+    """
+
+    def __init__(self, window=None, duration=None):
+        _check_window(window, duration)
+        self.window = window
+        self.duration = duration
+        self._items = deque()
+        self._front = []       # (count, mean, M2) of each suffix of the oldest values
+        self._back = (0, 0.0, 0.0)  # (count, mean, M2) of the values after them
+        self._median = RollingMedian()
+        self._positions = {}   # value -> positions of its occurrences in the window
+        self._first = {}       # value -> position of its first occurrence
+        self._buckets = {}     # count -> values with that count (ordered set)
+        self._max_count = 0
+        self._pushed = 0
+        self._last_time = None
+
+    @property
+    def count(self):
+        return len(self._items)
+
+    def push(self, value, time=None):
+        """
+        Add the next value and evict the values that left the window
+
+        Returns:
+            RollingStats: self
+        """
+        if self.duration is not None:
+            if time is None:
+                raise ValueError("Time windows need a time with every value")
+            if self._last_time is not None and time < self._last_time:
+                raise ValueError("Times must be non-decreasing")
+            self._last_time = time
+        self._items.append((time, value))
+        self._add(value)
+
+        if self.window is not None:
+            while len(self._items) > self.window:
+                self._remove_oldest()
+        else:
+            start = time - self.duration
+            while self._items[0][0] <= start:
+                self._remove_oldest()
+        return self
+
+    def _remove_oldest(self):
+        if not self._front:
+            self._flip()
+        self._front.pop()
+        self._remove(self._items.popleft()[1])
+
+    def _flip(self):
+        """Move every value into the front stack, newest first"""
+        count, mean, m2 = 0, 0.0, 0.0
+        front = self._front
+        for _, value in reversed(self._items):
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+            front.append((count, mean, m2))
+        self._back = (0, 0.0, 0.0)
+
+    def _add(self, value):
+        count, mean, m2 = self._back
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        self._back = (count, mean, m2 + delta * (value - mean))
+        self._median.add(value)
+
+        positions = self._positions.get(value)
+        if positions is None:
+            positions = self._positions[value] = deque()
+            self._first[value] = self._pushed
+        positions.append(self._pushed)
+        self._pushed += 1
+        count = len(positions)
+        if count > 1:
+            previous = self._buckets[count - 1]
+            del previous[value]
+            if not previous:
+                del self._buckets[count - 1]
+        self._buckets.setdefault(count, {})[value] = None
+        if count > self._max_count:
+            self._max_count = count
+
+    def _remove(self, value):
+        self._median.remove(value)
+
+        positions = self._positions[value]
+        count = len(positions)
+        positions.popleft()
+        bucket = self._buckets[count]
+        del bucket[value]
+        if count == 1:
+            del self._positions[value]
+            del self._first[value]
+        else:
+            self._first[value] = positions[0]
+            self._buckets.setdefault(count - 1, {})[value] = None
+        if not bucket:
+            del self._buckets[count]
+            if count == self._max_count:
+                self._max_count -= 1
+
+    # --- results ---
+
+    def _moments(self):
+        """(count, mean, M2) of the window, the two blocks merged"""
+        back = self._back
+        if not self._front:
+            return back
+        count, mean, m2 = self._front[-1]
+        if not back[0]:
+            return count, mean, m2
+        total = count + back[0]
+        delta = back[1] - mean
+        return (total, mean + delta * back[0] / total,
+                m2 + back[2] + delta * delta * count * back[0] / total)
+
+    @property
+    def mean(self):
+        """Mean of the window"""
+        return self._moments()[1]
+
+    @property
+    def variance(self):
+        """Population variance of the window"""
+        count, _, m2 = self._moments()
+        return m2 / count if count else 0.0
+
+    def median(self):
+        return self._median.median()
+
+    def modes(self):
+        """Most frequent values of the window, in first-occurrence order"""
+        top = self._buckets.get(self._max_count)
+        if not top:
+            return []
+        if len(top) == 1:
+            return list(top)
+        return sorted(top, key=self._first.__getitem__)
+
+    def mode(self):
+        """Mode as in analyze_data_list (a list when values tie)"""
+        modes = self.modes()
+        return modes[0] if len(modes) == 1 else modes
+
+    def snapshot(self):
+        """
+        Statistics of the current window
+
+        Returns:
+            dict: count, mean, variance, standard_deviation, median, mode
+        """
+        if not self._items:
+            return {"error": "No values in window"}
+        count, mean, m2 = self._moments()
+        variance = m2 / count
+        return {
+            "count": count,
+            "mean": mean,
+            "variance": variance,
+            "standard_deviation": variance ** 0.5,
+            "median": self.median(),
+            "mode": self.mode()
+        }
+
+
+def rolling_stream(items, window=None, duration=None):
+    """
+    Snapshot after every value of a stream
+
+    Args:
+        items (iterable): Values for count windows, (time, value) pairs
+            for time windows
+
+    Yields:
+        dict: RollingStats.snapshot() of each window
+    """
+    stats = RollingStats(window, duration)
+    for item in items:
+        if duration is None:
+            stats.push(item)
+        else:
+            stats.push(item[1], item[0])
+        yield stats.snapshot()
+
+
+def _window_starts(n, window, times, duration):
+    if window is not None:
+        return np.maximum(np.arange(n) - window + 1, 0)
+    if times is None:
+        raise ValueError("Time windows need times")
+    times = np.asarray(times, dtype=np.float64)
+    if times.shape != (n,):
+        raise ValueError("times must have one entry per value")
+    if n and (np.diff(times) < 0).any():
+        raise ValueError("Times must be non-decreasing")
+    return np.searchsorted(times, times - duration, side="right")
+
+
+def _block_moments(array):
+    """
+    Mean and M2 (sum of squared deviations) of every aligned block of 2**k
+    values, for all k, merged pairwise from the level below
+
+    Returns:
+        tuple: Flattened means, flattened M2s, start offset of each level
+    """
+    means = [array]
+    m2s = [np.zeros(array.size)]
+    size = 1
+    while means[-1].size >= 2:
+        mean, m2 = means[-1], m2s[-1]
+        pairs = mean.size // 2 * 2
+        delta = mean[1:pairs:2] - mean[0:pairs:2]
+        means.append(mean[0:pairs:2] + delta / 2)
+        m2s.append(m2[0:pairs:2] + m2[1:pairs:2] + delta * delta * (size / 2))
+        size *= 2
+    offsets = np.cumsum([0] + [level.size for level in means[:-1]])
+    return np.concatenate(means), np.concatenate(m2s), offsets
+
+
+def _window_moments(array, starts):
+    """
+    Mean and population variance of array[starts[i]:i + 1] for every i
+
+    Each window is split into at most 2 log2(w) aligned power-of-two blocks
+    whose moments are combined with Chan's update, so no sum spans more than
+    one window (prefix sums of x and x^2 cancel catastrophically after a
+    level shift).
+    """
+    n = array.size
+    block_means, block_m2s, offsets = _block_moments(array)
+    ends = np.arange(1, n + 1)
+    position = starts.astype(np.int64)
+    count = np.zeros(n)
+    mean = np.zeros(n)
+    m2 = np.zeros(n)
+    pending = np.flatnonzero(position < ends)
+    while pending.size:
+        start = position[pending]
+        # largest block that starts aligned at `start` and fits the window
+        level = np.frexp(ends[pending] - start)[1] - 1
+        aligned = np.frexp(start & -start)[1] - 1
+        level = np.where(start > 0, np.minimum(level, aligned), level)
+        size = np.left_shift(1, level)
+        index = offsets[level] + (start >> level)
+
+        before = count[pending]
+        total = before + size
+        delta = block_means[index] - mean[pending]
+        mean[pending] += delta * (size / total)
+        m2[pending] += block_m2s[index] + delta * delta * (before * size / total)
+        count[pending] = total
+
+        position[pending] = start + size
+        pending = pending[position[pending] < ends[pending]]
+    return mean, m2 / np.maximum(count, 1)
+
+
+def rolling_statistics(values, window=None, times=None, duration=None, stats=STATISTICS, min_count=1):
+    """
+    Windowed statistics ending at every position of an array
+
+    Args:
+        values (array-like): Time-ordered numbers
+        window (int, optional): Count window length
+        times (array-like, optional): Non-decreasing time of every value
+        duration (float, optional): Time window length
+        stats (list): Any of count, mean, variance, standard_deviation,
+            median, mode
+        min_count (int): Windows with fewer values give NaN (None for mode)
+
+    Returns:
+        dict: One column per statistic, one entry per value (NumPy arrays;
+            "mode" is a list)
+    """
+    _check_window(window, duration)
+    unknown = set(stats) - set(STATISTICS)
+    if unknown:
+        raise ValueError(f"Unknown statistics: {', '.join(sorted(unknown))}")
+    array = np.asarray(values)
+    if array.ndim != 1 or array.dtype.kind not in "iuf":
+        raise ValueError("values must be a one-dimensional numeric array")
+    if array.dtype.kind == "f" and not np.isfinite(array).all():
+        raise ValueError("values must be finite numbers")
+    n = array.size
+    starts = _window_starts(n, window, times, duration)
+    counts = np.arange(1, n + 1) - starts
+    short = counts < min_count
+    result = {}
+    if "count" in stats:
+        result["count"] = counts
+
+    if {"mean", "variance", "standard_deviation"} & set(stats):
+        window_mean, variance = _window_moments(array.astype(np.float64), starts)
+        columns = {"mean": window_mean, "variance": variance,
+                   "standard_deviation": np.sqrt(variance)}
+        for name, column in columns.items():
+            if name in stats:
+                column[short] = np.nan
+                result[name] = column
+
+    if {"median", "mode"} & set(stats):
+        medians = np.empty(n)
+        modes = []
+        rolling = RollingStats(window=n + 1)
+        items = array.tolist()
+        evicted = 0
+        for i, (value, start) in enumerate(zip(items, starts.tolist())):
+            rolling.push(value)
+            while evicted < start:
+                rolling._remove_oldest()
+                evicted += 1
+            if short[i]:
+                medians[i] = np.nan
+                modes.append(None)
+                continue
+            if "median" in stats:
+                medians[i] = rolling.median()
+            if "mode" in stats:
+                modes.append(rolling.mode())
+        if "median" in stats:
+            result["median"] = medians
+        if "mode" in stats:
+            result["mode"] = modes
+    return result
@@ -0,0 +1,195 @@
+"""
+Routes - FML Framework
+Track-level operations over arrays of GPS fixes, on the earth_geometry
+sphere: segment and cumulative distances, segment bearings, interpolation
+at given along-track distances and resampling to evenly spaced waypoints
+along the great circles between fixes.
+
+Each function handles one track with vectorized NumPy (no per-segment
+calculate_haversine calls); map_tracks() runs any of them over many tracks
+in a process pool.
+
+Usage:
+    from formulas.routes import cumulative_distance, bearings, resample, map_tracks
+
+    cumulative_distance(lats, lons)[-1]           # track length in km
+    bearings(lats, lons)                          # initial bearing of each segment
+    resample(lats, lons, spacing=0.5)             # a waypoint every 500 m
+    interpolate(lats, lons, [1.0, 2.5], unit="nm")
+
+    map_tracks(track_length, tracks, workers=8)   # tracks: [(lats, lons), ...]
+"""
+
+import os
+from functools import partial
+
+import numpy as np
+
+from .geodesy import PointSet, _central_angle, _radius
+
+
+def _points(lat, lon):
+    points = PointSet(lat, lon)
+    if not len(points):
+        raise ValueError("A track needs at least one point")
+    return points
+
+
+def _segment_angles(points):
+    return _central_angle(points.lat[:-1], points.lon[:-1], points.lat[1:], points.lon[1:],
+                          points.cos_lat[:-1], points.cos_lat[1:])
+
+
+def segment_distances(lat, lon, unit="km"):
+    """
+    Great-circle length of every segment between consecutive fixes
+
+    Args:
+        lat (array-like): Latitudes in degrees, in track order
+        lon (array-like): Longitudes in degrees
+        unit (str): "km" or "nm"
+
+    Returns:
+        np.ndarray: n - 1 segment lengths
+    """
+    return _radius(unit) * _segment_angles(_points(lat, lon))
+
+
+def cumulative_distance(lat, lon, unit="km"):
+    """
+    Distance travelled up to every fix
+
+    Returns:
+        np.ndarray: n values starting at 0; the last is the track length
+    """
+    return np.concatenate(([0.0], np.cumsum(segment_distances(lat, lon, unit))))
+
+
+def track_length(lat, lon, unit="km"):
+    """
+    Total path length of a track
+
+    Returns:
+        dict: Contains length and unit
+    """
+    return {"length": float(segment_distances(lat, lon, unit).sum()), "unit": unit}
+
+
+def bearings(lat, lon):
+    """
+    Initial great-circle bearing of every segment
+
+    Returns:
+        np.ndarray: n - 1 bearings in degrees clockwise from north, in
+            [0, 360) (0 for zero-length segments)
+    """
+    points = _points(lat, lon)
+    dlon = points.lon[1:] - points.lon[:-1]
+    x = points.cos_lat[1:] * np.sin(dlon)
+    y = (points.cos_lat[:-1] * points.sin_lat[1:]
+         - points.sin_lat[:-1] * points.cos_lat[1:] * np.cos(dlon))
+    return np.degrees(np.arctan2(x, y)) % 360
+
+
+def _along(points, angles, targets):
+    """Points at along-track angles (radians from the start) by slerp"""
+    cumulative = np.concatenate(([0.0], np.cumsum(angles)))
+    targets = np.clip(targets, 0.0, cumulative[-1])
+    if len(points) == 1:
+        return np.full(targets.shape, points.lat[0]), np.full(targets.shape, points.lon[0])
+
+    segment = np.clip(np.searchsorted(cumulative, targets, side="right") - 1, 0, angles.size - 1)
+    span = angles[segment]
+    offset = targets - cumulative[segment]
+
+    start = np.column_stack((points.cos_lat * np.cos(points.lon),
+                             points.cos_lat * np.sin(points.lon), points.sin_lat))
+    a, b = start[segment], start[segment + 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sin_span = np.sin(span)
+        weight_a = np.where(span > 0, np.sin(span - offset) / sin_span, 1.0)
+        weight_b = np.where(span > 0, np.sin(offset) / sin_span, 0.0)
+    xyz = weight_a[:, None] * a + weight_b[:, None] * b
+    lat = np.arctan2(xyz[:, 2], np.hypot(xyz[:, 0], xyz[:, 1]))
+    lon = np.arctan2(xyz[:, 1], xyz[:, 0])
+    return lat, lon
+
+
+def interpolate(lat, lon, distances, unit="km"):
+    """
+    Positions at given distances along a track
+
+    Between fixes the track follows the great circle, so the result lies on
+    the segment containing each distance.
+
+    Args:
+        lat, lon (array-like): Track fixes in degrees
+        distances (array-like): Along-track distances from the first fix
+            (clipped to the track)
+        unit (str): "km" or "nm"
+
+    Returns:
+        dict: lat and lon arrays in degrees
+    """
+    points = _points(lat, lon)
+    targets = np.atleast_1d(np.asarray(distances, dtype=np.float64)) / _radius(unit)
+    new_lat, new_lon = _along(points, _segment_angles(points), targets)
+    return {"lat": np.degrees(new_lat), "lon": np.degrees(new_lon)}
+
+
+def resample(lat, lon, spacing, unit="km"):
+    """
+    Evenly spaced waypoints along a track
+
+    Args:
+        lat, lon (array-like): Track fixes in degrees
+        spacing (float): Distance between waypoints
+        unit (str): "km" or "nm"
+
+    Returns:
+        dict: lat, lon (degrees) and distance of each waypoint; the first
+            and last fixes are always included
+    """
+    if spacing <= 0:
+        raise ValueError("spacing must be positive")
+    points = _points(lat, lon)
+    radius = _radius(unit)
+    angles = _segment_angles(points)
+    length = float(angles.sum()) * radius
+    distance = np.arange(0.0, length, spacing)
+    if not distance.size or distance[-1] < length:
+        distance = np.append(distance, length)
+    new_lat, new_lon = _along(points, angles, distance / radius)
+    return {"lat": np.degrees(new_lat), "lon": np.degrees(new_lon), "distance": distance}
+
+
+def _apply(function, kwargs, track):
+    return function(*track, **kwargs)
+
+
+def map_tracks(function, tracks, workers=None, executor=None, **kwargs):
+    """
+    Run a route function over many tracks in parallel
+
+    Args:
+        function: Module-level function taking (lat, lon, ...), e.g.
+            track_length, cumulative_distance or resample
+        tracks (list): (lat, lon) pairs of arrays
+        workers (int, optional): Worker processes (default: CPU count)
+        executor (optional): Existing concurrent.futures executor to reuse
+        **kwargs: Extra arguments for function (unit, spacing, ...)
+
+    Returns:
+        list: function's result for every track, in order
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    task = partial(_apply, function, kwargs)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tracks) // (4 * workers))
+    if executor is not None:
+        return list(executor.map(task, tracks, chunksize=chunksize))
+    if workers == 1:
+        return [task(track) for track in tracks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(task, tracks, chunksize=chunksize))
@@ -0,0 +1,325 @@
+"""
+Formula Tool Server - FML Framework
+Local asyncio HTTP server exposing every FORMULAS entry over JSON-RPC 2.0,
+so the apps can call the Python formulas instead of re-implementing them.
+
+- POST / with a JSON-RPC request or a batch (JSON array of requests)
+- The method is the formula name; params is an object of named arguments
+- "rpc.list_formulas" and "rpc.describe" return catalog metadata
+- HTTP/1.1 keep-alive: many requests can share one connection
+- Large batches are evaluated in an executor so the event loop stays free
+- GET /metrics serves Prometheus text when formulas.metrics is enabled
+
+Usage:
+    python -m formulas.server --host 127.0.0.1 --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+from . import catalog
+
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+_REASONS = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+def _error(request_id, code, message):
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+_BUILTINS = {
+    "rpc.list_formulas": catalog.list_formulas,
+    "rpc.describe": catalog.describe,
+}
+
+
+def _jsonable(value):
+    """
+    Convert a formula result into plain JSON values
+
+    NaN/inf, which strict JSON clients reject, become None; complex numbers
+    become {"real", "imag"}; NumPy values become Python lists and numbers;
+    anything else JSON cannot hold becomes its str().
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if value is None or isinstance(value, (str, int)):
+        return value
+    if isinstance(value, complex):
+        return {"real": _jsonable(value.real), "imag": _jsonable(value.imag)}
+    if isinstance(value, dict):
+        return {key if isinstance(key, (str, int, float)) else str(key): _jsonable(item)
+                for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_jsonable(item) for item in value]
+    if hasattr(value, "tolist"):
+        return _jsonable(value.tolist())
+    return str(value)
+
+
+def _evaluate(request):
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        return _error(None, INVALID_REQUEST, "Invalid Request")
+
+    request_id = request.get("id")
+    method = request["method"]
+    params = request.get("params", {})
+    if not isinstance(params, (dict, list)):
+        return _error(request_id, INVALID_PARAMS, "params must be an object or array")
+
+    try:
+        function = _BUILTINS.get(method) or catalog.get_function(method)
+    except KeyError:
+        return _error(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+
+    try:
+        result = function(*params) if isinstance(params, list) else function(**params)
+    except TypeError as exc:
+        return _error(request_id, INVALID_PARAMS, str(exc))
+    except Exception as exc:
+        return _error(request_id, INTERNAL_ERROR, f"{type(exc).__name__}: {exc}")
+    return {"jsonrpc": "2.0", "id": request_id, "result": _jsonable(result)}
+
+
+def handle_request(request):
+    """
+    Evaluate one JSON-RPC request object
+
+    Notifications (valid requests without an "id") are evaluated but get
+    no response, not even an error.
+
+    Args:
+        request (dict): Decoded JSON-RPC request
+
+    Returns:
+        dict: JSON-RPC response, or None for notifications
+    """
+    response = _evaluate(request)
+    if isinstance(request, dict) and isinstance(request.get("method"), str) and "id" not in request:
+        return None
+    return response
+
+
+def handle_batch(requests):
+    """Evaluate a list of JSON-RPC requests, dropping notification replies"""
+    responses = (handle_request(request) for request in requests)
+    return [response for response in responses if response is not None]
+
+
+def _encode(payload):
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _encode_response(payload):
+    """
+    Encode a response or batch of responses
+
+    A response JSON cannot encode is replaced by an internal error for the
+    same id, so the client always gets a well-formed reply.
+    """
+    if isinstance(payload, list):
+        return b"[" + b",".join(_encode_response(response) for response in payload) + b"]"
+    try:
+        return _encode(payload)
+    except (TypeError, ValueError) as exc:
+        request_id = payload.get("id") if isinstance(payload, dict) else None
+        return _encode(_error(request_id, INTERNAL_ERROR, f"{type(exc).__name__}: {exc}"))
+
+
+class FormulaServer:
+    """
+    JSON-RPC over HTTP/1.1 server for the formula registries
+
+    Args:
+        host (str): Interface to bind (defaults to localhost only)
+        port (int): TCP port (0 picks a free port)
+        executor: concurrent.futures executor for large batches
+            (defaults to a process pool)
+        offload_threshold (int): Batches with at least this many calls
+            run in the executor instead of on the event loop
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, executor=None, offload_threshold=64):
+        self.host = host
+        self.port = port
+        self.offload_threshold = offload_threshold
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._server = None
+        self._connections = set()
+
+    async def start(self):
+        """Bind the socket and start serving; returns the bound port"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor()
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        """Stop accepting connections and release the executor"""
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def dispatch(self, payload):
+        """
+        Evaluate a decoded JSON-RPC payload (single request or batch)
+
+        Returns:
+            dict or list or None: Response payload (None if nothing to send)
+        """
+        if isinstance(payload, list):
+            if not payload:
+                return _error(None, INVALID_REQUEST, "Empty batch")
+            if len(payload) >= self.offload_threshold:
+                from . import metrics
+
+                loop = asyncio.get_running_loop()
+                if metrics.is_enabled() and isinstance(self._executor, ProcessPoolExecutor):
+                    # worker processes record their own metrics; merge them here
+                    responses, recorded = await loop.run_in_executor(
+                        self._executor, metrics.record_call, handle_batch, payload)
+                    metrics.merge(recorded)
+                else:
+                    responses = await loop.run_in_executor(self._executor, handle_batch, payload)
+            else:
+                responses = handle_batch(payload)
+            return responses or None
+        return handle_request(payload)
+
+    async def _serve_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, _, rest = request_line.decode("latin-1").partition(" ")
+                path, _, version = rest.rstrip().rpartition(" ")
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, None, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                if method == "GET" and path == "/metrics":
+                    await self._respond_metrics(writer, keep_alive)
+                elif method != "POST":
+                    await self._respond(writer, 405, None, keep_alive)
+                else:
+                    try:
+                        payload = json.loads(body)
+                    except ValueError:
+                        response = _error(None, PARSE_ERROR, "Parse error")
+                    else:
+                        response = await self.dispatch(payload)
+                    await self._respond(writer, 200 if response is not None else 204, response, keep_alive)
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            pass  # server shutting down with an idle keep-alive connection
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _respond_metrics(self, writer, keep_alive):
+        from . import metrics
+
+        if not metrics.is_enabled():
+            await self._respond(writer, 404, None, keep_alive)
+            return
+        body = metrics.to_prometheus().encode("utf-8")
+        await self._respond(writer, 200, None, keep_alive, body,
+                            "text/plain; version=0.0.4; charset=utf-8")
+
+    async def _respond(self, writer, status, payload, keep_alive, body=None,
+                       content_type="application/json"):
+        if body is None:
+            body = _encode_response(payload) if payload is not None else b""
+        head = (
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m formulas.server",
+        description="Serve the FML formulas over local HTTP/JSON-RPC"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--offload-threshold", type=int, default=64,
+                        help="Batch size from which calls run in the process pool")
+    parser.add_argument("--metrics", action="store_true",
+                        help="Record per-formula metrics and serve them at GET /metrics")
+    args = parser.parse_args(argv)
+
+    if args.metrics:
+        from . import metrics
+        metrics.enable()
+
+    server = FormulaServer(args.host, args.port, offload_threshold=args.offload_threshold)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Quantile Sketches - FML Framework
+Mergeable KLL quantile sketch (Karnin, Lang & Liberty 2016) for medians,
+quartiles and percentiles over more values than fit in memory.
+
+- Memory is O(k log(n / k)) values for n inputs; k follows from the
+  requested rank error
+- Sketches built on separate shards, classes or days merge into a sketch
+  of the union
+- to_bytes()/from_bytes() give a compact binary form for storage
+
+The error bound is on ranks: quantile(0.5) returns a value whose true rank
+is within error * n of n / 2 (with ~99% confidence). min and max are exact.
+
+Usage:
+    from formulas.sketches import KLLSketch
+
+    sketch = KLLSketch(error=0.005)
+    for chunk in chunks:
+        sketch.update_many(chunk)
+    sketch.quantiles([0.25, 0.5, 0.75])
+    blob = sketch.to_bytes()
+    KLLSketch.from_bytes(blob).merge(other_day).summary()
+"""
+
+import math
+import struct
+
+import numpy as np
+
+
+_MAGIC = b"KLL1"
+_HEADER = struct.Struct("<4sIQddH")
+
+
+def k_for_error(error):
+    """
+    Compactor size giving a normalized rank error of about `error`
+
+    Uses the empirical KLL bound eps ~ 2.296 / k**0.9723 (99% confidence).
+
+    Args:
+        error (float): Target rank error, e.g. 0.01 for 1%
+
+    Returns:
+        int: Sketch parameter k
+    """
+    if not 0 < error < 1:
+        raise ValueError("error must be between 0 and 1")
+    return max(8, math.ceil((2.296 / error) ** (1 / 0.9723)))
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch over float values
+
+    Args:
+        error (float): Target normalized rank error (ignored if k is given)
+        k (int, optional): Size of the top compactor
+        seed (int, optional): Seed for the random compaction offsets
+    """
+
+    _C = 2 / 3
+
+    def __init__(self, error=0.01, k=None, seed=None):
+        self.k = k if k is not None else k_for_error(error)
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def error(self):
+        """Approximate normalized rank error of this sketch's k"""
+        return 2.296 / self.k ** 0.9723
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * self._C ** depth)))
+
+    # --- updates ---
+
+    def update(self, value):
+        """Add one value"""
+        self.update_many([value])
+
+    def update_many(self, values):
+        """Add a chunk of values (array, list or other iterable)"""
+        data = np.asarray(values if not isinstance(values, (map, filter)) else list(values),
+                          dtype=np.float64).ravel()
+        if data.size == 0:
+            return
+        self.count += data.size
+        self.min = min(self.min, float(data.min()))
+        self.max = max(self.max, float(data.max()))
+        self.levels[0] = np.concatenate([self.levels[0], data])
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                keep = items[items.size - items.size % 2:]
+                offset = int(self._rng.integers(2))
+                promoted = items[offset:items.size - items.size % 2:2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def merge(self, other):
+        """
+        Fold another sketch into this one
+
+        Args:
+            other (KLLSketch): Sketch of other values (any k; the result
+                keeps this sketch's k)
+
+        Returns:
+            KLLSketch: self
+        """
+        if not other.count:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    # --- queries ---
+
+    def _weighted(self):
+        """Sorted retained values and their cumulative weights"""
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(items.size, 1 << level, dtype=np.int64)
+                                  for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        return values[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs):
+        """
+        Estimate several quantiles at once
+
+        Args:
+            qs (list): Fractions between 0 and 1
+
+        Returns:
+            list: Estimated values (q=0 and q=1 give the exact min and max)
+        """
+        if not self.count:
+            return [None] * len(qs)
+        values, cumulative = self._weighted()
+        total = cumulative[-1]
+        results = []
+        for q in qs:
+            if not 0 <= q <= 1:
+                raise ValueError("quantile fractions must be between 0 and 1")
+            if q == 0:
+                results.append(self.min)
+            elif q == 1:
+                results.append(self.max)
+            else:
+                index = int(np.searchsorted(cumulative, q * total, side="left"))
+                results.append(float(values[min(index, values.size - 1)]))
+        return results
+
+    def quantile(self, q):
+        """Estimate one quantile (0.5 for the median)"""
+        return self.quantiles([q])[0]
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def rank(self, value):
+        """
+        Estimated fraction of values <= value (the inverse of quantile)
+
+        Returns:
+            float: Rank between 0 and 1
+        """
+        if not self.count:
+            return 0.0
+        values, cumulative = self._weighted()
+        index = int(np.searchsorted(values, value, side="right"))
+        return float(cumulative[index - 1]) / cumulative[-1] if index else 0.0
+
+    def summary(self):
+        """
+        Five-number summary
+
+        Returns:
+            dict: count, min, q1, median, q3, max
+        """
+        q1, median, q3 = self.quantiles([0.25, 0.5, 0.75])
+        return {
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "q1": q1,
+            "median": median,
+            "q3": q3,
+            "max": self.max if self.count else None
+        }
+
+    # --- serialization ---
+
+    def to_bytes(self, dtype=np.float64):
+        """
+        Serialize the sketch
+
+        Args:
+            dtype: Storage type of the retained values (np.float32 halves
+                the size at the cost of value precision)
+
+        Returns:
+            bytes: Header, level sizes and retained values
+        """
+        dtype = np.dtype(dtype)
+        header = _HEADER.pack(_MAGIC, self.k, self.count, self.min, self.max, len(self.levels))
+        sizes = np.array([items.size for items in self.levels], dtype="<u4").tobytes()
+        code = b"f" if dtype == np.float32 else b"d"
+        values = np.concatenate(self.levels).astype(dtype.newbyteorder("<")).tobytes()
+        return header + code + sizes + values
+
+    @classmethod
+    def from_bytes(cls, blob, seed=None):
+        """Rebuild a sketch serialized by to_bytes()"""
+        magic, k, count, low, high, num_levels = _HEADER.unpack_from(blob)
+        if magic != _MAGIC:
+            raise ValueError("Not a serialized KLL sketch")
+        offset = _HEADER.size
+        dtype = "<f4" if blob[offset:offset + 1] == b"f" else "<f8"
+        offset += 1
+        sizes = np.frombuffer(blob, dtype="<u4", count=num_levels, offset=offset)
+        offset += 4 * num_levels
+        values = np.frombuffer(blob, dtype=dtype, offset=offset).astype(np.float64)
+
+        sketch = cls(k=k, seed=seed)
+        sketch.count = count
+        sketch.min = low
+        sketch.max = high
+        sketch.levels = np.split(values, np.cumsum(sizes)[:-1])
+        return sketch
+
+    def __getstate__(self):
+        return self.to_bytes()
+
+    def __setstate__(self, state):
+        self.__dict__.update(KLLSketch.from_bytes(state).__dict__)
@@ -0,0 +1,215 @@
+"""
+Spatial Index - FML Framework
+Nearest-neighbour and radius queries over a fixed set of lat/lon points,
+answered without scanning every point.
+
+Points are placed on the unit sphere (x, y, z) and organized in a ball
+tree. The straight-line (chord) distance between unit vectors grows
+monotonically with the great-circle angle, so the tree prunes on chords;
+the points it returns then get their haversine distance on the
+earth_geometry model (EARTH_RADIUS_KM / EARTH_RADIUS_NM), and radius
+results are filtered on that distance, so answers equal a brute-force
+calculate_haversine scan.
+
+Usage:
+    from formulas.spatial import BallTree
+
+    tree = BallTree(store_lats, store_lons)
+    tree.nearest(51.5, -0.12, k=5)                # index, distance_km, distance_nm
+    tree.within(51.5, -0.12, 25)                  # everything within 25 km
+    tree.within(51.5, -0.12, 10, unit="nm")
+"""
+
+import heapq
+import math
+
+import numpy as np
+
+from .earth_geometry import EARTH_RADIUS_KM, EARTH_RADIUS_NM
+from .geodesy import PointSet, _central_angle
+
+
+DEFAULT_LEAF_SIZE = 64
+
+
+def _unit_vectors(points):
+    """(n, 3) unit vectors of a PointSet"""
+    return np.column_stack((points.cos_lat * np.cos(points.lon),
+                            points.cos_lat * np.sin(points.lon), points.sin_lat))
+
+
+def _unit_vector(lat, lon):
+    """Unit vector of one point given in radians"""
+    cos_lat = math.cos(lat)
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+
+class BallTree:
+    """
+    Ball tree over points on the unit sphere
+
+    Args:
+        lat (array-like): Latitudes in degrees
+        lon (array-like): Longitudes in degrees
+        leaf_size (int): Most points per leaf (leaves are scanned vectorized)
+
+    Query results are dicts of arrays sorted by distance: "index" (position
+    in the input arrays), "distance_km" and "distance_nm".
+    """
+
+    def __init__(self, lat, lon, leaf_size=DEFAULT_LEAF_SIZE):
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be positive")
+        coordinates = PointSet(lat, lon)
+        if not np.isfinite(coordinates.lat).all() or not np.isfinite(coordinates.lon).all():
+            raise ValueError("Coordinates must be finite numbers")
+        self.leaf_size = leaf_size
+        self.size = len(coordinates)
+
+        points = _unit_vectors(coordinates)
+        order = np.arange(self.size)
+
+        # Node arrays; children are -1 for leaves
+        self._centers = []
+        self._radii = []
+        self._bounds = []
+        self._children = []
+        if self.size:
+            self._build(points, order, 0, self.size)
+
+        self.index = order
+        self._points = np.ascontiguousarray(points[order])
+        self._coordinates = coordinates[order]
+
+    def __len__(self):
+        return self.size
+
+    def _build(self, points, order, start, end):
+        node = len(self._radii)
+        members = points[order[start:end]]
+        center = members.mean(axis=0)
+        self._centers.append(tuple(center.tolist()))
+        self._radii.append(float(np.sqrt(np.square(members - center).sum(axis=1).max())))
+        self._bounds.append((start, end))
+        self._children.append((-1, -1))
+
+        if end - start > self.leaf_size:
+            axis = int(np.argmax(members.max(axis=0) - members.min(axis=0)))
+            middle = (end - start) // 2
+            split = np.argpartition(members[:, axis], middle)
+            order[start:end] = order[start:end][split]
+            left = self._build(points, order, start, start + middle)
+            right = self._build(points, order, start + middle, end)
+            self._children[node] = (left, right)
+        return node
+
+    def _distances(self, lat, lon, positions):
+        """Haversine central angles from one point (radians) to tree positions"""
+        coordinates = self._coordinates
+        return _central_angle(lat, lon, coordinates.lat[positions], coordinates.lon[positions],
+                              math.cos(lat), coordinates.cos_lat[positions])
+
+    def _result(self, positions, angles):
+        order = np.argsort(angles, kind="stable")
+        angles = angles[order]
+        return {
+            "index": self.index[positions[order]],
+            "distance_km": EARTH_RADIUS_KM * angles,
+            "distance_nm": EARTH_RADIUS_NM * angles
+        }
+
+    def nearest(self, lat, lon, k=1):
+        """
+        The k points closest to (lat, lon)
+
+        Args:
+            lat (float): Query latitude in degrees
+            lon (float): Query longitude in degrees
+            k (int): Number of neighbours (fewer if the tree is smaller)
+
+        Returns:
+            dict: index, distance_km, distance_nm (nearest first)
+        """
+        if k < 1:
+            raise ValueError("k must be positive")
+        k = min(k, self.size)
+        lat, lon = math.radians(lat), math.radians(lon)
+        if not k:
+            return self._result(np.empty(0, dtype=np.intp), np.empty(0))
+        query_tuple = _unit_vector(lat, lon)
+        query = np.array(query_tuple)
+
+        best_chord = np.empty(0)
+        best_positions = np.empty(0, dtype=np.intp)
+        worst = math.inf
+        heap = [(0.0, 0)]
+        while heap:
+            bound, node = heapq.heappop(heap)
+            if bound > worst:
+                break
+            left, right = self._children[node]
+            if left < 0:
+                start, end = self._bounds[node]
+                chord = np.sqrt(np.square(self._points[start:end] - query).sum(axis=1))
+                best_chord = np.concatenate((best_chord, chord))
+                best_positions = np.concatenate((best_positions, np.arange(start, end)))
+                if best_chord.size > k:
+                    keep = np.argpartition(best_chord, k - 1)[:k]
+                    best_chord, best_positions = best_chord[keep], best_positions[keep]
+                if best_chord.size == k:
+                    worst = float(best_chord.max())
+                continue
+            for child in (left, right):
+                gap = math.dist(query_tuple, self._centers[child]) - self._radii[child]
+                if gap <= worst:
+                    heapq.heappush(heap, (max(gap, 0.0), child))
+
+        return self._result(best_positions, self._distances(lat, lon, best_positions))
+
+    def within(self, lat, lon, radius, unit="km"):
+        """
+        Every point whose haversine distance from (lat, lon) is <= radius
+
+        Args:
+            lat (float): Query latitude in degrees
+            lon (float): Query longitude in degrees
+            radius (float): Search radius
+            unit (str): "km" or "nm" (selects the earth radius, as in
+                calculate_haversine)
+
+        Returns:
+            dict: index, distance_km, distance_nm (nearest first)
+        """
+        if unit not in ("km", "nm"):
+            raise ValueError("unit must be 'km' or 'nm'")
+        if radius < 0:
+            raise ValueError("radius cannot be negative")
+        earth_radius = EARTH_RADIUS_NM if unit == "nm" else EARTH_RADIUS_KM
+        lat, lon = math.radians(lat), math.radians(lon)
+        if not self.size:
+            return self._result(np.empty(0, dtype=np.intp), np.empty(0))
+        query_tuple = _unit_vector(lat, lon)
+        query = np.array(query_tuple)
+
+        # Chord of the search angle, padded so rounding never prunes a match
+        angle = min(radius / earth_radius, math.pi)
+        reach = 2 * math.sin(angle / 2) * (1 + 1e-9) + 1e-12
+
+        candidates = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            distance = math.dist(query_tuple, self._centers[node])
+            if distance - self._radii[node] > reach:
+                continue
+            left, right = self._children[node]
+            start, end = self._bounds[node]
+            if distance + self._radii[node] <= reach or left < 0:
+                candidates.append(np.arange(start, end))
+            else:
+                stack.extend((left, right))
+
+        positions = np.concatenate(candidates) if candidates else np.empty(0, dtype=np.intp)
+        angles = self._distances(lat, lon, positions)
+        inside = earth_radius * angles <= radius
+        return self._result(positions[inside], angles[inside])
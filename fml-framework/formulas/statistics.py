@@ -6,6 +6,152 @@ Contains all statistical formula implementations
 from collections import Counter
 
 
+# NumPy fast paths that return None to mean "use the plain code below";
+# formulas.codegen drops them from the generated JavaScript
+__python_only__ = ("_numeric_array", "_select_median", "_count_integers")
+
+# Lists at least this long get their median by selection (see _select_median)
+SELECTION_MIN_SIZE = 20000
+
+# Integer lists at least this long whose values span at most
+# COUNTING_MAX_RANGE integers (and at most COUNTING_MAX_SPREAD per value)
+# are summarized from one counting array
+COUNTING_MIN_SIZE = 500
+COUNTING_MAX_RANGE = 1 << 16
+COUNTING_MAX_SPREAD = 8
+
+
+def _numeric_array(values):
+    """
+    Convert a long list once for the NumPy fast paths below
+
+    A strided sample is checked first: lists holding bools use neither
+    fast path, and lists shorter than SELECTION_MIN_SIZE can only use the
+    counting path, so they are converted only when the sample is all int.
+
+    Returns:
+        np.ndarray: One-dimensional int or float array, or None (short
+        list, no fast path can apply, NumPy missing, or values NumPy cannot
+        hold as numbers)
+    """
+    n = len(values)
+    if n < min(COUNTING_MIN_SIZE, SELECTION_MIN_SIZE):
+        return None
+    kinds = set(map(type, values[::max(n // 16, 1)]))
+    if bool in kinds or (n < SELECTION_MIN_SIZE and kinds != {int}):
+        return None
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+
+    try:
+        array = np.asarray(values)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    if array.ndim != 1 or array.dtype.kind not in "iuf":
+        return None
+    return array
+
+
+def _has_bool(values):
+    """True if the list holds True/False, which NumPy turns into 1/0"""
+    return bool in set(map(type, values))
+
+
+def _select_median(values, array):
+    """
+    Median by array partitioning in O(n) instead of a full sort
+
+    Only used for long int or float lists, where it returns exactly what
+    the sorted() path would (odd length: the middle element itself; even
+    length: the mean of the two middle elements).
+
+    Returns:
+        The median, or None when the sorted() path must be used (short
+        list, no array, NaN, or an odd-length median that could have been
+        a different object in the input: an int for a float median, a
+        bool for 0 or 1)
+    """
+    n = len(values)
+    if n < SELECTION_MIN_SIZE or array is None:
+        return None
+    import numpy as np
+
+    if array.dtype.kind == "f" and np.isnan(array).any():
+        return None
+
+    middle = n // 2
+    if n % 2 == 0:
+        part = np.partition(array, (middle - 1, middle))
+        return (part[middle - 1].item() + part[middle].item()) / 2
+
+    median = np.partition(array, middle)[middle].item()
+    if array.dtype.kind == "f" and median.is_integer():
+        # sorted() would return the input object, which may be an int
+        if any(isinstance(v, int) for v in values):
+            return None
+    elif median in (0, 1) and _has_bool(values):
+        return None
+    return median
+
+
+def _count_integers(values, array):
+    """
+    Mean, median, mode and count of small-range integer data via np.bincount
+
+    One counting array of size max - min + 1 replaces the sum, the sort and
+    the Counter; results equal the general path (exact integer sum, ints
+    for odd-length medians and modes, tied modes in first-occurrence order).
+
+    Returns:
+        dict: As analyze_data_list, or None when the general path must be
+        used (short list, no array, non-integer values, a range too wide
+        for the list length, or a
+        0/1 median or mode that may have been a bool in the input)
+    """
+    n = len(values)
+    if n < COUNTING_MIN_SIZE or array is None or array.dtype.kind not in "iu":
+        return None
+    import numpy as np
+
+    low = int(array.min())
+    span = int(array.max()) - low
+    if span >= COUNTING_MAX_RANGE or span > COUNTING_MAX_SPREAD * n:
+        return None
+
+    offsets = (array - array.dtype.type(low)).astype(np.intp)
+    counts = np.bincount(offsets)
+    total = low * n + int(np.dot(counts, np.arange(counts.size, dtype=np.int64)))
+
+    cumulative = np.cumsum(counts)
+    upper = low + int(np.searchsorted(cumulative, n // 2, side="right"))
+    if n % 2 == 0:
+        lower = low + int(np.searchsorted(cumulative, n // 2 - 1, side="right"))
+        median = (lower + upper) / 2
+    else:
+        median = upper
+
+    tied = np.flatnonzero(counts == counts.max())
+    if tied.size == 1:
+        mode = low + int(tied[0])
+        modes = [mode]
+    else:
+        present, first = np.unique(offsets, return_index=True)
+        first_seen = first[np.searchsorted(present, tied)]
+        mode = modes = [low + int(offset) for offset in tied[np.argsort(first_seen)]]
+
+    if (median in (0, 1) or 0 in modes or 1 in modes) and _has_bool(values):
+        return None  # Counter and sorted() would give back True/False
+
+    return {
+        "mean": total / n,
+        "median": median,
+        "mode": mode,
+        "count": n
+    }
+
+
 def analyze_data_list(values):
     """
     Analyze a list of numbers for mean, median, mode
@@ -16,17 +162,27 @@ def analyze_data_list(values):
     Returns:
         dict: Contains mean, median, mode
     """
-    sorted_values = sorted(values)
     n = len(values)
     
+    # Long numeric lists: convert once for the NumPy fast paths
+    array = _numeric_array(values)
+    
+    # Small-range integers: everything from one counting array
+    summary = _count_integers(values, array)
+    if summary is not None:
+        return summary
+    
     # Mean
     mean = sum(values) / n
     
     # Median
-    if n % 2 == 0:
-        median = (sorted_values[n//2 - 1] + sorted_values[n//2]) / 2
-    else:
-        median = sorted_values[n//2]
+    median = _select_median(values, array)
+    if median is None:
+        sorted_values = sorted(values)
+        if n % 2 == 0:
+            median = (sorted_values[n//2 - 1] + sorted_values[n//2]) / 2
+        else:
+            median = sorted_values[n//2]
     
     # Mode
     counter = Counter(values)
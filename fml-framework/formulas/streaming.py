@@ -0,0 +1,494 @@
+"""
+Streaming Statistics - FML Framework
+One-pass accumulator for analyze_data_list and calculate_standard_deviation
+over data that does not fit in memory (iterators, chunks, large files).
+
+- Mean and variance use Welford/Chan updates (numerically stable, one pass)
+- Mode counts are kept in sorted NumPy arrays that each chunk's np.unique
+  output is merged into; ties resolve in first-occurrence order like
+  Counter. Once more than max_distinct different values are seen the
+  table is reduced with the Misra-Gries algorithm, so memory stays bounded
+  and any value that occurs in more than n / (max_distinct + 1) rows is
+  still tracked. From then on a mode is only reported when the count
+  bounds prove it is the single most frequent value
+- The median is exact while the count table is exact; after that it is
+  estimated from a fixed-size uniform reservoir sample, or from a KLL
+  quantile sketch with a chosen rank error (backend="kll", see sketches.py)
+- analyze() reports "exact": False once mode and median are estimates
+- Summaries of separate shards merge (merge(), summarize_parallel()), so
+  large arrays can be split across worker processes and reduced
+
+Usage:
+    from formulas.streaming import StreamingStats
+
+    stats = StreamingStats()
+    for chunk in chunks:
+        stats.update_many(chunk)
+    stats.analyze()             # same dict as analyze_data_list
+    stats.standard_deviation()  # same dict as calculate_standard_deviation
+
+    summarize_parallel(big_array, workers=8).analyze()
+
+    python -m formulas.streaming scores.txt
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+class StreamingStats:
+    """
+    Incremental count, mean, variance, min/max, mode and median
+
+    Args:
+        max_distinct (int): Most distinct values counted exactly
+        sample_size (int): Reservoir size for the median estimate once the
+            count table is no longer exact
+        seed (int): Seed of the reservoir sampler
+        backend (str): Quantile estimator once counts are inexact:
+            "reservoir" or "kll"
+        error (float): Rank error of the "kll" backend
+    """
+
+    def __init__(self, max_distinct=100_000, sample_size=10_000, seed=0, backend="reservoir", error=0.01):
+        if backend not in ("reservoir", "kll"):
+            raise ValueError(f"Unknown quantile backend: {backend}")
+        self.max_distinct = max_distinct
+        self.sample_size = sample_size
+        self.backend = backend
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.keys = np.empty(0)
+        self.counts = np.empty(0, dtype=np.int64)
+        self._first = np.empty(0, dtype=np.int64)  # position of each key's first occurrence
+        self.undercount = 0  # most any count can be below the true count
+        self.exact = True
+        self._reservoir = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+        self.sketch = None
+        if backend == "kll":
+            from .sketches import KLLSketch
+            self.sketch = KLLSketch(error=error, seed=seed)
+
+    # --- updates ---
+
+    def update(self, value):
+        """Add one value"""
+        self.update_many([value])
+
+    def update_many(self, values):
+        """
+        Add a chunk of values (list, tuple, NumPy array or iterable)
+
+        Values are counted in the chunk's NumPy type, so integer data keeps
+        integer modes.
+        """
+        if not isinstance(values, np.ndarray):
+            if not isinstance(values, (list, tuple)):
+                values = list(values)
+            values = np.asarray(values)
+            if values.dtype.kind not in "biuf":
+                values = values.astype(np.float64)
+        keys = values.ravel()
+        if keys.size == 0:
+            return
+        data = keys.astype(np.float64, copy=False)
+
+        seen = self.count
+        self._update_moments(data)
+        keys, first, counts = np.unique(keys, return_index=True, return_counts=True)
+        self._update_counts(keys, counts, first + seen)
+        if self.sketch is not None:
+            self.sketch.update_many(data)
+        else:
+            self._update_reservoir(data)
+
+    def _update_moments(self, data):
+        chunk_mean = float(data.mean())
+        self._combine_moments(
+            data.size, chunk_mean, float(np.square(data - chunk_mean).sum()),
+            data.min().item(), data.max().item()
+        )
+
+    def _combine_moments(self, m, mean, m2, low, high):
+        """Chan et al. pairwise update with another (count, mean, M2, min, max)"""
+        n = self.count
+        total = n + m
+        delta = mean - self.mean
+        self.mean += delta * m / total
+        self.m2 += m2 + delta * delta * n * m / total
+        self.count = total
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def _update_counts(self, keys, counts, first):
+        """
+        Merge sorted unique keys with their counts and first positions
+
+        Keys already in the table are found with one searchsorted; the rest
+        are inserted at their sorted positions.
+        """
+        if not self.keys.size:
+            self.keys, self.counts, self._first = keys.copy(), counts.astype(np.int64), first.astype(np.int64)
+        else:
+            dtype = np.result_type(self.keys, keys)
+            self.keys = self.keys.astype(dtype, copy=False)
+            index = np.searchsorted(self.keys, keys)
+            found = index < self.keys.size
+            kept, given = self.keys[index[found]], keys[found]
+            found[found] = (kept == given) | ((kept != kept) & (given != given))  # NaN matches NaN
+            self.counts[index[found]] += counts[found]
+            self._first[index[found]] = np.minimum(self._first[index[found]], first[found])
+            new = ~found
+            self.keys = np.insert(self.keys, index[new], keys[new])
+            self.counts = np.insert(self.counts, index[new], counts[new])
+            self._first = np.insert(self._first, index[new], first[new])
+        if self.keys.size > self.max_distinct:
+            self._reduce_counts()
+
+    def _reduce_counts(self):
+        """Misra-Gries reduction back to at most max_distinct entries"""
+        # Subtracting the (k+1)-th largest count drops at least one entry
+        excess = self.keys.size - self.max_distinct
+        threshold = int(np.partition(self.counts, excess - 1)[excess - 1])
+        keep = self.counts > threshold
+        self.keys, self.counts, self._first = self.keys[keep], self.counts[keep] - threshold, self._first[keep]
+        self.undercount += threshold
+        self.exact = False
+
+    def _update_reservoir(self, data):
+        """Uniform reservoir sample (Algorithm R, vectorized per chunk)"""
+        seen = self.count - data.size
+        free = self.sample_size - self._reservoir.size
+        if free > 0:
+            self._reservoir = np.concatenate([self._reservoir, data[:free]])
+            data = data[free:]
+            seen += min(free, self.count - seen)
+        if data.size:
+            positions = seen + np.arange(1, data.size + 1)
+            slots = (self._rng.random(data.size) * positions).astype(np.int64)
+            keep = slots < self.sample_size
+            self._reservoir[slots[keep]] = data[keep]
+
+    def merge(self, other):
+        """
+        Fold another summary into this one
+
+        Merging summaries of consecutive shards in order gives the same
+        result as feeding all values to one accumulator (mode ties keep
+        first-occurrence order). The merged summary is exact only if both
+        inputs were and the merged count table still fits max_distinct.
+
+        Args:
+            other (StreamingStats): Summary of another shard
+
+        Returns:
+            StreamingStats: self
+        """
+        if not other.count:
+            return self
+        seen = self.count
+        self._combine_moments(other.count, other.mean, other.m2, other.min, other.max)
+        self.exact = self.exact and other.exact
+        self.undercount += other.undercount
+        self._update_counts(other.keys, other.counts, other._first + seen)
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        else:
+            self._merge_reservoir(other, seen)
+        return self
+
+    def _merge_reservoir(self, other, seen):
+        """Uniform sample of the union from the two reservoirs"""
+        combined = np.concatenate([self._reservoir, other._reservoir])
+        if combined.size <= self.sample_size:
+            self._reservoir = combined
+            return
+        # Every retained value stands for seen/len(reservoir) inputs
+        take = self._rng.binomial(self.sample_size, seen / self.count)
+        take = min(take, self._reservoir.size)
+        rest = min(self.sample_size - take, other._reservoir.size)
+        take = self.sample_size - rest
+        self._reservoir = np.concatenate([
+            self._rng.choice(self._reservoir, take, replace=False),
+            self._rng.choice(other._reservoir, rest, replace=False),
+        ])
+
+    # --- results ---
+
+    @property
+    def variance(self):
+        """Population variance (as calculate_standard_deviation)"""
+        return self.m2 / self.count if self.count else 0.0
+
+    def modes(self):
+        """
+        Most frequent values, in first-occurrence order
+
+        Once the counts are inexact each true count lies between the kept
+        count and count + undercount (values no longer kept occurred at
+        most undercount times). A mode is then only returned when those
+        bounds prove it is the single most frequent value; otherwise the
+        list is empty.
+        """
+        if not self.counts.size:
+            return []
+        top = self.counts.max()
+        candidates = self.counts + self.undercount >= top
+        if not self.exact and (top <= self.undercount or np.count_nonzero(candidates) > 1):
+            return []
+        order = np.argsort(self._first[candidates], kind="stable")
+        return self.keys[candidates][order].tolist()
+
+    def quantile(self, q):
+        """
+        Value at fraction q of the sorted data (inverted CDF, no interpolation)
+
+        Exact while the count table is exact, otherwise estimated by the
+        quantile backend.
+        """
+        if not self.count:
+            return None
+        if not self.exact:
+            if self.sketch is not None:
+                return self.sketch.quantile(q)
+            return float(np.quantile(self._reservoir, q, method="inverted_cdf"))
+
+        position = max(math.ceil(q * self.count) - 1, 0)
+        index = np.searchsorted(np.cumsum(self.counts), position, side="right")
+        return self.keys[min(index, self.keys.size - 1)].item()
+
+    def median(self):
+        """Exact median while counts are exact, else the backend's estimate"""
+        n = self.count
+        if not self.exact:
+            if self.sketch is not None:
+                return self.sketch.median()
+            return float(np.median(self._reservoir))
+
+        wanted = [n // 2 - 1, n // 2] if n % 2 == 0 else [n // 2]
+        found = self.keys[np.searchsorted(np.cumsum(self.counts), wanted, side="right")].tolist()
+        return (found[0] + found[1]) / 2 if n % 2 == 0 else found[0]
+
+    def analyze(self):
+        """
+        Finalize as analyze_data_list
+
+        Returns:
+            dict: Contains mean, median, mode, count and exact (False once
+                median and mode are estimates; mode is then [] unless one
+                value is provably the most frequent)
+        """
+        if not self.count:
+            return {"error": "No values to analyze"}
+        modes = self.modes()
+        return {
+            "mean": self.mean,
+            "median": self.median(),
+            "mode": modes[0] if len(modes) == 1 else modes,
+            "count": self.count,
+            "exact": self.exact
+        }
+
+    def standard_deviation(self):
+        """
+        Finalize as calculate_standard_deviation
+
+        Returns:
+            dict: Contains standard deviation and variance
+        """
+        if not self.count:
+            return {"error": "No values to analyze"}
+        variance = self.variance
+        return {
+            "mean": self.mean,
+            "variance": variance,
+            "standard_deviation": variance ** 0.5
+        }
+
+
+def consume(values, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    Feed an iterable of values or of chunks into a new accumulator
+
+    Args:
+        values (iterable): Numbers, or lists/arrays of numbers
+        chunk_size (int): Values buffered per update when values are scalars
+        **options: StreamingStats options
+
+    Returns:
+        StreamingStats: The filled accumulator
+    """
+    stats = StreamingStats(**options)
+    iterator = iter(values)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            break
+        if isinstance(chunk[0], (list, tuple, np.ndarray)):
+            for part in chunk:
+                stats.update_many(part)
+        else:
+            stats.update_many(chunk)
+    return stats
+
+
+def analyze_data_stream(values, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    Streaming analyze_data_list
+
+    Args:
+        values (iterable): Numbers, or chunks of numbers
+
+    Returns:
+        dict: Contains mean, median, mode, count and exact
+    """
+    return consume(values, chunk_size, **options).analyze()
+
+
+def standard_deviation_stream(values, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    Streaming calculate_standard_deviation
+
+    Args:
+        values (iterable): Numbers, or chunks of numbers
+
+    Returns:
+        dict: Contains standard deviation and variance
+    """
+    return consume(values, chunk_size, **options).standard_deviation()
+
+
+def summarize(values, **options):
+    """
+    Summary of one shard (module level so worker processes can run it)
+
+    Returns:
+        StreamingStats: Accumulator holding the shard
+    """
+    stats = StreamingStats(**options)
+    stats.update_many(values)
+    return stats
+
+
+def summarize_parallel(values, workers=None, shards=None, executor=None, **options):
+    """
+    Split values across a process pool and reduce the shard summaries
+
+    Args:
+        values (array-like): Numbers to summarize
+        workers (int, optional): Worker processes (default: CPU count)
+        shards (int, optional): Number of contiguous shards (default: workers)
+        executor (optional): Existing concurrent.futures executor to reuse
+        **options: StreamingStats options
+
+    Returns:
+        StreamingStats: Summary of all values
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    array = values if isinstance(values, np.ndarray) else np.asarray(values)
+    workers = workers or os.cpu_count() or 1
+    pieces = np.array_split(array, shards or workers)
+
+    if workers == 1 and executor is None:
+        summaries = [summarize(piece, **options) for piece in pieces]
+    elif executor is not None:
+        summaries = [f.result() for f in [executor.submit(summarize, p, **options) for p in pieces]]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            summaries = [f.result() for f in [pool.submit(summarize, p, **options) for p in pieces]]
+
+    total = StreamingStats(**options)
+    for summary in summaries:
+        total.merge(summary)
+    return total
+
+
+def analyze_data_parallel(values, workers=None, **options):
+    """
+    analyze_data_list computed by summarize_parallel
+
+    Returns:
+        dict: Contains mean, median, mode, count and exact
+    """
+    return summarize_parallel(values, workers, **options).analyze()
+
+
+def standard_deviation_parallel(values, workers=None, **options):
+    """
+    calculate_standard_deviation computed by summarize_parallel
+
+    Returns:
+        dict: Contains standard deviation and variance
+    """
+    return summarize_parallel(values, workers, **options).standard_deviation()
+
+
+def read_number_chunks(handle, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Parse whitespace/comma separated numbers from a text stream in chunks
+
+    Integers stay int, so an all-integer file keeps integer modes.
+
+    Yields:
+        list: Up to chunk_size numbers
+    """
+    chunk = []
+    for line in handle:
+        for token in line.replace(",", " ").split():
+            try:
+                chunk.append(int(token))
+            except ValueError:
+                chunk.append(float(token))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m formulas.streaming",
+        description="Mean, median, mode and standard deviation of a numbers file in one pass"
+    )
+    parser.add_argument("input", help="Text file of numbers ('-' for stdin)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--max-distinct", type=int, default=100_000,
+                        help="Distinct values counted exactly before the mode/median become estimates")
+    parser.add_argument("--backend", choices=["reservoir", "kll"], default="reservoir",
+                        help="Median estimator once the counts are no longer exact")
+    parser.add_argument("--error", type=float, default=0.01, help="Rank error of the kll backend")
+    args = parser.parse_args(argv)
+
+    handle = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        stats = consume(read_number_chunks(handle, args.chunk_size), max_distinct=args.max_distinct,
+                        backend=args.backend, error=args.error)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+    result = stats.analyze()
+    if "error" not in result:
+        result.update(stats.standard_deviation())
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
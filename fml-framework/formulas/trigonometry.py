@@ -103,6 +103,7 @@ FORMULAS = {
         "description": "Calculate unknown angle using Cosine Rule",
         "category": "trigonometry",
         "parameters": ["a", "b", "c"],
+        "aliases": ["cosineRuleAngle"],
         "function": calculate_cosine_rule_angle
     },
     "calculate_triangle_area_sine": {
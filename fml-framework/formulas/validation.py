@@ -0,0 +1,512 @@
+"""
+Argument Validation - FML Framework
+Precompiled validators for every registered formula, built from the
+"parameters" metadata, the types in each docstring's Args section and the
+range annotations in PARAMETER_RULES / ROW_RULES below.
+
+A validator is compiled once per formula and checks whole columns with
+vectorized comparisons, so bad rows are rejected before any math runs
+instead of raising (or returning an error dict) one call at a time.
+
+Usage:
+    from formulas.validation import get_validator, dispatch_validated
+
+    report = get_validator("calculate_chord_length").validate(
+        {"radius": [5, 5, -1], "distance_from_center": [3, 7, 0]})
+    report["error"]     # array([False,  True,  True])
+    report["messages"]  # [None, 'Distance must be less than radius', ...]
+
+    dispatch_validated("calculate_chord_length", columns)
+"""
+
+import inspect
+import threading
+
+import numpy as np
+
+from . import catalog
+
+
+# Range annotations: formula -> parameter -> rule
+#   min / max      inclusive bounds
+#   gt / lt        exclusive bounds
+#   nonzero        value must not be 0
+#   choices        allowed values (str parameters)
+#   items_min      lower bound for every element of a list parameter
+PARAMETER_RULES = {
+    "calculate_depreciation_straight_line": {"useful_life": {"gt": 0}},
+    "solve_quadratic_roots": {"a": {"nonzero": True}},
+    "find_quadratic_vertex": {"a": {"nonzero": True}},
+    "calculate_direct_variation": {"x1": {"nonzero": True}},
+    "calculate_inverse_variation": {"x2": {"nonzero": True}},
+    "calculate_haversine": {
+        "lat1": {"min": -90, "max": 90}, "lon1": {"min": -180, "max": 180},
+        "lat2": {"min": -90, "max": 90}, "lon2": {"min": -180, "max": 180},
+        "unit": {"choices": ("km", "nm")},
+    },
+    "calculate_great_circle": {
+        "lat1": {"min": -90, "max": 90}, "lon1": {"min": -180, "max": 180},
+        "lat2": {"min": -90, "max": 90}, "lon2": {"min": -180, "max": 180},
+    },
+    "calculate_small_circle": {
+        "lat1": {"min": -90, "max": 90}, "lon1": {"min": -180, "max": 180},
+        "lat2": {"min": -90, "max": 90}, "lon2": {"min": -180, "max": 180},
+        "latitude": {"min": -90, "max": 90},
+    },
+    "calculate_circle_properties": {"radius": {"min": 0}},
+    "calculate_arc_sector": {"radius": {"min": 0}},
+    "calculate_chord_length": {"radius": {"min": 0}, "distance_from_center": {"min": 0}},
+    "calculate_triangle_area": {"base": {"min": 0}, "height": {"min": 0}},
+    "calculate_rectangle_properties": {"length": {"min": 0}, "width": {"min": 0}},
+    "calculate_sphere_properties": {"radius": {"min": 0}},
+    "calculate_cylinder_properties": {"radius": {"min": 0}, "height": {"min": 0}},
+    "calculate_cone_properties": {"radius": {"min": 0}, "height": {"min": 0}},
+    "calculate_pyramid_properties": {
+        "base_area": {"min": 0}, "perimeter": {"min": 0},
+        "height": {"min": 0}, "slant_height": {"min": 0},
+    },
+    "calculate_probability": {"successful_outcomes": {"min": 0}, "total_outcomes": {"gt": 0}},
+    "calculate_combined_probability_or": {
+        "p_a": {"min": 0, "max": 1}, "p_b": {"min": 0, "max": 1}, "p_a_and_b": {"min": 0, "max": 1},
+    },
+    "calculate_independent_probability_and": {"p_a": {"min": 0, "max": 1}, "p_b": {"min": 0, "max": 1}},
+    "solve_arithmetic_progression": {"n": {"min": 1}},
+    "solve_geometric_progression": {"n": {"min": 1}},
+    "calculate_compound_interest": {"n": {"min": 1}},
+    "calculate_grouped_mean": {"frequencies": {"items_min": 0}},
+    "calculate_grouped_median": {"frequencies": {"items_min": 0}},
+    "calculate_grouped_mode": {"frequencies": {"items_min": 0}},
+    "calculate_sine_rule_side": {
+        "a": {"min": 0}, "A_degrees": {"gt": 0, "lt": 180}, "B_degrees": {"gt": 0, "lt": 180},
+    },
+    "calculate_cosine_rule_side": {"b": {"min": 0}, "c": {"min": 0}},
+    "calculate_cosine_rule_angle": {"a": {"min": 0}, "b": {"gt": 0}, "c": {"gt": 0}},
+    "calculate_triangle_area_sine": {"a": {"min": 0}, "b": {"min": 0}},
+}
+
+
+def _provided(column):
+    return ~np.isnan(column)
+
+
+# Rules spanning several parameters: formula -> [(message, bad-row predicate)].
+# Predicates receive the converted columns and return a boolean mask; they
+# only see rows that passed the per-parameter checks.
+ROW_RULES = {
+    "solve_accounting_equation": [
+        ("Provide exactly two values to calculate the third",
+         lambda c: _provided(c["assets"]).astype(int) + _provided(c["liabilities"])
+         + _provided(c["capital"]) != 2),
+    ],
+    "calculate_chord_length": [
+        ("Distance must be less than radius",
+         lambda c: c["distance_from_center"] >= c["radius"]),
+    ],
+    "calculate_inverse_2x2": [
+        ("Matrix is singular (determinant is 0)",
+         lambda c: c["a"] * c["d"] - c["b"] * c["c"] == 0),
+    ],
+    "solve_simultaneous_cramer": [
+        ("No unique solution (lines are parallel)",
+         lambda c: c["a1"] * c["b2"] - c["a2"] * c["b1"] == 0),
+    ],
+    "calculate_probability": [
+        ("successful_outcomes cannot exceed total_outcomes",
+         lambda c: c["successful_outcomes"] > c["total_outcomes"]),
+    ],
+    "calculate_combined_probability_or": [
+        ("p_a_and_b cannot exceed p_a or p_b",
+         lambda c: c["p_a_and_b"] > np.minimum(c["p_a"], c["p_b"])),
+    ],
+    "calculate_cosine_rule_angle": [
+        ("Impossible triangle dimensions",
+         lambda c: np.abs(c["b"]**2 + c["c"]**2 - c["a"]**2) > 2 * c["b"] * c["c"]),
+    ],
+    "calculate_grouped_mean": [
+        ("midpoints and frequencies must have the same length",
+         lambda c: c["_len_midpoints"] != c["_len_frequencies"]),
+        ("Total frequency must be positive", lambda c: c["_sum_frequencies"] <= 0),
+    ],
+    "calculate_grouped_median": [
+        ("class_boundaries and frequencies must have the same length",
+         lambda c: c["_len_class_boundaries"] != c["_len_frequencies"]),
+        ("Total frequency must be positive", lambda c: c["_sum_frequencies"] <= 0),
+    ],
+    "calculate_grouped_mode": [
+        ("class_boundaries and frequencies must have the same length",
+         lambda c: c["_len_class_boundaries"] != c["_len_frequencies"]),
+    ],
+}
+
+
+def _numeric_column(values, n):
+    """
+    Convert a column to float64, marking entries that are not numbers
+
+    Returns:
+        tuple: (float array of length n, bool mask of non-numeric entries)
+    """
+    array = np.asarray(values)
+    if array.dtype.kind in "biuf":
+        array = np.broadcast_to(array.astype(np.float64, copy=False), (n,))
+        return array, np.zeros(n, dtype=bool)
+
+    items = np.broadcast_to(np.asarray(values, dtype=object), (n,))
+    converted = np.full(n, np.nan)
+    bad = np.zeros(n, dtype=bool)
+    for i, value in enumerate(items):
+        if value is None:
+            continue
+        if isinstance(value, (str, bytes, bool)):
+            bad[i] = True
+            continue
+        try:
+            converted[i] = float(value)
+        except (TypeError, ValueError):
+            bad[i] = True
+    return converted, bad
+
+
+def _list_column(values, n):
+    """
+    Check a column whose entries are whole lists (one dataset per row)
+
+    Returns:
+        tuple: (list of float arrays or None, bool mask of bad entries)
+    """
+    if len(values) == 1 and n > 1:
+        values = list(values) * n
+    arrays = []
+    bad = np.zeros(n, dtype=bool)
+    for i, value in enumerate(values):
+        try:
+            array = np.asarray(value, dtype=np.float64)
+        except (TypeError, ValueError):
+            array = None
+        if array is None or array.ndim == 0 or array.size == 0 or not np.isfinite(array).all():
+            bad[i] = True
+            array = None
+        arrays.append(array)
+    return arrays, bad
+
+
+class Validator:
+    """
+    Compiled argument checks for one formula
+
+    Built by compile_validator(); use get_validator(name) to share one
+    instance per formula.
+    """
+
+    __slots__ = ("name", "parameters", "checks", "row_rules")
+
+    def __init__(self, name, parameters, checks, row_rules):
+        self.name = name
+        self.parameters = parameters
+        self.checks = checks
+        self.row_rules = row_rules
+
+    def validate(self, columns):
+        """
+        Check a batch of arguments
+
+        Args:
+            columns (dict): Parameter name -> array/sequence/scalar (list
+                parameters take one list per row)
+
+        Returns:
+            dict: "error" (bool mask of rejected rows), "messages" (list of
+                the first problem per row, None for valid rows), "columns"
+                (converted and broadcast columns) and "num_rows"
+        """
+        unknown = set(columns) - {name for name, _, _ in self.parameters}
+        if unknown:
+            raise TypeError(f"{self.name}() got unexpected arguments: {', '.join(sorted(unknown))}")
+
+        n = _num_rows(columns, self.parameters)
+        error = np.zeros(n, dtype=bool)
+        messages = [None] * n
+
+        def reject(mask, message):
+            if not mask.any():
+                return
+            new = mask & ~error
+            for i in np.flatnonzero(new):
+                messages[i] = message
+            error[new] = True
+
+        converted = {}
+        for name, kind, default in self.parameters:
+            if name not in columns:
+                if default is inspect.Parameter.empty:
+                    raise TypeError(f"{self.name}() missing required argument: '{name}'")
+                column = default
+            else:
+                column = columns[name]
+
+            if kind == "list":
+                arrays, bad = _list_column(column, n)
+                reject(bad, f"{name} must be a non-empty list of finite numbers")
+                converted[name] = arrays
+                converted["_len_" + name] = np.array([-1 if a is None else len(a) for a in arrays])
+                converted["_sum_" + name] = np.array([0.0 if a is None else a.sum() for a in arrays])
+            elif kind == "str":
+                items = np.broadcast_to(np.asarray(column, dtype=object), (n,))
+                converted[name] = items
+            else:
+                array, bad = _numeric_column(column, n)
+                reject(bad, f"{name} must be a number")
+                converted[name] = array
+
+        with np.errstate(invalid="ignore", over="ignore"):
+            for message, predicate in self.checks:
+                reject(predicate(converted), message)
+            for message, predicate in self.row_rules:
+                reject(predicate(converted), message)
+
+        return {"error": error, "messages": messages, "columns": converted, "num_rows": n}
+
+    def check(self, args):
+        """
+        Check one call's keyword arguments
+
+        The compiled predicates are applied to plain scalars, so a single
+        call does not pay for building one-row arrays.
+
+        Returns:
+            str: The first problem found, or None if the arguments are valid
+        """
+        if any(kind == "list" for _, kind, _ in self.parameters):
+            columns = {name: [value] if _is_list_param(self, name) else value
+                       for name, value in args.items()}
+            return self.validate(columns)["messages"][0]
+
+        unknown = set(args) - {name for name, _, _ in self.parameters}
+        if unknown:
+            raise TypeError(f"{self.name}() got unexpected arguments: {', '.join(sorted(unknown))}")
+
+        converted = {}
+        for name, kind, default in self.parameters:
+            value = args.get(name, default)
+            if value is inspect.Parameter.empty:
+                raise TypeError(f"{self.name}() missing required argument: '{name}'")
+            if kind == "str":
+                converted[name] = value
+                continue
+            if value is None:
+                value = np.nan
+            elif isinstance(value, (str, bytes, bool)):
+                return f"{name} must be a number"
+            try:
+                converted[name] = float(value)
+            except (TypeError, ValueError):
+                return f"{name} must be a number"
+
+        with np.errstate(invalid="ignore", over="ignore"):
+            for message, predicate in self.checks + self.row_rules:
+                if predicate(converted):
+                    return message
+        return None
+
+
+def _is_list_param(validator, name):
+    return any(param == name and kind == "list" for param, kind, _ in validator.parameters)
+
+
+def _num_rows(columns, parameters):
+    kinds = {name: kind for name, kind, _ in parameters}
+    lengths = set()
+    for name, column in columns.items():
+        if kinds.get(name) == "list":
+            lengths.add(len(column))
+        elif not isinstance(column, str) and np.ndim(column) > 0:
+            lengths.add(len(column))
+    lengths.discard(1)
+    if len(lengths) > 1:
+        raise ValueError("Batch columns must have the same length (or length 1)")
+    return lengths.pop() if lengths else 1
+
+
+def _value_checks(name, kind, optional, rule):
+    """Vectorized (message, predicate) pairs for one parameter"""
+    checks = []
+    if kind == "list":
+        if "items_min" in rule:
+            low = rule["items_min"]
+            checks.append((f"{name} entries must be >= {low}",
+                           lambda c: np.array([a is not None and bool((a < low).any()) for a in c[name]],
+                                              dtype=bool)))
+        return checks
+    if kind == "str":
+        if "choices" in rule:
+            choices = rule["choices"]
+            checks.append((f"{name} must be one of {', '.join(map(repr, choices))}",
+                           lambda c: ~np.isin(c[name], choices)))
+        return checks
+
+    if optional:
+        def present(c):
+            return ~np.isnan(c[name])
+        checks.append((f"{name} must be finite",
+                       lambda c: np.isinf(c[name])))
+    else:
+        def present(c):
+            return True
+        checks.append((f"{name} must be a finite number", lambda c: ~np.isfinite(c[name])))
+
+    if kind == "int":
+        checks.append((f"{name} must be an integer",
+                       lambda c: present(c) & (np.mod(c[name], 1) != 0)))
+    if "nonzero" in rule:
+        checks.append((f"{name} must be non-zero", lambda c: present(c) & (c[name] == 0)))
+    if "min" in rule:
+        checks.append((f"{name} must be >= {rule['min']}",
+                       lambda c, low=rule["min"]: present(c) & (c[name] < low)))
+    if "gt" in rule:
+        checks.append((f"{name} must be > {rule['gt']}",
+                       lambda c, low=rule["gt"]: present(c) & (c[name] <= low)))
+    if "max" in rule:
+        checks.append((f"{name} must be <= {rule['max']}",
+                       lambda c, high=rule["max"]: present(c) & (c[name] > high)))
+    if "lt" in rule:
+        checks.append((f"{name} must be < {rule['lt']}",
+                       lambda c, high=rule["lt"]: present(c) & (c[name] >= high)))
+    return checks
+
+
+def compile_validator(name):
+    """
+    Build the validator of a formula
+
+    Parameter types come from the docstring Args section (list, str, int,
+    otherwise float); a parameter is optional when it is documented as
+    optional or defaults to None.
+
+    Args:
+        name (str): Formula name
+
+    Returns:
+        Validator: Compiled checks
+    """
+    signature = inspect.signature(catalog.get_formula(name)["function"]).parameters
+    docs = catalog.parameter_docs(name)
+    rules = PARAMETER_RULES.get(name, {})
+
+    parameters = []
+    checks = []
+    for parameter in catalog.describe(name)["parameters"]:
+        doc = docs.get(parameter, {})
+        kind = doc.get("type") if doc.get("type") in ("list", "str", "int") else "float"
+        default = signature[parameter].default if parameter in signature else inspect.Parameter.empty
+        optional = doc.get("optional", False) or default is None
+        if default is None:
+            default = np.nan
+        parameters.append((parameter, kind, default))
+        checks += _value_checks(parameter, kind, optional, rules.get(parameter, {}))
+
+    return Validator(name, tuple(parameters), tuple(checks), tuple(ROW_RULES.get(name, ())))
+
+
+_validators = {}
+_lock = threading.Lock()
+
+
+def get_validator(name):
+    """
+    Get the compiled validator of a formula (compiled on first use)
+
+    Args:
+        name (str): Formula name
+
+    Returns:
+        Validator: Shared validator instance
+    """
+    validator = _validators.get(name)
+    if validator is None:
+        with _lock:
+            validator = _validators.get(name)
+            if validator is None:
+                validator = _validators[name] = compile_validator(name)
+    return validator
+
+
+def compile_all():
+    """Compile the validators of every registered formula up front"""
+    for name in catalog.list_formulas():
+        get_validator(name)
+    return dict(_validators)
+
+
+def validate_args(name, args):
+    """
+    Check one call's arguments without running the formula
+
+    Args:
+        name (str): Formula name
+        args (dict): Keyword arguments
+
+    Returns:
+        str: The first problem found, or None if the arguments are valid
+    """
+    return get_validator(name).check(args)
+
+
+def _scatter(column, rows, n):
+    """Expand a column computed for the valid rows back to all n rows"""
+    if column.dtype.kind == "f":
+        full = np.full((n,) + column.shape[1:], np.nan)
+    elif column.dtype.kind == "b":
+        full = np.zeros((n,) + column.shape[1:], dtype=bool)
+    else:
+        full = np.full((n,) + column.shape[1:], None, dtype=object)
+    full[rows] = column
+    return full
+
+
+def dispatch_validated(name, columns):
+    """
+    Validate a batch and evaluate the formula on the accepted rows only
+
+    Args:
+        name (str): Formula name
+        columns (dict): Parameter name -> array/sequence/scalar
+
+    Returns:
+        dict: Column arrays keyed like batch.dispatch_batch(), where the
+            "error" mask also covers rejected rows and "validation_error"
+            holds the rejection message per row (None when accepted)
+    """
+    from .batch import dispatch_batch
+
+    validator = get_validator(name)
+    report = validator.validate(columns)
+    error = report["error"]
+    n = report["num_rows"]
+    messages = np.empty(n, dtype=object)
+    messages[:] = report["messages"]
+
+    if not error.any():
+        result = dispatch_batch(name, columns)
+    else:
+        rows = np.flatnonzero(~error)
+        subset = {}
+        for key, column in columns.items():
+            if not _is_list_param(validator, key) and (isinstance(column, str) or np.ndim(column) == 0):
+                subset[key] = column
+            elif len(column) == 1 and n > 1:
+                subset[key] = column
+            elif isinstance(column, np.ndarray):
+                subset[key] = column[rows]
+            else:
+                subset[key] = [column[i] for i in rows]
+        if rows.size:
+            result = dispatch_batch(name, subset)
+            result = {key: _scatter(np.asarray(value), rows, n) for key, value in result.items()}
+        else:
+            result = {}
+        result["error"] = result.get("error", np.zeros(n, dtype=bool)) | error
+
+    if "error" not in result:
+        result["error"] = np.zeros(n, dtype=bool)
+    result["validation_error"] = messages
+    return result
@@ -85,6 +85,7 @@ FORMULAS = {
         "description": "Multiply vector by a number",
         "category": "vectors",
         "parameters": ["k", "x", "y"],
+        "aliases": ["scalarMultiply"],
         "function": scalar_multiply_vector
     },
     "calculate_dot_product": {
@@ -92,6 +93,7 @@ FORMULAS = {
         "description": "Calculate dot product of two vectors",
         "category": "vectors",
         "parameters": ["x1", "y1", "x2", "y2"],
+        "aliases": ["dotProduct"],
         "function": calculate_dot_product
     }
 }
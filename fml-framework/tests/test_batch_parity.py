@@ -0,0 +1,100 @@
+"""
+Batch/scalar parity - FML Framework
+Every vectorized kernel in batch.py must agree with its scalar formula on
+edge-case rows (zeros, negatives, huge values): same values, and the error
+flag set exactly where the scalar formula raises, returns an error dict or
+returns something no float column can hold.
+
+Run from fml-framework/:
+    python -m pytest tests
+"""
+
+import inspect
+import math
+import random
+import sys
+
+import numpy as np
+import pytest
+
+from formulas import catalog
+from formulas.batch import BATCH_FORMULAS, dispatch_batch
+
+
+FLOAT_EDGES = [0.0, 1.0, -1.0, 2.0, -2.5, 0.5, 180.0, 1e3, 1e200, -1e200]
+INT_EDGES = [0, 1, -1, 2, -3, 45, 90, 180]
+ROWS = 300
+
+
+def _expected(function, args):
+    """Scalar result, or None where the batch row must be flagged"""
+    try:
+        result = function(**args)
+    except (ArithmeticError, ValueError):
+        return None
+    if "error" in result:
+        return None
+    for value in result.values():
+        for item in (value if isinstance(value, list) else [value]):
+            if isinstance(item, complex):
+                return None
+            if isinstance(item, int) and not isinstance(item, bool) and abs(item) > sys.float_info.max:
+                return None
+    return result
+
+
+def _same(expected, got):
+    if isinstance(expected, list):
+        got = [value for value in np.atleast_1d(got).tolist() if not math.isnan(value)]
+        return len(got) == len(expected) and all(_same(e, g) for e, g in zip(expected, got))
+    if isinstance(expected, (str, bool)) or expected is None:
+        return expected == got
+    if math.isnan(expected):
+        return math.isnan(got)
+    return expected == got or math.isclose(expected, got, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def _rows(name, edges, seed):
+    rng = random.Random(seed)
+    signature = inspect.signature(catalog.get_function(name)).parameters
+    rows = []
+    for _ in range(ROWS):
+        row = {}
+        for parameter in signature.values():
+            if parameter.name == "unit":
+                row["unit"] = rng.choice(["km", "nm"])
+            elif parameter.default is None:
+                row[parameter.name] = None
+            else:
+                row[parameter.name] = rng.choice(edges)
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize("edges", [FLOAT_EDGES, INT_EDGES], ids=["float", "int"])
+@pytest.mark.parametrize("name", sorted(BATCH_FORMULAS))
+def test_kernel_matches_scalar(name, edges):
+    if name == "solve_accounting_equation":
+        pytest.skip("None marks the unknown value; covered by its own kernel logic")
+    function = catalog.get_function(name)
+    rows = _rows(name, edges, seed=name)
+    columns = {key: [row[key] for row in rows] for key in rows[0]}
+    columns = {key: None if all(v is None for v in values) else values for key, values in columns.items()}
+    result = dispatch_batch(name, {key: values for key, values in columns.items() if values is not None})
+    error = result.get("error", np.zeros(ROWS, dtype=bool))
+
+    for i, row in enumerate(rows):
+        expected = _expected(function, row)
+        assert bool(error[i]) == (expected is None), (name, row, expected)
+        if expected is None:
+            continue
+        for key, value in expected.items():
+            got = result[key][i]
+            got = got.item() if hasattr(got, "item") and np.ndim(got) == 0 else got
+            assert _same(value, got), (name, row, key, value, got)
+
+
+def test_geometric_progression_exact_zero_term():
+    result = dispatch_batch("solve_geometric_progression", {"a": [0], "r": [180], "n": [180]})
+    assert not result["error"][0]
+    assert result["nth_term"][0] == 0 and result["sum"][0] == 0
@@ -0,0 +1,42 @@
+"""
+Rolling statistics - FML Framework
+The streaming window (RollingStats / rolling_stream) must give the same
+moments as the vectorized rolling_statistics, including after a level
+shift, where add/remove updates of M2 cancel catastrophically.
+
+Run from fml-framework/:
+    python -m pytest tests
+"""
+
+import numpy as np
+
+from formulas.rolling import rolling_statistics, rolling_stream
+
+
+def _level_shift(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.where(np.arange(n) < n // 2, 1e4, 0.0) + rng.normal(0.0, 1e-3, n)
+
+
+def test_stream_variance_after_level_shift():
+    values = _level_shift(200_000)
+    streamed = list(rolling_stream(values.tolist(), window=10))
+    expected = rolling_statistics(values, window=10, stats=["mean", "variance"])
+
+    variance = np.array([snapshot["variance"] for snapshot in streamed])
+    mean = np.array([snapshot["mean"] for snapshot in streamed])
+    np.testing.assert_allclose(variance[9:], expected["variance"][9:], rtol=1e-6)
+    np.testing.assert_allclose(mean, expected["mean"], rtol=1e-12, atol=1e-9)
+
+
+def test_stream_time_windows_match_arrays():
+    values = _level_shift(20_000, seed=1)
+    times = np.cumsum(np.random.default_rng(2).integers(0, 3, values.size)).astype(float)
+    streamed = list(rolling_stream(zip(times.tolist(), values.tolist()), duration=7.0))
+    expected = rolling_statistics(values, times=times, duration=7.0,
+                                  stats=["count", "variance", "median"])
+
+    assert [snapshot["count"] for snapshot in streamed] == expected["count"].tolist()
+    assert [snapshot["median"] for snapshot in streamed] == expected["median"].tolist()
+    variance = np.array([snapshot["variance"] for snapshot in streamed])
+    np.testing.assert_allclose(variance, expected["variance"], rtol=1e-6, atol=1e-12)